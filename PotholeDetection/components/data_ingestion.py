@@ -1,17 +1,22 @@
+import json
+import time
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from dvc.api import dataset
-from PotholeDetection.config_manager.component_config import DataIngestionConfig, DataIngestionArtifact
+from PotholeDetection.config_manager.component_config import DataIngestionConfig, DataIngestionArtifact, DataValidationConfig
 from PotholeDetection.logging.logger import logger
+from PotholeDetection.logging.instrumentation import instrument, span
 
 import boto3
 from botocore.exceptions import NoCredentialsError
 
 
 class DataIngestion:
-    def __init__(self, ingestion_config: DataIngestionConfig):
+    def __init__(self, ingestion_config: DataIngestionConfig, validation_config: DataValidationConfig = None):
         self.config = ingestion_config
         self.s3 = boto3.client('s3') 
+        self.validation_config = validation_config or DataValidationConfig(dataset = self.config.artifacts_dir/self.config.s3_prefix)
+        self.validator = None
 
 
     def navigate_s3_bucket(self):
@@ -52,16 +57,180 @@ class DataIngestion:
             logger.error("")
             raise e
     
+    def list_s3_objects(self) -> dict:
+        """
+        List all objects under the configured S3 prefix
+        Returns: dict: Mapping of object key to its size, ETag and last modified time
+        """
+        remote_objects = {}
+        paginator = self.s3.get_paginator('list_objects_v2')
+        page_iterator = paginator.paginate(Bucket = self.config.s3_bucket, Prefix = self.config.s3_prefix)
+
+        for page in page_iterator:
+            for obj in page.get('Contents', []):
+                key = obj['Key']
+                if key.endswith('/'):
+                    continue
+
+                remote_objects[key] = {
+                    'size': obj['Size'],
+                    'etag': obj['ETag'].strip('"'),
+                    'last_modified': obj['LastModified'].isoformat()
+                }
+
+        logger.info(f"Found {len(remote_objects)} objects under s3://{self.config.s3_bucket}/{self.config.s3_prefix}")
+        return remote_objects
+
+    def load_manifest(self, manifest_path: Path) -> dict:
+        """
+        Load the local manifest of previously synced objects
+        Returns: dict: Mapping of object key to its size, ETag and sync time, empty if no manifest exists
+        """
+        if not manifest_path.exists():
+            logger.info(f"No manifest found at {manifest_path}. Performing full sync")
+            return {}
+
+        try:
+            with open(manifest_path, 'r') as f:
+                return json.load(f)
+
+        except json.JSONDecodeError:
+            logger.error(f"Corrupted manifest at {manifest_path}. Performing full sync")
+            return {}
+
+    def save_manifest(self, manifest: dict, manifest_path: Path):
+        """
+        Atomically write the manifest of synced objects to disk
+        """
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent = 4)
+
+        tmp_path.replace(manifest_path)
+        logger.info(f"Manifest with {len(manifest)} entries saved at {manifest_path}")
+
+    def download_object(self, key: str, dataset_path: Path) -> Path:
+        """
+        Download a single S3 object into the local dataset directory
+        Returns: Path: Local path of the downloaded file
+        """
+        relative_path = Path(key).relative_to(self.config.s3_prefix)
+        data_file_path = dataset_path/relative_path
+        data_file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.s3.download_file(self.config.s3_bucket, key, str(data_file_path))
+        return data_file_path
+
+    def sync_s3_bucket(self) -> tuple:
+        """
+        Incrementally sync the S3 prefix to the local dataset directory
+        Only objects that are new or whose size/ETag changed since the last sync are downloaded,
+        using a bounded thread pool. Local files whose objects were removed from the bucket are deleted.
+        Returns: tuple: (dataset path, manifest path, sync statistics)
+        """
+        try:
+            self.validator = None
+            dataset_path = self.config.artifacts_dir/self.config.s3_prefix
+            dataset_path.mkdir(parents=True, exist_ok=True)
+
+            manifest_path = self.config.artifacts_dir/self.config.manifest_file
+            manifest = self.load_manifest(manifest_path)
+            remote_objects = self.list_s3_objects()
+
+            to_fetch = []
+            for key, meta in remote_objects.items():
+                local_entry = manifest.get(key)
+                local_file = dataset_path/Path(key).relative_to(self.config.s3_prefix)
+                if (local_entry is None or local_entry['etag'] != meta['etag']
+                        or local_entry['size'] != meta['size'] or not local_file.exists()):
+                    to_fetch.append(key)
+
+            stale_keys = [key for key in manifest if key not in remote_objects]
+            files_skipped = len(remote_objects) - len(to_fetch)
+            logger.info(f"Sync plan: {len(to_fetch)} to fetch, {files_skipped} unchanged, {len(stale_keys)} stale")
+
+            if self.config.stream_validation and to_fetch:
+                from PotholeDetection.components.streaming_validation import StreamingValidator
+                self.validator = StreamingValidator(self.validation_config, queue_size = self.config.stream_queue_size).start()
+
+            start = time.perf_counter()
+            bytes_fetched = 0
+            with span('download', workers = self.config.max_workers) as download_span, ThreadPoolExecutor(max_workers = self.config.max_workers) as executor:
+                def fetch(key: str) -> Path:
+                    with download_span.track('download_object', bytes = remote_objects[key]['size']):
+                        local_file = self.download_object(key, dataset_path)
+                    if self.validator is not None:
+                        self.validator.submit(local_file)
+                    return local_file
+
+                futures = {executor.submit(fetch, key): key for key in to_fetch}
+                try:
+                    for future in as_completed(futures):
+                        key = futures[future]
+                        future.result()
+                        manifest[key] = dict(remote_objects[key], synced_at = time.time())
+                        bytes_fetched += remote_objects[key]['size']
+                        download_span.count(bytes = remote_objects[key]['size'])
+
+                except Exception:
+                    for pending in futures:
+                        pending.cancel()
+                    self.save_manifest(manifest, manifest_path)
+                    if self.validator is not None:
+                        self.validator.close(raise_error = False)
+                    raise
+
+            elapsed = time.perf_counter() - start
+            stream_stats = self.validator.close() if self.validator is not None else {}
+
+            files_deleted = 0
+            for key in stale_keys:
+                if self.config.delete_stale:
+                    local_file = dataset_path/Path(key).relative_to(self.config.s3_prefix)
+                    if local_file.exists():
+                        local_file.unlink()
+                        files_deleted += 1
+                manifest.pop(key)
+
+            self.save_manifest(manifest, manifest_path)
+
+            throughput = bytes_fetched/elapsed if elapsed > 0 else 0.0
+            stats = {
+                'files_fetched': len(to_fetch),
+                'files_skipped': files_skipped,
+                'files_deleted': files_deleted,
+                'bytes_fetched': bytes_fetched,
+                'throughput_bps': throughput,
+                'files_validated': stream_stats.get('files_validated', 0)
+            }
+            logger.info(f"Dataset sync completed in {elapsed:.2f}s: fetched {len(to_fetch)} files "
+                        f"({bytes_fetched} bytes, {throughput/1e6:.2f} MB/s), skipped {files_skipped}, deleted {files_deleted}")
+
+            return dataset_path, manifest_path, stats
+
+        except NoCredentialsError as e:
+            logger.error("AWS access error: No credentials provided or invalid credentials")
+            raise e
+
+        except Exception as e:
+            logger.error(f"Error during dataset sync from S3 bucket: {e}")
+            raise e
+
+    @instrument('data_ingestion')
     def initiate_data_ingestion(self):
         """
         Initiate data ingestion from S3 bucket
         """
         try:
             logger.info("Data ingestion started")
-            dataset_dir = self.navigate_s3_bucket()
-            logger.info("Data ingestion completed successfully")
+            if self.config.sync_mode:
+                dataset_dir, manifest_path, stats = self.sync_s3_bucket()
+                ingestion_artifacts = DataIngestionArtifact(dataset = dataset_dir, manifest = manifest_path, **stats)
+            else:
+                dataset_dir = self.navigate_s3_bucket()
+                ingestion_artifacts = DataIngestionArtifact(dataset = dataset_dir)
 
-            ingestion_artifacts = DataIngestionArtifact(dataset = dataset_dir)
+            logger.info("Data ingestion completed successfully")
             return ingestion_artifacts
 
 
@@ -1,21 +1,21 @@
-from email.mime import image
-from pathlib import Path
-from PIL import Image
+from contextlib import closing
 import json
-from ultralytics.models.nas import val
 import yaml
 from PotholeDetection.config_manager.component_config import DataValidationConfig, DataValidationArtifact
 from PotholeDetection.logging.logger import logger
+from PotholeDetection.logging.instrumentation import instrument
+from PotholeDetection.utils.dataset_scanner import DatasetScanner, SplitIndex
+from PotholeDetection.utils.issue_log import IssueLog, ErrorBudgetExceeded
+from PotholeDetection.utils.validation_cache import ValidationCache
 
 class DataValidation:
     def __init__(self, config: DataValidationConfig):
         self.config = config
-        self.invalid_img_ext = []
-        self.valid_imgs = 0
-        self.total_imgs = 0
-        self.total_annotations = 0
-        self.missing_annotation_files = []
-        self.invalid_annotation_files = []
+        self.issues = None
+        self.split_counters = {}
+        self.label_statistics = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
 
 
     def validate_folder_structure(self) -> bool:
@@ -64,152 +64,133 @@ class DataValidation:
             logger.error(f"Error during folder structure validation: {e}")
             return False
         
-    def validate_image_extensions(self) -> bool:
+    def build_scanner(self, cache: ValidationCache) -> DatasetScanner:
+        return DatasetScanner(
+            dataset = self.config.dataset,
+            data_split = self.config.data_split,
+            supported_img_ext = self.config.supported_img_ext,
+            num_workers = self.config.num_workers,
+            chunk_size = self.config.chunk_size,
+            cache = cache
+        )
+
+    def validate_image_extensions(self, split_index: SplitIndex) -> bool:
         """
-        Validate image file extensions in the dataset
+        Validate the image file extensions of a split right after its directory walk, before any image is opened
         Returns: bool: True if all image files have valid extensions, False otherwise
         """
-        logger.info("Validating image extensions")
-        valid = True
-        try:
-            for split in self.config.data_split:
-                images_path = self.config.dataset/split/'images'
-
-                image_list = [f for f in images_path.rglob('*') if f.is_file()]
-                for img_file in image_list:
-                    if img_file.suffix.lower() not in self.config.supported_img_ext:
-                        self.invalid_img_ext.append(img_file)
-                        logger.error(f"Invalid image extension found: {img_file}")
-                        valid = False
-
-        except Exception as e:
-            logger.error(f"Error during image extension validation: {e}")
-            valid = False
+        split = split_index.split
+        self.split_counters[split] = {'images': len(split_index.image_files), 'valid_images': 0, 'label_files': len(split_index.label_files)}
+        for img_file in split_index.image_files:
+            if img_file.suffix.lower() not in self.config.supported_img_ext:
+                self.issues.record(split, 'invalid_image_extension', img_file)
 
-        if valid:
-            logger.info("Image extension validation passed")
-        else:
-            logger.error("Image extension validation failed")
+        return self.issues.count(split, 'invalid_image_extension') == 0
 
-        return valid
-
-
-    def validate_image_files(self) -> bool:
+    def validate_image_files(self, split: str, image_results: dict) -> bool:
         """
-        Validate image files in the dataset
+        Record a chunk of image verdicts as soon as the scanner has verified it
         Checks if images can be opened and are not corrupted
         
-        Returns: bool: True if all images are valid, False otherwise
+        Returns: bool: True if all images of the chunk are valid, False otherwise
         """
-        logger.info("Validating image files")
         valid = True
-        try:
-            for split in self.config.data_split:
-                images_path = self.config.dataset/split/'images'
-
-                image_list = [f for f in images_path.rglob('*') if f.is_file()]
-                self.total_imgs = len(image_list)
-                for img in image_list:
-                    try:
-                        img = Image.open(img)
-                        img.verify()
-                        self.valid_imgs += 1
-                    except:
-                        logger.error(f"Corrupted image file found: {img}")
-                        valid = False
-        
-        except Exception as e:
-            logger.error(f"Error during image file validation: {e}")
-            valid = False
-        
-        if valid:
-            logger.info("Image file validation passed")
-        else:
-            logger.info("Image file validation failed")
+        for img, (ok, error) in image_results.items():
+            if ok:
+                self.split_counters[split]['valid_images'] += 1
+            else:
+                self.issues.record(split, 'corrupt_image', img, error)
+                valid = False
 
         return valid
 
+    def load_num_classes(self):
+        """
+        Read the number of classes from data.yaml, if available
+        Returns: int: Number of classes, None if it cannot be read
+        """
+        try:
+            with open(self.config.dataset/'data.yaml', 'r') as f:
+                return int(yaml.safe_load(f)['nc'])
+        except Exception:
+            return None
 
-    def validate_annotations(self) -> bool:
+    def validate_annotations(self, split_index: SplitIndex, num_classes: int = None) -> bool:
         """
-        Validate annotation files in the dataset
-        Checks if annotation files are in valid JSON format
+        Validate the annotation files of a split
+        Runs the class ID, value range, zero-area and duplicate box checks as vectorized masks over
+        all boxes of the split, and collects label statistics from the same array
         
         Returns: bool: True if all annotations are valid, False otherwise
         """
-        logger.info("Validating annotation files")
-        valid = True
-        try:
-            for split in self.config.data_split:
-                annotations_path = self.config.dataset/split/'labels'
-
-                annotations_list = [f for f in annotations_path.rglob("*.txt")]
-                self.total_annotations = len(annotations_list)
-                for ann_file in annotations_list:
-                    with open(ann_file, 'r') as f:
-                        lines = f.readlines()
-                        for line in lines:
-                            parts = line.strip().split()
-                            if len(parts) != 5:
-                                logger.error(f"Invalid annotation format in file: {ann_file}")
-                                self.invalid_annotation_files.append(ann_file)
-                                valid = False
-                            
-                            class_id, x_center, y_center, width, height = parts
-                            if not (0 <= x_center <= 1 and 0 <= y_center <= 1 and 0 <= width <= 1 and 0 <= height <= 1):
-                                logger.error(f"Invalid values for bounding boxes in file: {ann_file}")
-                                self.invalid_annotation_files.append(ann_file)
-                                valid = False
-                            
-                            if not class_id.isdigit() or int(class_id) < 0:
-                                logger.error(f"Invalid class ID in file: {ann_file}")
-                                self.invalid_annotation_files.append(ann_file)
-                                valid = False
-            
-        except Exception as e:
-            logger.error(f"Error during annotation file validation: {e}")
-            valid = False
-        
-        if valid: 
-            logger.info("Annotation file validation passed")
-        else:
-            logger.info("Annotation file validation failed")
+        split = split_index.split
+        self.label_statistics[split] = split_index.labels.statistics()
+        for ann_file, failures in split_index.labels.validate(num_classes).items():
+            self.issues.record(split, 'invalid_annotation', ann_file, '; '.join(failures))
 
-        return valid
+        return self.issues.count(split, 'invalid_annotation') == 0
 
 
-    def validate_image_label_pairs(self) -> bool:
+    def validate_image_label_pairs(self, split_index: SplitIndex) -> bool:
         """
-        Validate that each image has a corresponding annotation file
-        Returns: bool: True if all images have corresponding annotations, False otherwise
+        Validate the pairing of images and annotation files using the split's stem-keyed PairingIndex
+        Fails on images without labels, labels without images and image stems shared by several files.
+        Empty label files are reported as true negatives (warnings).
+        Returns: bool: True if every image is paired with exactly one annotation file, False otherwise
         """
-        logger.info("Validating image label pairs")
-        valid = True
+        split, pairs = split_index.split, split_index.pairs
+        for img_file in pairs.missing_labels():
+            self.issues.record(split, 'missing_annotation', img_file)
+
+        for ann_file in pairs.orphan_labels():
+            self.issues.record(split, 'orphan_annotation', ann_file)
+
+        for stem, img_files in pairs.duplicate_stems().items():
+            for img_file in img_files:
+                self.issues.record(split, 'duplicate_image_stem', img_file, f"stem '{stem}' shared by {len(img_files)} images")
+
+        empty_labels = pairs.empty_labels()
+        for ann_file in empty_labels:
+            self.issues.record(split, 'empty_annotation', ann_file, severity = 'warning')
+        logger.info(f"Split '{split}' has {len(empty_labels)} empty annotation files (true negatives)")
+
+        return not any(self.issues.count(split, check) for check in ('missing_annotation', 'orphan_annotation', 'duplicate_image_stem'))
+
+    def validate_splits(self) -> dict:
+        """
+        Scan the splits one at a time and validate each as soon as it is scanned: extensions right after the
+        directory walk, images chunk by chunk as they are verified, then annotations and image-label pairs.
+        Findings stream into the issue log, which stops the scan once the error budget is exceeded
+        Returns: dict: Result of every check over all scanned splits
+        """
+        checks = {'image_extensions_ok': True, 'images_ok': True, 'annotations_ok': True, 'image_label_mappping_ok': True}
+        num_classes = self.load_num_classes()
+
+        def on_walk(split_index: SplitIndex):
+            checks['image_extensions_ok'] &= self.validate_image_extensions(split_index)
+
+        def on_image_results(split: str, image_results: dict):
+            checks['images_ok'] &= self.validate_image_files(split, image_results)
+
+        cache = ValidationCache(self.config.artifacts_dir/self.config.cache_file, self.config.use_content_hash)
         try:
-            for split in self.config.data_split:
-                images_path = self.config.dataset/split/'images'
-                annotations_path = self.config.dataset/split/'labels'
-
-                images_list = [f for f in images_path.rglob('*')]
-                annotations_list = [f for f in annotations_path.rglob("*.txt")]
-
-                for img_file in images_list:
-                    ann_file  = annotations_path/(img_file.stem + '.txt')
-                    if not ann_file in annotations_list:
-                        logger.error(f"Missing annotation file for image: {img_file}")
-                        self.missing_annotation_files.append(img_file)
-                        valid = False
-        
-        except Exception as e:
-            logger.error(f"Error during image label pair validation: {e}")
-            valid = False   
+            if self.config.force_full_recheck:
+                cache.clear()
+
+            with closing(self.build_scanner(cache).iter_splits(on_walk, on_image_results)) as splits:
+                for split_index in splits:
+                    checks['annotations_ok'] &= self.validate_annotations(split_index, num_classes)
+                    checks['image_label_mappping_ok'] &= self.validate_image_label_pairs(split_index)
+
+            # Only a complete scan knows which cached files disappeared
+            cache.prune()
 
-        if valid:
-            logger.info("Image label pair validation passed")
-        else:
-            logger.info("Image label pair validation failed")
+        finally:
+            self.cache_hits, self.cache_misses = cache.hits, cache.misses
+            logger.info(f"Validation cache: {cache.hits} hits, {cache.misses} misses")
+            cache.close()
 
-        return valid     
+        return checks
 
     def validate_yaml_file(self) -> bool:
         """
@@ -241,39 +222,59 @@ class DataValidation:
             return False
 
     
+    @instrument('data_validation')
     def initiate_data_validation(self) -> DataValidationArtifact:
         logger.info("Data validation started")
 
         try:
+            if not self.config.artifacts_dir.exists():
+                self.config.artifacts_dir.mkdir(exist_ok = True, parents = True)
+
             folder_structure_ok = self.validate_folder_structure()
-            image_extensions_ok = self.validate_image_extensions()
-            images_ok = self.validate_image_files()
-            annotations_ok = self.validate_annotations()
-            image_label_mappping_ok = self.validate_image_label_pairs()
             data_yaml_ok = self.validate_yaml_file()
+            checks = {'image_extensions_ok': False, 'images_ok': False, 'annotations_ok': False, 'image_label_mappping_ok': False}
+            stopped_early = False
+
+            with IssueLog(
+                self.config.artifacts_dir/self.config.issue_log_file,
+                max_errors = self.config.max_errors,
+                buffer_size = self.config.issue_buffer_size,
+                sample_size = self.config.issue_sample_size
+            ) as self.issues:
+                if folder_structure_ok:
+                    try:
+                        checks = self.validate_splits()
+                    except ErrorBudgetExceeded as e:
+                        logger.error(f"Stopping data validation early: {e}")
+                        stopped_early = True
 
-            validation_flag = all([folder_structure_ok, image_extensions_ok, images_ok, annotations_ok, image_label_mappping_ok, data_yaml_ok])
+            validation_flag = all([folder_structure_ok, data_yaml_ok, *checks.values()]) and not stopped_early and self.issues.errors == 0
+
+            for split, counters in self.split_counters.items():
+                counters.update(self.issues.counts.get(split, {}))
 
             validation_report = self.config.artifacts_dir/'validation_report.json'
             report_content = {
                 "validation_status": validation_flag,
                 'folder_structure_ok': folder_structure_ok,
-                'image_extensions_ok': image_extensions_ok,
-                'images_ok': images_ok,
-                'annotations_ok': annotations_ok,
-                'image_label_mappping_ok': image_label_mappping_ok,
+                **checks,
                 'data_yaml_ok': data_yaml_ok,
-                'total_images': self.total_imgs,
-                'valid_images': self.valid_imgs,
-                'total_annotations': self.total_annotations,
-                'invalid_image_extensions': self.invalid_img_ext,
-                'missing_annotation_files': self.missing_annotation_files,
-                'invalid_annotation_files': self.invalid_annotation_files
+                'total_images': sum(c['images'] for c in self.split_counters.values()),
+                'valid_images': sum(c['valid_images'] for c in self.split_counters.values()),
+                'total_annotations': sum(c['label_files'] for c in self.split_counters.values()),
+                'splits': self.split_counters,
+                'label_statistics': self.label_statistics,
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'errors': self.issues.errors,
+                'warnings': self.issues.warnings,
+                'error_budget': self.config.max_errors,
+                'stopped_early': stopped_early,
+                'issue_counts': self.issues.totals(),
+                'issue_samples': self.issues.samples,
+                'issue_log': str(self.issues.log_file)
             }
 
-            if not self.config.artifacts_dir.exists():
-                self.config.artifacts_dir.mkdir(exist = True, parents = True)
-
             with open(validation_report, 'w') as f:
                 json.dump(report_content, f, indent = 4)
                 logger.info(f'Validation report save to location: {validation_report}')
@@ -283,9 +284,9 @@ class DataValidation:
                 validation_status = validation_flag
             )
             
-            logger.info("Data validation completed")
+            logger.info(f"Data validation completed: {self.issues.errors} errors, {self.issues.warnings} warnings")
             return validation_artifacts
 
         except Exception as e:
             logger.error("Error in data validation")
-            raise e
\ No newline at end of file
+            raise e
@@ -0,0 +1,227 @@
+import json
+from pathlib import Path
+from functools import partial
+import yaml
+from PotholeDetection.config_manager.component_config import DatasetDedupConfig, DatasetDedupArtifact
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.logging.instrumentation import instrument, span
+from PotholeDetection.utils.dataset_scanner import DatasetScanner
+from PotholeDetection.utils.perceptual_hash import BKTree, hash_images
+from PotholeDetection.utils.validation_cache import ValidationCache
+
+
+YAML_KEYS = {'train': 'train', 'valid': 'val', 'val': 'val', 'test': 'test'}
+
+
+class DatasetDeduplicator:
+    """
+    Finds near-duplicate images (e.g. runs of almost identical dashcam frames) by perceptual hashing every image
+    across a process pool and indexing the hashes in a BK-tree for Hamming-radius queries.
+    Reports duplicate clusters and near-duplicates leaking across splits, and writes a thinned image list for the
+    thinned splits that keeps one image per neighbourhood and drops images leaking into the evaluation splits.
+    """
+    def __init__(self, config: DatasetDedupConfig):
+        self.config = config
+        self.entries = []
+        self.neighbours = []
+
+    def hash_splits(self) -> dict:
+        """
+        Perceptual hash the images of every split. Hashes are cached by file fingerprint, so reruns only hash new or changed images
+        Returns: dict: Mapping of split name to the number of images that could not be hashed
+        """
+        cache = ValidationCache(self.config.artifacts_dir/self.config.cache_file)
+        scanner = DatasetScanner(
+            dataset = self.config.dataset,
+            data_split = self.config.data_split,
+            supported_img_ext = self.config.supported_img_ext,
+            num_workers = self.config.num_workers,
+            chunk_size = self.config.chunk_size,
+            cache = cache
+        )
+        kind = f'dhash{self.config.hash_size}'
+        unreadable = {}
+        try:
+            for split in self.config.data_split:
+                images = sorted(f for f in scanner.walk_split(split).image_files if f.suffix.lower() in self.config.supported_img_ext)
+                with span(f'hash_{split}', workers = scanner.num_workers) as hash_span:
+                    results = scanner.run_cached(partial(hash_images, hash_size = self.config.hash_size), images, kind)
+                    hash_span.count(len(images))
+
+                unreadable[split] = 0
+                for path in images:
+                    value, error = results[path]
+                    if value is None:
+                        unreadable[split] += 1
+                        logger.warning(f"Could not hash {path}: {error}")
+                        continue
+                    self.entries.append((split, path, value))
+            cache.prune()
+
+        finally:
+            if scanner.executor is not None:
+                scanner.executor.shutdown(cancel_futures = True)
+            cache.close()
+
+        return unreadable
+
+    def find_neighbours(self):
+        """
+        Index every hash in a BK-tree and collect the neighbours within the radius of every image
+        """
+        tree = BKTree()
+        for i, (_, _, value) in enumerate(self.entries):
+            tree.add(value, i)
+
+        with span('query_neighbours') as query_span:
+            self.neighbours = [
+                [j for j, _ in tree.query(value, self.config.radius) if j != i]
+                for i, (_, _, value) in enumerate(self.entries)
+            ]
+            query_span.count(len(self.entries))
+
+    def clusters(self) -> list:
+        """
+        Returns: list: Connected components (lists of entry ids) of the near-duplicate graph with more than one image, largest first
+        """
+        parent = list(range(len(self.entries)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, neighbours in enumerate(self.neighbours):
+            for j in neighbours:
+                parent[find(i)] = find(j)
+
+        components = {}
+        for i in range(len(self.entries)):
+            components.setdefault(find(i), []).append(i)
+        return sorted((c for c in components.values() if len(c) > 1), key = len, reverse = True)
+
+    def cross_split_leaks(self) -> dict:
+        """
+        Returns: dict: Per split pair, the number of near-duplicate image pairs and a sample of them
+        """
+        leaks = {}
+        for i, neighbours in enumerate(self.neighbours):
+            split_i, path_i, value_i = self.entries[i]
+            for j in neighbours:
+                split_j, path_j, value_j = self.entries[j]
+                if j < i or split_i == split_j:
+                    continue
+                pair = '-'.join(sorted((split_i, split_j)))
+                leak = leaks.setdefault(pair, {'pairs': 0, 'samples': []})
+                leak['pairs'] += 1
+                if len(leak['samples']) < self.config.sample_size:
+                    leak['samples'].append({split_i: str(path_i), split_j: str(path_j), 'distance': bin(value_i ^ value_j).count('1')})
+        return leaks
+
+    def thin_split(self, split: str) -> tuple:
+        """
+        Greedily keep an image only if no already kept image of the split is within the radius, so a run of near-identical
+        frames keeps its first frame instead of collapsing a whole drive into one image. Images with a near-duplicate in a
+        split that is not thinned (valid, test) are dropped when drop_leaks is set
+        Returns: tuple: (kept image paths, number of near-duplicates dropped, number of leaked images dropped)
+        """
+        evaluation_splits = set(self.config.data_split) - set(self.config.thin_splits)
+        kept, kept_paths, duplicates, leaked = set(), [], 0, 0
+        for i, (entry_split, path, _) in enumerate(self.entries):
+            if entry_split != split:
+                continue
+            if self.config.drop_leaks and any(self.entries[j][0] in evaluation_splits for j in self.neighbours[i]):
+                leaked += 1
+            elif any(j in kept for j in self.neighbours[i]):
+                duplicates += 1
+            else:
+                kept.add(i)
+                kept_paths.append(path)
+        return kept_paths, duplicates, leaked
+
+    def write_data_yaml(self, image_lists: dict) -> Path:
+        """
+        Write a copy of the dataset's data.yaml whose thinned splits point to their image lists. Each list is written to
+        <artifacts_dir>/<split>/images.txt, so the packed trainer still finds the packed shards of the split
+        Returns: Path: The thinned data.yaml
+        """
+        with open(self.config.dataset/'data.yaml', 'r') as f:
+            data = yaml.safe_load(f)
+        data.setdefault('path', str(Path(self.config.dataset).resolve()))
+
+        for split, paths in image_lists.items():
+            list_file = self.config.artifacts_dir/split/'images.txt'
+            list_file.parent.mkdir(parents = True, exist_ok = True)
+            list_file.write_text(''.join(f'{Path(p).resolve()}\n' for p in paths))
+            data[YAML_KEYS.get(split, split)] = str(list_file.resolve())
+
+        data_yaml = self.config.artifacts_dir/'data.yaml'
+        with open(data_yaml, 'w') as f:
+            yaml.safe_dump(data, f, sort_keys = False)
+        return data_yaml
+
+    @instrument('dataset_dedup')
+    def initiate_dataset_dedup(self) -> DatasetDedupArtifact:
+        try:
+            logger.info(f"Dataset deduplication started: {self.config.hash_size**2} bit perceptual hashes, radius {self.config.radius} bits")
+            self.config.artifacts_dir.mkdir(parents = True, exist_ok = True)
+            unreadable = self.hash_splits()
+            self.find_neighbours()
+
+            clusters = self.clusters()
+            leaks = self.cross_split_leaks()
+
+            thinned, image_lists = {}, {}
+            for split in self.config.thin_splits:
+                kept, duplicates, leaked = self.thin_split(split)
+                total = sum(1 for entry in self.entries if entry[0] == split)
+                image_lists[split] = kept
+                thinned[split] = {'images': total, 'kept': len(kept), 'near_duplicates_removed': duplicates, 'leaks_removed': leaked}
+            data_yaml = self.write_data_yaml(image_lists)
+
+            removed_train = thinned['train']['images'] - thinned['train']['kept'] if 'train' in thinned else 0
+            epoch_seconds = removed_train/self.config.train_images_per_sec if self.config.train_images_per_sec else None
+
+            report = {
+                'hash_bits': self.config.hash_size**2,
+                'radius': self.config.radius,
+                'images': {split: sum(1 for entry in self.entries if entry[0] == split) for split in self.config.data_split},
+                'unreadable': unreadable,
+                'duplicate_clusters': len(clusters),
+                'images_in_clusters': sum(len(c) for c in clusters),
+                'largest_clusters': [
+                    [{'split': self.entries[i][0], 'path': str(self.entries[i][1])} for i in cluster]
+                    for cluster in clusters[:self.config.sample_size]
+                ],
+                'cross_split_leaks': leaks,
+                'thinned': thinned,
+                'images_removed': sum(s['images'] - s['kept'] for s in thinned.values()),
+                'train_epoch_seconds_saved': epoch_seconds,
+                'train_seconds_saved': epoch_seconds*self.config.epochs if epoch_seconds is not None else None,
+                'data_yaml': str(data_yaml)
+            }
+            report_path = self.config.artifacts_dir/'dedup_report.json'
+            with open(report_path, 'w') as f:
+                json.dump(report, f, indent = 4)
+
+            logger.info(f"Found {len(clusters)} near-duplicate clusters ({report['images_in_clusters']} images) and "
+                        f"{sum(leak['pairs'] for leak in leaks.values())} cross-split near-duplicate pairs")
+            for split, stats in thinned.items():
+                logger.info(f"Thinned '{split}': kept {stats['kept']} of {stats['images']} images "
+                            f"({stats['near_duplicates_removed']} near-duplicates, {stats['leaks_removed']} leaked into evaluation splits)")
+            if epoch_seconds is not None:
+                logger.info(f"Training on the thinned set saves ~{epoch_seconds:.1f}s per epoch, ~{report['train_seconds_saved']:.0f}s over {self.config.epochs} epochs")
+
+            return DatasetDedupArtifact(
+                dedup_report = report_path,
+                data_yaml = data_yaml,
+                duplicate_clusters = len(clusters),
+                cross_split_pairs = sum(leak['pairs'] for leak in leaks.values()),
+                images_removed = report['images_removed'],
+                epoch_seconds_saved = epoch_seconds
+            )
+
+        except Exception as e:
+            logger.error(f"Error in dataset deduplication: {e}")
+            raise e
@@ -0,0 +1,229 @@
+import json
+import time
+import zlib
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import yaml
+import numpy as np
+from PotholeDetection.config_manager.component_config import DatasetPackingConfig, DatasetPackingArtifact
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.logging.instrumentation import current_span, instrument, span
+from PotholeDetection.utils.label_loader import parse_labels
+from PotholeDetection.utils.packed_dataset import INDEX_FILE, LABELS_FILE, PackedImages, resize_long_side, shard_path
+from PotholeDetection.utils.utils import list_images
+
+
+def file_fingerprint(path: Path) -> list:
+    if not path.exists():
+        return [0, 0]
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_resized(img_file: Path, img_size: int) -> tuple:
+    """
+    Decode and resize one image. Runs on the packing thread pool (OpenCV releases the GIL)
+    Returns: tuple: (resized image, original (h, w))
+    """
+    img = cv2.imread(str(img_file), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError(f"Unable to decode image {img_file}")
+    return resize_long_side(img, img_size), img.shape[:2]
+
+
+class DatasetPacker:
+    """
+    Packs every split into sharded, memory-mapped arrays of images resized once to img_size, plus a compact
+    label index, so training reads zero-copy slices instead of decoding JPEGs every epoch.
+    Images are assigned to shards by a hash of their path, so adding or changing files only rebuilds the shards they fall in.
+    """
+    def __init__(self, config: DatasetPackingConfig):
+        self.config = config
+
+    def load_index(self, split_dir: Path) -> dict:
+        index_path = split_dir/INDEX_FILE
+        if not index_path.exists():
+            return None
+
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        return index if index.get('img_size') == self.config.img_size else None
+
+    def plan_shards(self, image_files: list, previous: dict) -> tuple:
+        """
+        Assign images to shards. The shard count is kept from the previous index unless shards grew to twice the target size
+        Returns: tuple: (number of shards, dict of shard id -> member image files)
+        """
+        num_shards = max(1, -(-len(image_files)//self.config.shard_size))
+        if previous and len(image_files) <= 2*self.config.shard_size*previous['num_shards']:
+            num_shards = previous['num_shards']
+
+        shards = {}
+        for img_file in image_files:
+            shards.setdefault(zlib.crc32(str(img_file).encode()) % num_shards, []).append(img_file)
+        return num_shards, shards
+
+    def shard_fingerprint(self, members: list) -> str:
+        digest = hashlib.sha256(str(self.config.img_size).encode())
+        for img_file in members:
+            digest.update(f'{img_file}:{file_fingerprint(img_file)}'.encode())
+        return digest.hexdigest()
+
+    def write_shard(self, executor: ThreadPoolExecutor, split_dir: Path, shard: int, members: list) -> list:
+        """
+        Decode, resize and write the images of one shard into a fresh memory-mapped array
+        Returns: list: Index entries of the shard's images
+        """
+        size = self.config.img_size
+        tmp_path = split_dir/f'shard_{shard:05d}.tmp.npy'
+        array = np.lib.format.open_memmap(tmp_path, mode = 'w+', dtype = np.uint8, shape = (len(members), size, size, 3))
+
+        shard_span = current_span.get()
+
+        def decode(img_file: Path) -> tuple:
+            with shard_span.track('decode_resize'):
+                return load_resized(img_file, size)
+
+        entries = []
+        for slot, (img, hw0) in enumerate(executor.map(decode, members)):
+            h, w = img.shape[:2]
+            array[slot, :h, :w] = img
+            entries.append({'shard': shard, 'slot': slot, 'hw0': list(hw0), 'hw': [h, w]})
+
+        array.flush()
+        del array
+        tmp_path.replace(shard_path(split_dir, shard))
+        return entries
+
+    def pack_labels(self, split_dir: Path, image_files: list, images_dir: Path, labels_dir: Path) -> tuple:
+        """
+        Write the labels of a split as one (n, 5) array with per-image offsets. The label of an image is paired by its
+        path relative to images_dir, mirrored under labels_dir (as in the PairingIndex)
+        Returns: tuple: (dict of image file -> label index, SHA-256 of the packed labels)
+        """
+        images_dir = images_dir.resolve()
+        label_files = [labels_dir/f.relative_to(images_dir).with_suffix('.txt') for f in image_files]
+        existing = [f for f in label_files if f.exists()]
+        parsed = {path: rows for path, rows, errors in parse_labels(existing)}
+
+        per_image = [parsed.get(f, np.empty((0, 5))) for f in label_files]
+        rows = np.concatenate(per_image).astype(np.float32)
+        offsets = np.concatenate([[0], np.cumsum([len(r) for r in per_image])]).astype(np.int64)
+        np.savez(split_dir/LABELS_FILE, rows = rows, offsets = offsets)
+        digest = hashlib.sha256(rows.tobytes())
+        digest.update(offsets.tobytes())
+        return {str(f): i for i, f in enumerate(image_files)}, digest.hexdigest()
+
+    def pack_split(self, split: str) -> dict:
+        """
+        Pack one split, rewriting only the shards whose member files changed
+        Returns: dict: Counts of images, written and reused shards
+        """
+        images_dir = self.config.dataset/split/'images'
+        split_dir = self.config.artifacts_dir/split
+        split_dir.mkdir(parents = True, exist_ok = True)
+
+        image_files = [f.resolve() for f in list_images(images_dir, self.config.supported_img_ext)]
+        previous = self.load_index(split_dir)
+        previous_entries = {entry['file']: entry for entry in previous['images']} if previous else {}
+        num_shards, shards = self.plan_shards(image_files, previous)
+
+        entries, fingerprints = {}, {}
+        written, reused = 0, 0
+        with span(f'pack_{split}', workers = self.config.num_workers) as pack_span, ThreadPoolExecutor(max_workers = self.config.num_workers) as executor:
+            for shard, members in sorted(shards.items()):
+                fingerprints[str(shard)] = self.shard_fingerprint(members)
+                if previous and previous['shards'].get(str(shard)) == fingerprints[str(shard)] and shard_path(split_dir, shard).exists():
+                    for img_file in members:
+                        entries[str(img_file)] = previous_entries[str(img_file)]
+                    reused += 1
+                else:
+                    for img_file, entry in zip(members, self.write_shard(executor, split_dir, shard, members)):
+                        entries[str(img_file)] = entry
+                    written += 1
+                    pack_span.count(len(members))
+
+        for stale in split_dir.glob('shard_*.npy'):
+            if int(stale.stem.split('_')[1].split('.')[0]) not in shards:
+                stale.unlink()
+
+        label_idx, labels_sha256 = self.pack_labels(split_dir, image_files, images_dir, self.config.dataset/split/'labels')
+        index = {
+            'img_size': self.config.img_size,
+            'num_shards': num_shards,
+            'shards': fingerprints,
+            'labels_sha256': labels_sha256,
+            'images': [{'file': file, 'label_idx': label_idx[file], **entry} for file, entry in entries.items()]
+        }
+        tmp_path = split_dir/(INDEX_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f)
+        tmp_path.replace(split_dir/INDEX_FILE)
+
+        logger.info(f"Packed {split}: {len(image_files)} images, {written} shards written, {reused} shards unchanged")
+        return {'images': len(image_files), 'shards_written': written, 'shards_reused': reused}
+
+    @instrument('benchmark_loader')
+    def benchmark_loader(self, split: str = 'train') -> dict:
+        """
+        Measure the training data loader (with augmentation) on the original images and on the packed shards
+        Returns: dict: images/sec of both loaders
+        """
+        from ultralytics.cfg import get_cfg
+        from ultralytics.data.dataset import YOLODataset
+        from PotholeDetection.utils.packed_trainer import PackedYOLODataset
+
+        images_dir = self.config.dataset/split/'images'
+        with open(self.config.dataset/'data.yaml', 'r') as f:
+            names = yaml.safe_load(f).get('names', ['pothole'])
+        data = {'names': dict(enumerate(names)) if isinstance(names, list) else names, 'channels': 3}
+
+        hyp = get_cfg()
+        hyp.imgsz = self.config.img_size
+        common = dict(img_path = str(images_dir), imgsz = self.config.img_size, augment = True, hyp = hyp, data = data, prefix = f'{split}: ')
+        loaders = {
+            'original': YOLODataset(**common),
+            'packed': PackedYOLODataset(**common, packed = PackedImages(self.config.artifacts_dir/split))
+        }
+
+        report = {}
+        for name, dataset in loaders.items():
+            n = min(self.config.benchmark_images, len(dataset))
+            start = time.perf_counter()
+            for i in range(n):
+                dataset[i]
+            report[name] = n/(time.perf_counter() - start)
+
+        logger.info(f"Data loader throughput on {split}: original {report['original']:.1f} img/s, packed {report['packed']:.1f} img/s")
+        return report
+
+    @instrument('dataset_packing')
+    def initiate_dataset_packing(self) -> DatasetPackingArtifact:
+        try:
+            logger.info(f"Dataset packing started at image size {self.config.img_size}")
+            stats = {split: self.pack_split(split) for split in self.config.data_split if (self.config.dataset/split/'images').exists()}
+
+            throughput = None
+            if self.config.benchmark_images and 'train' in stats and stats['train']['images']:
+                throughput = self.benchmark_loader('train')
+
+            report_path = self.config.artifacts_dir/'packing_report.json'
+            with open(report_path, 'w') as f:
+                json.dump({'img_size': self.config.img_size, 'splits': stats, 'loader_images_per_sec': throughput}, f, indent = 4)
+
+            logger.info(f"Dataset packing completed. Packed dataset at {self.config.artifacts_dir}")
+            return DatasetPackingArtifact(
+                packed_dir = self.config.artifacts_dir,
+                packing_report = report_path,
+                index_files = [self.config.artifacts_dir/split/INDEX_FILE for split in stats],
+                images_packed = sum(s['images'] for s in stats.values()),
+                shards_written = sum(s['shards_written'] for s in stats.values()),
+                shards_reused = sum(s['shards_reused'] for s in stats.values()),
+                loader_images_per_sec = throughput
+            )
+
+        except Exception as e:
+            logger.error(f"Error in dataset packing: {e}")
+            raise e
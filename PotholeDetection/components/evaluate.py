@@ -0,0 +1,275 @@
+import json
+import time
+from pathlib import Path
+import numpy as np
+from PotholeDetection.config_manager.component_config import ModelEvaluationConfig, ModelEvaluationArtifact, PredictionConfig
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.logging.instrumentation import instrument
+from PotholeDetection.utils.utils import box_iou, file_sha256, list_images
+
+
+def match_predictions(pred_boxes: np.ndarray, pred_classes: np.ndarray, gt_boxes: np.ndarray, gt_classes: np.ndarray, iou_thresholds: np.ndarray) -> np.ndarray:
+    """
+    Greedy one-to-one matching of the predictions of one image to its ground truth at several IoU thresholds at once
+    Returns: np.ndarray: Boolean (num_predictions, num_thresholds) true positive matrix
+    """
+    tp = np.zeros((len(pred_boxes), len(iou_thresholds)), dtype = bool)
+    if not len(pred_boxes) or not len(gt_boxes):
+        return tp
+
+    iou = box_iou(gt_boxes, pred_boxes)*(gt_classes[:, None] == pred_classes[None, :])
+    for t, threshold in enumerate(iou_thresholds):
+        gt_idx, pred_idx = np.nonzero(iou >= threshold)
+        if not len(gt_idx):
+            continue
+
+        # Highest IoU pairs first, then keep the first occurrence of each prediction and each ground truth box
+        order = np.argsort(-iou[gt_idx, pred_idx], kind = 'stable')
+        gt_idx, pred_idx = gt_idx[order], pred_idx[order]
+        _, first = np.unique(pred_idx, return_index = True)
+        gt_idx, pred_idx = gt_idx[first], pred_idx[first]
+        _, first = np.unique(gt_idx, return_index = True)
+        tp[pred_idx[first], t] = True
+
+    return tp
+
+
+def average_precision(tp: np.ndarray, scores: np.ndarray, num_gt: int) -> tuple:
+    """
+    COCO-style 101-point interpolated AP of one class at every IoU threshold
+    Returns: tuple: (AP per threshold, recall and precision curves at the first threshold)
+    """
+    if num_gt == 0 or not len(scores):
+        return np.zeros(tp.shape[1]), np.zeros(0), np.zeros(0)
+
+    order = np.argsort(-scores, kind = 'stable')
+    tp_cumsum = np.cumsum(tp[order], axis = 0)
+    fp_cumsum = np.cumsum(~tp[order], axis = 0)
+    recall = tp_cumsum/num_gt
+    precision = tp_cumsum/(tp_cumsum + fp_cumsum)
+
+    # Precision envelope: monotonically decreasing in recall
+    envelope = np.flip(np.maximum.accumulate(np.flip(precision, axis = 0), axis = 0), axis = 0)
+    recall_points = np.linspace(0, 1, 101)
+    ap = np.empty(tp.shape[1])
+    for t in range(tp.shape[1]):
+        idx = np.searchsorted(recall[:, t], recall_points, side = 'left')
+        ap[t] = np.where(idx < len(envelope), envelope[np.minimum(idx, len(envelope) - 1), t], 0).mean()
+
+    return ap, recall[:, 0], envelope[:, 0]
+
+
+class ModelEvaluator:
+    """
+    Scores a model on a dataset split. The raw low-confidence predictions are computed once and cached on
+    disk keyed by the model's SHA-256, so re-scoring at other confidence or IoU thresholds skips inference.
+    """
+    def __init__(self, config: ModelEvaluationConfig):
+        self.config = config
+        self.images_dir = self.config.dataset/self.config.split/'images'
+        self.labels_dir = self.config.dataset/self.config.split/'labels'
+        self.predictions = None
+        self.ground_truth = None
+
+    def cache_path(self) -> Path:
+        """
+        Returns: Path: Predictions cache of the model, split and inference settings
+        """
+        model_hash = file_sha256(self.config.model_path)
+        key = f'{model_hash[:16]}_{self.config.split}_{self.config.img_size}_{self.config.conf_floor}_{self.config.nms_iou}'
+        return self.config.artifacts_dir/'predictions'/f'{key}.npz'
+
+    @instrument('inference')
+    def run_inference(self, image_files: list) -> dict:
+        """
+        Batched inference over the split at the confidence floor
+        Returns: dict: Flat prediction arrays indexed by image
+        """
+        from PotholeDetection.pipeline.predict_pipeline import Predictor
+
+        predictor = Predictor(PredictionConfig(
+            model_path = self.config.model_path,
+            img_size = self.config.img_size,
+            batch_size = self.config.batch_size,
+            conf_threshold = self.config.conf_floor,
+            iou_threshold = self.config.nms_iou,
+            device = self.config.device,
+            backend = 'pt'
+        ))
+
+        image_idx, boxes, scores, classes, shapes = [], [], [], [], []
+        start = time.perf_counter()
+        try:
+            for i, detections in enumerate(predictor.predict(image_files)):
+                image_idx.append(np.full(len(detections.boxes), i, dtype = np.int32))
+                boxes.append(detections.boxes)
+                scores.append(detections.scores)
+                classes.append(detections.classes)
+                shapes.append(detections.orig_shape)
+        finally:
+            predictor.close()
+
+        logger.info(f"Inference over {len(image_files)} {self.config.split} images took {time.perf_counter() - start:.1f}s")
+        return {
+            'images': np.array([Path(f).name for f in image_files]),
+            'shapes': np.array(shapes, dtype = np.int32).reshape(-1, 2),
+            'image_idx': np.concatenate(image_idx) if image_idx else np.empty(0, dtype = np.int32),
+            'boxes': np.concatenate(boxes) if boxes else np.empty((0, 4), dtype = np.float32),
+            'scores': np.concatenate(scores) if scores else np.empty(0, dtype = np.float32),
+            'classes': np.concatenate(classes) if classes else np.empty(0, dtype = np.int32)
+        }
+
+    def load_predictions(self) -> Path:
+        """
+        Load the cached predictions of the model, running inference only on a cache miss
+        Returns: Path: Predictions cache file
+        """
+        cache_path = self.cache_path()
+        image_files = list_images(self.images_dir, self.config.supported_img_ext)
+        names = [f.name for f in image_files]
+
+        if cache_path.exists():
+            with np.load(cache_path) as cached:
+                predictions = dict(cached)
+            if predictions['images'].tolist() == names:
+                logger.info(f"Using cached predictions {cache_path}")
+                self.predictions = predictions
+                return cache_path
+            logger.info(f"{self.config.split} images changed since {cache_path} was written. Re-running inference")
+
+        self.predictions = self.run_inference(image_files)
+        cache_path.parent.mkdir(parents = True, exist_ok = True)
+        tmp_path = cache_path.with_suffix('.tmp.npz')
+        np.savez(tmp_path, **self.predictions)
+        tmp_path.replace(cache_path)
+        logger.info(f"Predictions cached at {cache_path}")
+        return cache_path
+
+    def load_ground_truth(self) -> dict:
+        """
+        Returns: dict: Flat ground truth arrays (image index, xyxy pixel boxes, classes)
+        """
+        image_idx, boxes, classes = [], [], []
+        for i, (name, (h, w)) in enumerate(zip(self.predictions['images'], self.predictions['shapes'])):
+            label_file = self.labels_dir/(Path(str(name)).stem + '.txt')
+            if not label_file.exists() or not label_file.read_text().strip():
+                continue
+
+            labels = np.loadtxt(label_file, ndmin = 2)
+            xc, yc, bw, bh = labels[:, 1:5].T
+            image_idx.append(np.full(len(labels), i, dtype = np.int32))
+            boxes.append(np.stack([(xc - bw/2)*w, (yc - bh/2)*h, (xc + bw/2)*w, (yc + bh/2)*h], axis = 1).astype(np.float32))
+            classes.append(labels[:, 0].astype(np.int32))
+
+        self.ground_truth = {
+            'image_idx': np.concatenate(image_idx) if image_idx else np.empty(0, dtype = np.int32),
+            'boxes': np.concatenate(boxes) if boxes else np.empty((0, 4), dtype = np.float32),
+            'classes': np.concatenate(classes) if classes else np.empty(0, dtype = np.int32)
+        }
+        return self.ground_truth
+
+    def score(self, pred_keep: np.ndarray, gt_keep: np.ndarray, conf_threshold: float, iou_thresholds: np.ndarray) -> dict:
+        """
+        Match a subset of predictions to a subset of ground truth and compute detection metrics
+        Returns: dict: mAP@0.5, mAP@0.5:0.95, precision and recall at conf_threshold, and the PR curve
+        """
+        pred, gt = self.predictions, self.ground_truth
+        pred_idx, gt_idx = np.flatnonzero(pred_keep), np.flatnonzero(gt_keep)
+
+        # Predictions and ground truth are grouped by image once, so matching is a single pass over the images
+        pred_groups = np.split(pred_idx, np.flatnonzero(np.diff(pred['image_idx'][pred_idx])) + 1) if len(pred_idx) else []
+        gt_by_image = {}
+        if len(gt_idx):
+            for group in np.split(gt_idx, np.flatnonzero(np.diff(gt['image_idx'][gt_idx])) + 1):
+                gt_by_image[int(gt['image_idx'][group[0]])] = group
+
+        tp = np.zeros((len(pred_idx), len(iou_thresholds)), dtype = bool)
+        offset = 0
+        for group in pred_groups:
+            gt_group = gt_by_image.get(int(pred['image_idx'][group[0]]), np.empty(0, dtype = np.int64))
+            tp[offset:offset + len(group)] = match_predictions(
+                pred['boxes'][group], pred['classes'][group], gt['boxes'][gt_group], gt['classes'][gt_group], iou_thresholds
+            )
+            offset += len(group)
+
+        scores, classes = pred['scores'][pred_idx], pred['classes'][pred_idx]
+        gt_classes = gt['classes'][gt_idx]
+        ap_per_class, curves = {}, {}
+        for cls in np.unique(np.concatenate([classes, gt_classes])):
+            in_class = classes == cls
+            ap, recall_curve, precision_curve = average_precision(tp[in_class], scores[in_class], int((gt_classes == cls).sum()))
+            ap_per_class[int(cls)] = ap
+            curves[int(cls)] = {'recall': recall_curve[::max(1, len(recall_curve)//200)].round(4).tolist(),
+                                'precision': precision_curve[::max(1, len(precision_curve)//200)].round(4).tolist()}
+
+        ap = np.stack(list(ap_per_class.values())) if ap_per_class else np.zeros((1, len(iou_thresholds)))
+        confident = scores >= conf_threshold
+        true_positives = int(tp[confident, 0].sum())
+        return {
+            'num_predictions': int(confident.sum()),
+            'num_ground_truth': len(gt_idx),
+            'map50': float(ap[:, 0].mean()),
+            'map50_95': float(ap.mean()),
+            'precision': true_positives/max(int(confident.sum()), 1),
+            'recall': true_positives/max(len(gt_idx), 1),
+            'ap_per_class': {cls: float(values.mean()) for cls, values in ap_per_class.items()},
+            'pr_curve': curves
+        }
+
+    def evaluate(self, conf_threshold: float = None, iou_thresholds: list = None) -> dict:
+        """
+        Score the cached predictions. Only matching is repeated, so sweeping thresholds takes seconds
+        Returns: dict: Overall metrics and metrics per box size range
+        """
+        conf_threshold = self.config.conf_threshold if conf_threshold is None else conf_threshold
+        iou_thresholds = np.asarray(iou_thresholds or self.config.iou_thresholds, dtype = np.float32)
+        if self.predictions is None:
+            self.load_predictions()
+        if self.ground_truth is None:
+            self.load_ground_truth()
+
+        start = time.perf_counter()
+        all_pred = np.ones(len(self.predictions['scores']), dtype = bool)
+        all_gt = np.ones(len(self.ground_truth['classes']), dtype = bool)
+        metrics = self.score(all_pred, all_gt, conf_threshold, iou_thresholds)
+
+        pred_area = (self.predictions['boxes'][:, 2:] - self.predictions['boxes'][:, :2]).prod(axis = 1)
+        gt_area = (self.ground_truth['boxes'][:, 2:] - self.ground_truth['boxes'][:, :2]).prod(axis = 1)
+        metrics['by_size'] = {}
+        for name, (low, high) in self.config.size_ranges.items():
+            size_metrics = self.score((pred_area >= low) & (pred_area < high), (gt_area >= low) & (gt_area < high), conf_threshold, iou_thresholds)
+            size_metrics.pop('pr_curve')
+            metrics['by_size'][name] = size_metrics
+
+        metrics['conf_threshold'] = conf_threshold
+        metrics['iou_thresholds'] = iou_thresholds.round(2).tolist()
+        logger.info(f"Scored {len(self.predictions['images'])} images in {time.perf_counter() - start:.2f}s: "
+                    f"mAP50 {metrics['map50']:.4f}, mAP50-95 {metrics['map50_95']:.4f}")
+        return metrics
+
+    @instrument('model_evaluation')
+    def initiate_model_evaluation(self) -> ModelEvaluationArtifact:
+        try:
+            logger.info(f"Model evaluation started for {self.config.model_path} on the {self.config.split} split")
+            self.config.artifacts_dir.mkdir(parents = True, exist_ok = True)
+            cache_path = self.load_predictions()
+            metrics = self.evaluate()
+
+            report_path = self.config.artifacts_dir/'evaluation_report.json'
+            with open(report_path, 'w') as f:
+                json.dump({'model': str(self.config.model_path), 'split': self.config.split, **metrics}, f, indent = 4)
+
+            logger.info(f"Model evaluation completed. Report saved at {report_path}")
+            return ModelEvaluationArtifact(
+                map50 = metrics['map50'],
+                map50_95 = metrics['map50_95'],
+                precision = metrics['precision'],
+                recall = metrics['recall'],
+                metrics_by_size = metrics['by_size'],
+                evaluation_report = report_path,
+                predictions_cache = cache_path
+            )
+
+        except Exception as e:
+            logger.error(f"Error in model evaluation: {e}")
+            raise e
@@ -0,0 +1,302 @@
+import os
+import json
+import math
+import time
+import random
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from PotholeDetection.config_manager.component_config import HyperparameterSearchConfig, HyperparameterSearchArtifact
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.logging.instrumentation import instrument
+
+
+def sample_params(search_space: dict, rng: random.Random) -> dict:
+    """
+    Draw one configuration. Dimensions are ('log', low, high), ('uniform', low, high) or ('choice', values)
+    Returns: dict: Sampled ModelTrainingConfig overrides
+    """
+    params = {}
+    for name, (kind, *args) in search_space.items():
+        if kind == 'log':
+            params[name] = float(f'{math.exp(rng.uniform(math.log(args[0]), math.log(args[1]))):.4g}')
+        elif kind == 'uniform':
+            params[name] = float(f'{rng.uniform(args[0], args[1]):.4g}')
+        elif kind == 'choice':
+            params[name] = rng.choice(args[0])
+        else:
+            raise ValueError(f"Unknown search space dimension '{kind}' for {name}")
+    return params
+
+
+def rung_budgets(min_epochs: int, max_epochs: int, reduction_factor: int) -> list:
+    """
+    Returns: list: Cumulative epoch budget of every rung, min_epochs * reduction_factor^k up to max_epochs
+    """
+    budgets = [min_epochs]
+    while budgets[-1]*reduction_factor <= max_epochs:
+        budgets.append(budgets[-1]*reduction_factor)
+    return budgets
+
+
+def pin_worker(cpu_slots, torch_threads: int):
+    """
+    Process pool initializer: pin the worker to its own set of CPUs so concurrent trials do not oversubscribe the machine
+    """
+    cpus = cpu_slots.get()
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+
+    threads = str(torch_threads or len(cpus) or 1)
+    os.environ['OMP_NUM_THREADS'] = threads
+    os.environ['MKL_NUM_THREADS'] = threads
+
+    import torch
+    torch.set_num_threads(int(threads))
+
+
+def run_trial(job: dict) -> dict:
+    """
+    Train one trial up to the budget of its rung. Promoted trials continue from the weights of their previous rung
+    Runs inside a worker process
+    Returns: dict: The job with the trial's fitness, mAPs, weights and duration
+    """
+    from ultralytics import YOLO
+
+    start = time.perf_counter()
+    params = job['params']
+    model = YOLO(job['weights'] or job['model_name'])
+    train_args = dict(
+        data = job['data'],
+        epochs = job['epochs'],
+        imgsz = params.get('img_size', job['img_size']),
+        batch = params.get('batch_size', job['batch_size']),
+        lr0 = params.get('lr0'),
+        lrf = params.get('lrf'),
+        momentum = params.get('momentum'),
+        weight_decay = params.get('weight_decay'),
+        optimizer = job['optimizer'],
+        warmup_epochs = 0 if job['weights'] else min(3, job['epochs'] - 1),
+        workers = job['dataloader_workers'],
+        fraction = job['data_fraction'],
+        device = job['device'],
+        project = job['project'],
+        name = job['name'],
+        exist_ok = True,
+        plots = False,
+        verbose = False
+    )
+    train_args = {k: v for k, v in train_args.items() if v is not None}
+    if job['packed_dataset']:
+        from PotholeDetection.utils.packed_trainer import packed_trainer
+        train_args['trainer'] = packed_trainer(job['packed_dataset'])
+
+    metrics = model.train(**train_args)
+    weights_dir = Path(metrics.save_dir)/'weights'
+    return dict(
+        job,
+        fitness = float(metrics.fitness),
+        map50 = float(metrics.box.map50),
+        map50_95 = float(metrics.box.map),
+        weights = str(weights_dir/'last.pt'),
+        best_weights = str(weights_dir/'best.pt'),
+        seconds = time.perf_counter() - start,
+        status = 'completed'
+    )
+
+
+class HyperparameterSearch:
+    """
+    Asynchronous successive halving (ASHA) over the ModelTrainingConfig hyperparameters.
+    Every sampled configuration first trains for min_epochs. Whenever a worker is free, the scheduler promotes
+    the best not-yet-promoted trial among the top 1/reduction_factor of a rung to the next rung's budget
+    (continuing from its weights), and otherwise starts a new configuration. Only a handful of trials ever reach
+    max_epochs, so the search costs a fraction of training every configuration fully.
+    """
+    def __init__(self, config: HyperparameterSearchConfig):
+        self.config = config
+        self.budgets = rung_budgets(self.config.min_epochs, self.config.max_epochs, self.config.reduction_factor)
+        self.rng = random.Random(self.config.seed)
+        self.trials = {}
+        self.rungs = [dict() for _ in self.budgets]
+        self.promoted = [set() for _ in self.budgets]
+        self.history = []
+        self.mlflow = None
+
+    def cpu_slots(self, ctx) -> 'multiprocessing.Queue':
+        """
+        Split the available CPUs into one disjoint set per worker
+        Returns: multiprocessing.Queue: CPU sets handed out to the workers by the pool initializer
+        """
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else list(range(os.cpu_count()))
+        per_worker = self.config.threads_per_trial or max(1, len(cpus)//self.config.max_workers)
+        slots = ctx.Queue()
+        for i in range(self.config.max_workers):
+            slots.put(cpus[i*per_worker:(i + 1)*per_worker] if (i + 1)*per_worker <= len(cpus) else [])
+        return slots
+
+    def next_job(self):
+        """
+        ASHA: promote from the highest rung possible, else start a new trial
+        Returns: tuple: (trial id, rung) of the next job, None if nothing can be started right now
+        """
+        for rung in reversed(range(len(self.budgets) - 1)):
+            completed = sorted(self.rungs[rung].items(), key = lambda kv: -kv[1])
+            for trial_id, _ in completed[:len(completed)//self.config.reduction_factor]:
+                if trial_id not in self.promoted[rung]:
+                    self.promoted[rung].add(trial_id)
+                    return trial_id, rung + 1
+
+        if len(self.trials) < self.config.num_trials:
+            trial_id = len(self.trials)
+            self.trials[trial_id] = {'params': sample_params(self.config.search_space, self.rng), 'weights': None}
+            return trial_id, 0
+
+        return None
+
+    def build_job(self, trial_id: int, rung: int) -> dict:
+        trial = self.trials[trial_id]
+        previous_budget = self.budgets[rung - 1] if rung else 0
+        return {
+            'trial_id': trial_id,
+            'rung': rung,
+            'params': trial['params'],
+            'epochs': self.budgets[rung] - previous_budget,
+            'weights': trial['weights'],
+            'model_name': self.config.model_name,
+            'data': str(self.config.dataset/'data.yaml'),
+            'img_size': None,
+            'batch_size': None,
+            'optimizer': self.config.optimizer,
+            'dataloader_workers': self.config.dataloader_workers,
+            'data_fraction': self.config.data_fraction,
+            'device': self.config.device,
+            'packed_dataset': str(self.config.packed_dataset) if self.config.packed_dataset else None,
+            'project': str(Path(self.config.artifacts_dir).resolve()/'trials'),
+            'name': f'trial_{trial_id:03d}_rung_{rung}'
+        }
+
+    def start_mlflow(self):
+        if not self.config.log_to_mlflow:
+            return
+        try:
+            import mlflow
+            mlflow.start_run(run_name = 'hyperparameter_search')
+            mlflow.log_params({'num_trials': self.config.num_trials, 'budgets': self.budgets, 'reduction_factor': self.config.reduction_factor})
+            self.mlflow = mlflow
+        except Exception as e:
+            logger.warning(f"Could not start MLflow run, trials are only logged to the search report: {e}")
+
+    def log_trial(self, result: dict):
+        self.history.append(result)
+        logger.info(f"Trial {result['trial_id']} rung {result['rung']} ({self.budgets[result['rung']]} epochs): "
+                    f"{result['status']}, fitness {result['fitness']:.4f}, params {result['params']}")
+        if self.mlflow is None:
+            return
+        try:
+            with self.mlflow.start_run(run_name = f"trial_{result['trial_id']:03d}_rung_{result['rung']}", nested = True):
+                self.mlflow.log_params({**result['params'], 'trial_id': result['trial_id'], 'rung': result['rung'], 'epochs': self.budgets[result['rung']]})
+                if result['status'] == 'completed':
+                    self.mlflow.log_metrics({k: result[k] for k in ('fitness', 'map50', 'map50_95', 'seconds')})
+        except Exception as e:
+            logger.warning(f"Could not log trial {result['trial_id']} to MLflow: {e}")
+
+    def record(self, job: dict, result: dict = None, error: Exception = None):
+        if error is not None:
+            result = dict(job, fitness = float('-inf'), status = 'failed', error = str(error))
+            logger.error(f"Trial {job['trial_id']} rung {job['rung']} failed: {error}")
+        else:
+            self.trials[job['trial_id']]['weights'] = result['weights']
+            self.trials[job['trial_id']]['best_weights'] = result['best_weights']
+        self.rungs[job['rung']][job['trial_id']] = result['fitness']
+        self.log_trial(result)
+
+    def run_search(self):
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(
+            max_workers = self.config.max_workers,
+            mp_context = ctx,
+            initializer = pin_worker,
+            initargs = (self.cpu_slots(ctx), self.config.threads_per_trial)
+        ) as executor:
+            running = {}
+            while True:
+                while len(running) < self.config.max_workers:
+                    job = self.next_job()
+                    if job is None:
+                        break
+                    job = self.build_job(*job)
+                    running[executor.submit(run_trial, job)] = job
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when = FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        self.record(job, result = future.result())
+                    except Exception as e:
+                        self.record(job, error = e)
+
+    def best_trial(self) -> tuple:
+        """
+        Fitness is only comparable at equal budgets, so the winner is the best trial of the highest rung reached
+        Returns: tuple: (trial id, rung, fitness)
+        """
+        for rung in reversed(range(len(self.budgets))):
+            completed = {t: f for t, f in self.rungs[rung].items() if f != float('-inf')}
+            if completed:
+                trial_id = max(completed, key = completed.get)
+                return trial_id, rung, completed[trial_id]
+        raise RuntimeError("Every hyperparameter search trial failed")
+
+    @instrument('hyperparameter_search')
+    def initiate_hyperparameter_search(self) -> HyperparameterSearchArtifact:
+        try:
+            logger.info(f"Hyperparameter search started: {self.config.num_trials} trials, rung budgets {self.budgets} epochs, "
+                        f"{self.config.max_workers} parallel workers")
+            self.config.artifacts_dir.mkdir(parents = True, exist_ok = True)
+            start = time.perf_counter()
+            self.start_mlflow()
+            try:
+                self.run_search()
+                trial_id, rung, fitness = self.best_trial()
+            finally:
+                if self.mlflow is not None:
+                    self.mlflow.end_run()
+
+            best_params = dict(self.trials[trial_id]['params'], optimizer = self.config.optimizer)
+            epochs_spent = sum(r['epochs'] for r in self.history if r['status'] == 'completed')
+            full_grid_epochs = len(self.trials)*self.budgets[-1]
+
+            search_report = self.config.artifacts_dir/'search_report.json'
+            with open(search_report, 'w') as f:
+                json.dump({
+                    'best_trial': trial_id,
+                    'best_rung': rung,
+                    'best_fitness': fitness,
+                    'best_params': best_params,
+                    'best_weights': self.trials[trial_id].get('best_weights'),
+                    'rung_budgets': self.budgets,
+                    'trials_run': len(self.trials),
+                    'epochs_spent': epochs_spent,
+                    'full_training_epochs': full_grid_epochs,
+                    'seconds': time.perf_counter() - start,
+                    'trials': [{k: r.get(k) for k in ('trial_id', 'rung', 'epochs', 'params', 'status', 'fitness', 'map50', 'map50_95', 'seconds', 'error')} for r in self.history]
+                }, f, indent = 4, default = str)
+
+            logger.info(f"Best trial {trial_id} (rung {rung}, fitness {fitness:.4f}): {best_params}. "
+                        f"Spent {epochs_spent} epochs instead of {full_grid_epochs} for training every configuration fully")
+
+            return HyperparameterSearchArtifact(
+                best_params = best_params,
+                best_fitness = fitness,
+                search_report = search_report,
+                trials_run = len(self.trials),
+                epochs_spent = epochs_spent
+            )
+
+        except Exception as e:
+            logger.error("Error in hyperparameter search")
+            raise e
@@ -0,0 +1,172 @@
+import json
+import time
+import importlib.util
+from pathlib import Path
+from typing import TYPE_CHECKING
+import numpy as np
+from PotholeDetection.config_manager.component_config import ModelExportConfig, ModelExportArtifact
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.logging.instrumentation import instrument
+from PotholeDetection.utils.utils import load_image, letterbox, list_images
+
+# torch and ultralytics are imported where they are used, so importing this module (e.g. for format_available) stays cheap
+if TYPE_CHECKING:
+    import torch
+    from ultralytics.nn.autobackend import AutoBackend
+
+
+# Python packages each export format needs to be produced and run
+FORMAT_REQUIREMENTS = {
+    'onnx': ['onnx', 'onnxruntime'],
+    'onnx_int8': ['onnxruntime'],
+    'openvino': ['openvino']
+}
+
+
+def format_available(export_format: str) -> bool:
+    return all(importlib.util.find_spec(pkg) is not None for pkg in FORMAT_REQUIREMENTS.get(export_format, []))
+
+
+def to_tensor(img: np.ndarray) -> 'torch.Tensor':
+    """
+    Convert a letterboxed BGR image into a normalized 1x3xHxW RGB tensor
+    """
+    import torch
+
+    return torch.from_numpy(np.ascontiguousarray(img[..., ::-1].transpose(2, 0, 1))).float().unsqueeze(0)/255
+
+
+def raw_output(backend: 'AutoBackend', tensor: 'torch.Tensor') -> np.ndarray:
+    import torch
+
+    with torch.no_grad():
+        y = backend(tensor)
+
+    y = y[0] if isinstance(y, (list, tuple)) else y
+    return y.cpu().numpy() if isinstance(y, torch.Tensor) else np.asarray(y)
+
+
+def benchmark_backend(model_path: Path, tensors: list, warmup_runs: int = 3) -> tuple:
+    """
+    Run a model through ultralytics' AutoBackend over a list of input tensors
+    Returns: tuple: (raw outputs per tensor, latency per tensor in milliseconds)
+    """
+    import torch
+    from ultralytics.nn.autobackend import AutoBackend
+
+    backend = AutoBackend(str(model_path), device = torch.device('cpu'), verbose = False)
+    for tensor in tensors[:warmup_runs]:
+        raw_output(backend, tensor)
+
+    outputs, latencies = [], []
+    for tensor in tensors:
+        start = time.perf_counter()
+        outputs.append(raw_output(backend, tensor))
+        latencies.append((time.perf_counter() - start)*1000)
+
+    return outputs, latencies
+
+
+class ModelExporter:
+    def __init__(self, config: ModelExportConfig):
+        self.config = config
+
+    def load_calibration_set(self) -> list:
+        """
+        Load a fixed, deterministic set of validation images used for parity checks and latency measurements
+        Returns: list: Input tensors of the calibration images
+        """
+        images = list_images(self.config.dataset/'valid'/'images', self.config.supported_img_ext)
+        images = images[:self.config.calibration_images]
+        if not images:
+            raise FileNotFoundError(f"No calibration images found under {self.config.dataset/'valid'/'images'}")
+
+        logger.info(f"Loaded {len(images)} calibration images")
+        return [to_tensor(letterbox(load_image(img), self.config.img_size)[0]) for img in images]
+
+    def export_model(self, export_format: str) -> Path:
+        """
+        Export the trained model into the given format next to the PyTorch weights
+        Returns: Path: Exported model file or directory
+        """
+        from ultralytics import YOLO
+
+        logger.info(f"Exporting {self.config.best_model} to {export_format}")
+        model = YOLO(str(self.config.best_model))
+        exported = model.export(format = export_format, imgsz = self.config.img_size, dynamic = True, device = 'cpu')
+        logger.info(f"Model exported to {export_format} at {exported}")
+        return Path(exported)
+
+    def run_backend(self, model_path: Path, calibration_set: list) -> tuple:
+        """
+        Run a backend over the calibration set
+        Returns: tuple: (raw outputs per image, latency per image in milliseconds)
+        """
+        return benchmark_backend(model_path, calibration_set, self.config.warmup_runs)
+
+    @instrument('model_export')
+    def initiate_model_export(self) -> ModelExportArtifact:
+        """
+        Export the trained model to every configured and available format, check that the exported models
+        reproduce the PyTorch outputs within tolerance and record their latency on the calibration set
+        """
+        try:
+            logger.info("Model export started")
+            calibration_set = self.load_calibration_set()
+
+            reference, pt_latencies = self.run_backend(self.config.best_model, calibration_set)
+            scale = max(float(np.abs(ref).max()) for ref in reference) or 1.0
+
+            exported_models = {'pt': self.config.best_model}
+            latency_ms = {'pt': float(np.median(pt_latencies))}
+            max_error = {'pt': 0.0}
+
+            for export_format in self.config.export_formats:
+                if not format_available(export_format):
+                    logger.info(f"Skipping {export_format} export: {FORMAT_REQUIREMENTS[export_format]} not installed")
+                    continue
+
+                try:
+                    exported = self.export_model(export_format)
+                    outputs, latencies = self.run_backend(exported, calibration_set)
+                except Exception as e:
+                    logger.error(f"Export to {export_format} failed: {e}")
+                    continue
+
+                error = max(float(np.abs(out - ref).max()) for out, ref in zip(outputs, reference))/scale
+                if error > self.config.tolerance:
+                    logger.error(f"{export_format} outputs deviate from PyTorch by {error:.2e} (tolerance {self.config.tolerance:.0e}). Discarding export")
+                    continue
+
+                exported_models[export_format] = exported
+                latency_ms[export_format] = float(np.median(latencies))
+                max_error[export_format] = error
+                logger.info(f"{export_format}: max relative error {error:.2e}, median latency {latency_ms[export_format]:.1f} ms")
+
+            report = {
+                'calibration_images': len(calibration_set),
+                'img_size': self.config.img_size,
+                'backends': {
+                    backend: {
+                        'model': str(exported_models[backend]),
+                        'median_latency_ms': latency_ms[backend],
+                        'max_relative_error': max_error[backend]
+                    } for backend in exported_models
+                }
+            }
+
+            export_report = self.config.artifacts_dir/'export_report.json'
+            with open(export_report, 'w') as f:
+                json.dump(report, f, indent = 4)
+
+            logger.info(f"Model export completed. Report saved at {export_report}")
+            return ModelExportArtifact(
+                exported_models = exported_models,
+                latency_ms = latency_ms,
+                max_relative_error = max_error,
+                export_report = export_report
+            )
+
+        except Exception as e:
+            logger.error("Error in model export")
+            raise e
@@ -0,0 +1,204 @@
+import json
+import random
+import tempfile
+from pathlib import Path
+import numpy as np
+from PotholeDetection.config_manager.component_config import ModelQuantizationConfig, ModelQuantizationArtifact
+from PotholeDetection.components.model_export import benchmark_backend, to_tensor
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.logging.instrumentation import instrument
+from PotholeDetection.utils.utils import load_image, letterbox, list_images
+
+
+class ImageCalibrationReader:
+    """
+    Feeds calibration images to the ONNX Runtime quantizer one at a time, so the calibration set is never held in memory.
+    Implements the CalibrationDataReader protocol (get_next) without importing onnxruntime at module import
+    """
+    def __init__(self, input_name: str, images: list, img_size: int):
+        self.input_name = input_name
+        self.images = iter(images)
+        self.img_size = img_size
+
+    def get_next(self):
+        img = next(self.images, None)
+        if img is None:
+            return None
+
+        return {self.input_name: to_tensor(letterbox(load_image(img), self.img_size)[0]).numpy()}
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        inputs = self.get_next()
+        if inputs is None:
+            raise StopIteration
+        return inputs
+
+
+class ModelQuantizer:
+    def __init__(self, config: ModelQuantizationConfig):
+        self.config = config
+
+    def sample_calibration_images(self) -> list:
+        """
+        Sample the calibration subset from the validated 'valid' split
+        Returns: list: Calibration image paths
+        """
+        images = list_images(self.config.dataset/'valid'/'images', self.config.supported_img_ext)
+        if not images:
+            raise FileNotFoundError(f"No calibration images found under {self.config.dataset/'valid'/'images'}")
+
+        sample = random.Random(self.config.seed).sample(images, min(self.config.calibration_images, len(images)))
+        logger.info(f"Sampled {len(sample)} calibration images from {len(images)} validation images")
+        return sample
+
+    def fp32_onnx_model(self) -> Path:
+        """
+        Reuse the ONNX export of the trained model, exporting it first if it does not exist yet or is older than the
+        model (a leftover of an earlier training run)
+        Returns: Path: FP32 ONNX model
+        """
+        onnx_model = self.config.best_model.with_suffix('.onnx')
+        if not onnx_model.exists() or onnx_model.stat().st_mtime < self.config.best_model.stat().st_mtime:
+            from ultralytics import YOLO
+
+            logger.info(f"No up-to-date ONNX export found at {onnx_model}. Exporting {self.config.best_model}")
+            YOLO(str(self.config.best_model)).export(format = 'onnx', imgsz = self.config.img_size, dynamic = True, device = 'cpu')
+
+        return onnx_model
+
+    def quantize_model(self, fp32_model: Path, calibration_images: list) -> Path:
+        """
+        Build a static INT8 (QDQ, per-channel weights) ONNX model calibrated on the sampled images
+        Returns: Path: INT8 ONNX model
+        """
+        import onnx
+        from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+        from onnxruntime.quantization.shape_inference import quant_pre_process
+
+        int8_model = self.config.artifacts_dir/f'{fp32_model.stem}_int8.onnx'
+        input_name = onnx.load(str(fp32_model), load_external_data = False).graph.input[0].name
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            preprocessed = Path(tmp_dir)/'preprocessed.onnx'
+            quant_pre_process(str(fp32_model), str(preprocessed), skip_symbolic_shape = True)
+
+            logger.info(f"Calibrating INT8 model on {len(calibration_images)} images")
+            quantize_static(
+                model_input = str(preprocessed),
+                model_output = str(int8_model),
+                calibration_data_reader = ImageCalibrationReader(input_name, calibration_images, self.config.img_size),
+                quant_format = QuantFormat.QDQ,
+                per_channel = True,
+                weight_type = QuantType.QInt8,
+                activation_type = QuantType.QUInt8
+            )
+
+        # Carry over the ultralytics metadata (class names, stride, image size) dropped by the quantizer
+        source, quantized = onnx.load(str(fp32_model)), onnx.load(str(int8_model))
+        onnx.helper.set_model_props(quantized, {prop.key: prop.value for prop in source.metadata_props})
+        onnx.save(quantized, str(int8_model))
+
+        logger.info(f"INT8 model saved at {int8_model}")
+        return int8_model
+
+    def evaluate(self, model_path: Path) -> dict:
+        """
+        Compute box mAP of a model on the evaluation split
+        Returns: dict: mAP50 and mAP50-95
+        """
+        from ultralytics import YOLO
+
+        metrics = YOLO(str(model_path), task = 'detect').val(
+            data = str(self.config.dataset/'data.yaml'),
+            split = self.config.eval_split,
+            imgsz = self.config.img_size,
+            batch = self.config.batch_size,
+            device = 'cpu',
+            plots = False,
+            verbose = False
+        )
+        return {'map50': float(metrics.box.map50), 'map50_95': float(metrics.box.map)}
+
+    def measure_latency(self, model_path: Path, calibration_images: list) -> float:
+        tensors = [to_tensor(letterbox(load_image(img), self.config.img_size)[0]) for img in calibration_images[:self.config.latency_images]]
+        _, latencies = benchmark_backend(model_path, tensors)
+        return float(np.median(latencies))
+
+    @staticmethod
+    def model_size_mb(model_path: Path) -> float:
+        return model_path.stat().st_size/2**20
+
+    def promote(self, int8_model: Path, latency_ms: float):
+        """
+        Register the INT8 model as an inference backend in the export report, so the Predictor can select it
+        """
+        export_report = self.config.artifacts_dir/'export_report.json'
+        if not export_report.exists():
+            logger.info(f"No export report at {export_report}. INT8 model is not registered as a backend")
+            return
+
+        with open(export_report, 'r') as f:
+            report = json.load(f)
+
+        report['backends']['onnx_int8'] = {'model': str(int8_model), 'median_latency_ms': latency_ms}
+        with open(export_report, 'w') as f:
+            json.dump(report, f, indent = 4)
+
+    @instrument('model_quantization')
+    def initiate_model_quantization(self) -> ModelQuantizationArtifact:
+        """
+        Quantize the trained model to INT8, compare accuracy, latency and size against FP32, and promote
+        the INT8 model only if its mAP50-95 drop is within the configured threshold
+        """
+        try:
+            logger.info("Model quantization started")
+            calibration_images = self.sample_calibration_images()
+            fp32_model = self.fp32_onnx_model()
+            int8_model = self.quantize_model(fp32_model, calibration_images)
+
+            report = {}
+            for precision, model_path in (('fp32', fp32_model), ('int8', int8_model)):
+                report[precision] = {
+                    **self.evaluate(model_path),
+                    'median_latency_ms': self.measure_latency(model_path, calibration_images),
+                    'size_mb': self.model_size_mb(model_path)
+                }
+                logger.info(f"{precision.upper()} model: {report[precision]}")
+
+            map50_drop = report['fp32']['map50'] - report['int8']['map50']
+            map50_95_drop = report['fp32']['map50_95'] - report['int8']['map50_95']
+            promoted = map50_95_drop <= self.config.max_map_drop
+            report.update({
+                'map50_delta': -map50_drop,
+                'map50_95_delta': -map50_95_drop,
+                'speedup': report['fp32']['median_latency_ms']/report['int8']['median_latency_ms'],
+                'max_map_drop': self.config.max_map_drop,
+                'calibration_images': len(calibration_images),
+                'promoted': promoted
+            })
+
+            if promoted:
+                self.promote(int8_model, report['int8']['median_latency_ms'])
+                logger.info(f"INT8 model promoted: mAP50-95 drop {map50_95_drop:.4f}, speedup {report['speedup']:.2f}x")
+            else:
+                logger.error(f"INT8 model not promoted: mAP50-95 drop {map50_95_drop:.4f} exceeds {self.config.max_map_drop}")
+
+            quantization_report = self.config.artifacts_dir/'quantization_report.json'
+            with open(quantization_report, 'w') as f:
+                json.dump(report, f, indent = 4)
+
+            logger.info(f"Model quantization completed. Report saved at {quantization_report}")
+            return ModelQuantizationArtifact(
+                quantized_model = int8_model,
+                promoted = promoted,
+                map50_delta = report['map50_delta'],
+                map50_95_delta = report['map50_95_delta'],
+                quantization_report = quantization_report
+            )
+
+        except Exception as e:
+            logger.error("Error in model quantization")
+            raise e
@@ -0,0 +1,172 @@
+import os
+import time
+import queue
+import threading
+from pathlib import Path
+from dataclasses import replace
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from PotholeDetection.config_manager.component_config import DataIngestionConfig, DataValidationConfig
+from PotholeDetection.components.data_ingestion import DataIngestion
+from PotholeDetection.components.data_validation import DataValidation
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.utils.dataset_scanner import verify_images
+from PotholeDetection.utils.issue_log import ErrorBudgetExceeded
+from PotholeDetection.utils.label_loader import parse_labels
+from PotholeDetection.utils.validation_cache import ValidationCache
+
+
+STOP = object()
+WORKERS = {'image': verify_images, 'label': parse_labels}
+
+
+class StreamingValidator:
+    """
+    Verifies dataset files while they are still being downloaded. Download threads hand every finished file
+    to submit(); a bounded queue links them to a dispatcher thread that batches files into chunks for a process
+    pool (image decode verify, label parsing) and stores the verdicts in the validation cache.
+    Memory is bounded by the queue size, the chunk size and the number of chunks in flight.
+
+    The cache is what joins the stream to the normal validation pass: once the stream drains, DataValidation
+    finds an up-to-date verdict for every streamed file and only walks the splits, builds the pairing index
+    and runs the vectorized label checks, so ingestion + validation take about max(download, verify).
+    """
+    def __init__(self, config: DataValidationConfig, queue_size: int = 1024, max_inflight: int = None, flush_interval: float = 0.05):
+        self.config = config
+        self.queue = queue.Queue(maxsize = queue_size)
+        self.flush_interval = flush_interval
+        self.num_workers = config.num_workers or os.cpu_count()
+        self.max_inflight = max_inflight or 2*self.num_workers
+        self.files_validated = 0
+        self.invalid_files = 0
+        self.error = None
+        self.thread = None
+
+    def start(self) -> 'StreamingValidator':
+        self.start_time = time.perf_counter()
+        self.thread = threading.Thread(target = self.run, name = 'streaming-validator', daemon = True)
+        self.thread.start()
+        return self
+
+    def kind(self, path: Path):
+        """
+        Returns: str: Verdict kind of a dataset file ('image' or 'label'), None for files the stream does not check
+        """
+        if path.parent.name == 'images' and path.suffix.lower() in self.config.supported_img_ext:
+            return 'image'
+        if path.parent.name == 'labels' and path.suffix == '.txt':
+            return 'label'
+        return None
+
+    def put(self, item):
+        while True:
+            if self.error is not None:
+                raise self.error
+            try:
+                self.queue.put(item, timeout = self.flush_interval)
+                return
+            except queue.Full:
+                continue
+
+    def submit(self, path: Path):
+        """
+        Queue a downloaded file for validation. Blocks while the queue is full, so downloads never outrun
+        validation by more than the queue size. Raises the validator's error (e.g. ErrorBudgetExceeded)
+        """
+        self.put(Path(path))
+
+    def harvest(self, cache: ValidationCache, inflight: dict, return_when: str = FIRST_COMPLETED, timeout: float = None):
+        done, _ = wait(inflight, timeout = timeout, return_when = return_when)
+        for future in done:
+            kind = inflight.pop(future)
+            verdicts = {Path(path): tuple(result) for path, *result in future.result()}
+            cache.store(kind, verdicts)
+
+            # Image verdicts are (is_valid, error), label verdicts (rows, format errors)
+            self.files_validated += len(verdicts)
+            self.invalid_files += sum(1 for verdict in verdicts.values() if (not verdict[0] if kind == 'image' else verdict[1]))
+
+        if self.config.max_errors is not None and self.invalid_files > self.config.max_errors:
+            raise ErrorBudgetExceeded(f"{self.invalid_files} invalid files streamed from ingestion exceed the error budget of {self.config.max_errors}")
+
+    def run(self):
+        # The SQLite connection of the cache belongs to this thread
+        cache = ValidationCache(self.config.artifacts_dir/self.config.cache_file, self.config.use_content_hash)
+        try:
+            if self.config.force_full_recheck:
+                cache.clear()
+
+            with ProcessPoolExecutor(max_workers = self.num_workers) as executor:
+                batches = {'image': [], 'label': []}
+                inflight = {}
+                draining = False
+                while not draining:
+                    try:
+                        item = self.queue.get(timeout = self.flush_interval)
+                    except queue.Empty:
+                        item = None
+
+                    if item is STOP:
+                        draining = True
+                    elif item is not None and self.kind(item) is not None:
+                        cache.mark_pending(item)
+                        batches[self.kind(item)].append(str(item))
+
+                    # Full chunks go out immediately; partial chunks when the downloads pause or the stream ends
+                    for kind, batch in batches.items():
+                        if batch and (len(batch) >= self.config.chunk_size or item is None or draining):
+                            if len(inflight) >= self.max_inflight:
+                                self.harvest(cache, inflight)
+                            inflight[executor.submit(WORKERS[kind], batch)] = kind
+                            batches[kind] = []
+
+                    if inflight:
+                        self.harvest(cache, inflight, timeout = 0)
+
+                while inflight:
+                    self.harvest(cache, inflight)
+
+        except Exception as e:
+            self.error = e
+            # Unblock producers waiting on a full queue
+            while not self.queue.empty():
+                self.queue.get_nowait()
+
+        finally:
+            cache.close()
+
+    def close(self, raise_error: bool = True) -> dict:
+        """
+        Signal the end of the stream and wait until every queued file is verified
+        Returns: dict: Streaming statistics
+        """
+        if self.thread is not None and self.thread.is_alive() and self.error is None:
+            try:
+                self.put(STOP)
+            except Exception:
+                pass
+        if self.thread is not None:
+            self.thread.join()
+
+        if self.error is not None and raise_error:
+            raise self.error
+
+        stats = {
+            'files_validated': self.files_validated,
+            'invalid_files': self.invalid_files,
+            'elapsed_s': time.perf_counter() - self.start_time if self.thread is not None else 0.0
+        }
+        logger.info(f"Streaming validation verified {self.files_validated} files ({self.invalid_files} invalid) in {stats['elapsed_s']:.2f}s")
+        return stats
+
+
+def ingest_and_validate(ingestion_config: DataIngestionConfig, validation_config: DataValidationConfig = None) -> tuple:
+    """
+    Sync the dataset while verifying every downloaded file, then produce the validation artifact as soon as the stream drains
+    Returns: tuple: (DataIngestionArtifact, DataValidationArtifact)
+    """
+    validation_config = validation_config or DataValidationConfig(dataset = ingestion_config.artifacts_dir/ingestion_config.s3_prefix)
+    ingestion_artifacts = DataIngestion(replace(ingestion_config, stream_validation = True), validation_config).initiate_data_ingestion()
+
+    # The stream already re-checked every downloaded file, so the final pass must not clear its verdicts
+    validation_artifacts = DataValidation(replace(validation_config, force_full_recheck = False)).initiate_data_validation()
+    return ingestion_artifacts, validation_artifacts
@@ -1,27 +1,39 @@
+import json
+import time
 from pathlib import Path
-from mlflow import runs
-import boto3
-from ultralytics import YOLO
 from shutil import copy2
 from PotholeDetection.logging.logger import logger
-from PotholeDetection.config_manager.component_config import ModelTrainingConfig, ModelTrainingArtifact
+from PotholeDetection.logging.instrumentation import instrument
+from PotholeDetection.config_manager.component_config import ModelTrainingConfig, ModelTrainingArtifact, ModelExportConfig, ModelQuantizationConfig
+from PotholeDetection.config_manager.component_config import ModelExportArtifact, ModelQuantizationArtifact, ArtifactPublisherConfig
+from PotholeDetection.config_manager.component_config import ModelEvaluationConfig, ModelStoreConfig
+from PotholeDetection.components.evaluate import ModelEvaluator
+from PotholeDetection.components.model_export import ModelExporter
+from PotholeDetection.components.quantize import ModelQuantizer
+from PotholeDetection.utils.artifact_publisher import ArtifactPublisher
+from PotholeDetection.utils.utils import file_sha256
+from PotholeDetection.utils.incremental_data import load_state, save_state, synced_through, training_pool, select_images, write_training_set
 
 
 class ModelTrainer:
     def __init__(self, config: ModelTrainingConfig):
         self.config = config
-        self.s3 = boto3.client("s3")
 
-    def train_model(self):
+    @instrument('train_model')
+    def train_model(self, model_name: str = None, data: Path = None, **overrides):
         """
         Train the YOLO model using the provided configuration.
+        Keyword overrides replace the configured training arguments (e.g. a short fine-tune schedule)
         Return: Trained model object
         """
+        from ultralytics import YOLO
+        from PotholeDetection.utils.packed_trainer import packed_trainer
+
         try:
-            logger.info("Model training started")
-            model = YOLO(self.config.model_name)
-            predictions = model.train(
-                data = self.config.dataset/'data.yaml',
+            logger.info(f"Model training started{' on packed dataset ' + str(self.config.packed_dataset) if self.config.packed_dataset else ''}")
+            model = YOLO(model_name or self.config.model_name)
+            train_args = dict(
+                data = data or self.config.data_yaml or self.config.dataset/'data.yaml',
                 imgsz = self.config.img_size,
                 epochs = self.config.epochs,
                 batch = self.config.batch_size,
@@ -34,8 +46,11 @@ class ModelTrainer:
                 workers = self.config.workers,
                 warmup_epochs = self.config.warmup_epochs,
                 val = self.config.val_data,
-                plots = self.config.plots
+                plots = self.config.plots,
+                trainer = packed_trainer(self.config.packed_dataset) if self.config.packed_dataset else None
             )
+            train_args.update(overrides)
+            predictions = model.train(**train_args)
 
             runs_folder = Path(predictions.save_dir)
             logger.info(f'Model training completed. Trained model saved at: {runs_folder}')
@@ -46,6 +61,7 @@ class ModelTrainer:
             logger.error("Error during model training")
             raise e
 
+    @instrument('save_model')
     def save_model(self, runs_folder: Path):
         """
         Save the traine model to the artifacts directory
@@ -68,45 +84,234 @@ class ModelTrainer:
             logger.error("Error in saving the model")
             raise e
 
-    def upload_to_s3(self):
+    def export_model(self):
+        """
+        Export the best model to the configured inference backends and benchmark them
+        Returns: ModelExportArtifact: Exported models with their parity errors and latencies
+        """
+        export_config = ModelExportConfig(
+            best_model = self.config.artifacts_dir/'best.pt',
+            dataset = self.config.dataset,
+            artifacts_dir = self.config.artifacts_dir,
+            img_size = self.config.img_size,
+            export_formats = self.config.export_formats,
+            tolerance = self.config.export_tolerance,
+            calibration_images = self.config.calibration_images
+        )
+        return ModelExporter(export_config).initiate_model_export()
+
+    def quantize_model(self):
+        """
+        Build an INT8 version of the best model and promote it if its accuracy drop is acceptable
+        Returns: ModelQuantizationArtifact: Quantized model with its accuracy deltas and promotion decision
+        """
+        quantization_config = ModelQuantizationConfig(
+            best_model = self.config.artifacts_dir/'best.pt',
+            dataset = self.config.dataset,
+            artifacts_dir = self.config.artifacts_dir,
+            img_size = self.config.img_size,
+            max_map_drop = self.config.max_map_drop
+        )
+        return ModelQuantizer(quantization_config).initiate_model_quantization()
+
+    @instrument('upload_to_s3')
+    def upload_to_s3(self, export_artifacts: ModelExportArtifact = None, quantization_artifacts: ModelQuantizationArtifact = None):
         """
-        Upload the trained model to S3 bucket
+        Publish the trained and exported models to the S3 bucket as a versioned release, skipping unchanged files.
+        The best model is also kept at s3_model_key for existing consumers
+        Returns: tuple: (S3 URI of the best model, release manifest)
         """
         try:
-            logger.info("Uploading the best mode to S3 bucket for future inference")
+            logger.info("Publishing the trained models to S3 bucket for future inference")
+
+            artifacts = {
+                'best.pt': self.config.artifacts_dir/'best.pt',
+                'last.pt': self.config.artifacts_dir/'last.pt'
+            }
+            if export_artifacts is not None:
+                artifacts['export_report.json'] = export_artifacts.export_report
+                for export_format, exported in export_artifacts.exported_models.items():
+                    artifacts[f'{export_format}/{Path(exported).name}'] = exported
+            if quantization_artifacts is not None:
+                artifacts['quantization_report.json'] = quantization_artifacts.quantization_report
+                if quantization_artifacts.promoted:
+                    artifacts[f'onnx_int8/{quantization_artifacts.quantized_model.name}'] = quantization_artifacts.quantized_model
+
+            publisher = ArtifactPublisher(ArtifactPublisherConfig(s3_bucket = self.config.s3_bucket))
+            manifest = publisher.publish(artifacts, aliases = {'best.pt': self.config.s3_model_key})
 
-            self.s3.upload_file(
-                Filename = str(self.config.artifacts_dir/'best.pt'),
-                Bucket = self.config.s3_bucket,
-                Key = self.config.s3_model_key
-                )
-            
             s3_uri = f's3://{self.config.s3_bucket}/{self.config.s3_model_key}'
-            logger.info(f'Model successfully uploaded to S3 at {s3_uri}')
-        
-            return s3_uri
-        
+            logger.info(f'Model successfully published to S3 at {s3_uri} (release {manifest["version"]})')
+
+            return s3_uri, manifest
+
         except Exception as e:
             logger.error("Error in uploading model to S3")
             raise e
 
-    def initiate_model_training(self) -> ModelTrainingArtifact:
+    def publish_model(self, runs_folder: Path) -> ModelTrainingArtifact:
+        """
+        Save, export, quantize and upload a trained model
+        Returns: ModelTrainingArtifact: The published model
+        """
+        self.save_model(runs_folder)
+        export_artifacts = self.export_model()
+        quantization_artifacts = self.quantize_model() if self.config.quantize else None
+        s3_uri, release_manifest = self.upload_to_s3(export_artifacts, quantization_artifacts)
+
+        return ModelTrainingArtifact(
+            best_model = self.config.artifacts_dir/'best.pt',
+            last_model = self.config.artifacts_dir/'last.pt',
+            s3_model_path = self.config.s3_model_key,
+            s3_uri = s3_uri,
+            exported_models = export_artifacts.exported_models,
+            backend_latency_ms = export_artifacts.latency_ms,
+            export_report = export_artifacts.export_report,
+            quantized_model = quantization_artifacts.quantized_model if quantization_artifacts else None,
+            quantization_promoted = quantization_artifacts.promoted if quantization_artifacts else False,
+            release_manifest = f"s3://{self.config.s3_bucket}/{ArtifactPublisherConfig().release_prefix}manifests/{release_manifest['version']}.json"
+        )
+
+    def record_training(self, trained_through: float, mode: str, best_map50_95: float = None):
+        """
+        Remember up to which ingestion sync time the published model has seen the data, for the next incremental run,
+        and the best gate split mAP50-95 published since the last full training, the floor for later fine-tunes
+        """
+        if trained_through is None:
+            return
+        state = {
+            'trained_through': trained_through,
+            'trained_at': time.time(),
+            'mode': mode,
+            'model_sha256': file_sha256(self.config.artifacts_dir/'best.pt')
+        }
+        if best_map50_95 is not None:
+            state['best_map50_95'] = best_map50_95
+        save_state(self.config.artifacts_dir/self.config.state_file, state)
+
+    def resolve_base_model(self) -> Path:
+        """
+        The model to warm-start from: the local best.pt of the last training run, else the published model at s3_model_key
+        Returns: Path: Local path of the base model, None if there is none
+        """
+        local_model = self.config.artifacts_dir/'best.pt'
+        if local_model.exists():
+            return local_model
+
         try:
-            logger.info(f'Model trianing started with model: {self.config.model_name}')
-            runs_folder = self.train_model()
-            self.save_model(runs_folder)
-            s3_uri = self.upload_to_s3()
+            from PotholeDetection.utils.model_store import ModelStore
+            return ModelStore(ModelStoreConfig()).resolve(f's3://{self.config.s3_bucket}/{self.config.s3_model_key}')
+        except Exception as e:
+            logger.warning(f"No published model to warm-start from: {e}")
+            return None
+
+    def test_metrics(self, model_path: Path) -> dict:
+        """
+        Score a model on the fixed gate split. Predictions are cached per model hash, so the base model is usually not re-run
+        Returns: dict: mAP50 and mAP50-95
+        """
+        evaluator = ModelEvaluator(ModelEvaluationConfig(model_path = model_path, dataset = self.config.dataset, split = self.config.gate_split))
+        metrics = evaluator.evaluate()
+        return {'map50': metrics['map50'], 'map50_95': metrics['map50_95']}
+
+    @instrument('incremental_training')
+    def initiate_incremental_training(self) -> ModelTrainingArtifact:
+        """
+        Fine-tune the previous best model on the images synced since it was trained plus a replay sample of older images,
+        with a short schedule, and publish it only if it does not regress on the fixed gate split
+        Returns: ModelTrainingArtifact: The promoted or the unchanged previous model, None if a full training run is needed
+        """
+        state = load_state(self.config.artifacts_dir/self.config.state_file)
+        if self.config.manifest is None or 'trained_through' not in state:
+            logger.info("No ingestion manifest or previous training state. Running full training")
+            return None
+        base_model = self.resolve_base_model()
+        if base_model is None:
+            logger.info("No previous model to fine-tune. Running full training")
+            return None
+
+        incremental_dir = self.config.artifacts_dir/'incremental'
+        data_yaml = self.config.data_yaml or self.config.dataset/'data.yaml'
+        trained_through = synced_through(self.config.manifest)
+        new_images, replay = select_images(
+            self.config.manifest, self.config.dataset, self.config.s3_prefix,
+            training_pool(self.config.dataset, data_yaml, self.config.supported_img_ext),
+            state['trained_through'], self.config.replay_ratio, self.config.min_replay, self.config.seed
+        )
+
+        report = {'base_model': str(base_model), 'new_images': len(new_images), 'replay_images': len(replay), 'gate_split': self.config.gate_split}
+        if new_images:
+            start = time.perf_counter()
+            runs_folder = self.train_model(
+                model_name = str(base_model),
+                data = write_training_set(new_images + replay, data_yaml, self.config.dataset, incremental_dir),
+                epochs = self.config.incremental_epochs,
+                patience = self.config.incremental_epochs,
+                optimizer = self.config.incremental_optimizer,
+                lr0 = self.config.incremental_lr0,
+                warmup_epochs = 0
+            )
+            report['training_s'] = time.perf_counter() - start
+
+            report['base_metrics'] = self.test_metrics(base_model)
+            report['candidate_metrics'] = self.test_metrics(runs_folder/'weights'/'best.pt')
+            report['map50_95_change'] = report['candidate_metrics']['map50_95'] - report['base_metrics']['map50_95']
+            # Gate against the best model published since the last full training too, so small allowed regressions
+            # cannot add up over successive fine-tunes
+            report['reference_map50_95'] = max(report['base_metrics']['map50_95'], state.get('best_map50_95', float('-inf')))
+            report['promoted'] = report['candidate_metrics']['map50_95'] >= report['reference_map50_95'] - self.config.max_map_regression
+        else:
+            logger.info("No new training images since the last training run. Keeping the current model")
+            report['promoted'] = False
 
+        incremental_dir.mkdir(parents = True, exist_ok = True)
+        report_path = incremental_dir/'incremental_report.json'
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent = 4)
+
+        if report['promoted']:
+            logger.info(f"Fine-tuned model promoted: {self.config.gate_split} mAP50-95 {report['base_metrics']['map50_95']:.4f} -> "
+                        f"{report['candidate_metrics']['map50_95']:.4f}")
+            training_artifacts = self.publish_model(runs_folder)
+            self.record_training(trained_through, 'incremental', max(report['reference_map50_95'], report['candidate_metrics']['map50_95']))
+        else:
+            if new_images:
+                logger.warning(f"Fine-tuned model rejected: {self.config.gate_split} mAP50-95 {report['candidate_metrics']['map50_95']:.4f} "
+                               f"below the reference {report['reference_map50_95']:.4f}. Keeping {base_model}; the new images are retried on the next run")
+                if 'best_map50_95' not in state:
+                    save_state(self.config.artifacts_dir/self.config.state_file, dict(state, best_map50_95 = report['reference_map50_95']))
+            if base_model != self.config.artifacts_dir/'best.pt':
+                self.config.artifacts_dir.mkdir(parents = True, exist_ok = True)
+                copy2(base_model, self.config.artifacts_dir/'best.pt')
+                copy2(base_model, self.config.artifacts_dir/'last.pt')
             training_artifacts = ModelTrainingArtifact(
                 best_model = self.config.artifacts_dir/'best.pt',
                 last_model = self.config.artifacts_dir/'last.pt',
                 s3_model_path = self.config.s3_model_key,
-                s3_uri = s3_uri
+                s3_uri = f's3://{self.config.s3_bucket}/{self.config.s3_model_key}'
             )
-            
+
+        training_artifacts.promoted = report['promoted']
+        training_artifacts.incremental_report = report_path
+        return training_artifacts
+
+    @instrument('model_training')
+    def initiate_model_training(self) -> ModelTrainingArtifact:
+        try:
+            if self.config.incremental:
+                training_artifacts = self.initiate_incremental_training()
+                if training_artifacts is not None:
+                    return training_artifacts
+
+            logger.info(f'Model trianing started with model: {self.config.model_name}')
+            trained_through = synced_through(self.config.manifest)
+            runs_folder = self.train_model()
+            training_artifacts = self.publish_model(runs_folder)
+            self.record_training(trained_through, 'full')
+
             logger.info("Model training finished successfully. Trained models saved and uploaded to S3 bucket.")
             return training_artifacts
 
         except Exception as e:
             logger.error("Error in model training")
-            raise e
\ No newline at end of file
+            raise e
@@ -1,5 +1,5 @@
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from PotholeDetection.constants.constants import *
 
 @dataclass
@@ -8,24 +8,93 @@ class DataIngestionConfig:
     s3_prefix: str = S3_Prefix
     root_dir: Path = PROJECT_ROOT_DIR
     artifacts_dir: Path = ARTIFACTS_ROOT/'data_ingestion'
+    sync_mode: bool = SYNC_MODE
+    max_workers: int = INGESTION_MAX_WORKERS
+    manifest_file: str = INGESTION_MANIFEST
+    delete_stale: bool = DELETE_STALE_FILES
+    stream_validation: bool = STREAM_VALIDATION
+    stream_queue_size: int = STREAM_QUEUE_SIZE
 
 
 @dataclass
 class DataIngestionArtifact:
     dataset: Path
+    manifest: Path = None
+    files_fetched: int = 0
+    files_skipped: int = 0
+    files_deleted: int = 0
+    bytes_fetched: int = 0
+    throughput_bps: float = 0.0
+    files_validated: int = 0
 
 @dataclass
 class DataValidationConfig:
     dataset: Path
-    data_split: list = DATA_SPLIT
-    supported_img_ext: list = VALID_IMG_EXT
+    data_split: list = field(default_factory = lambda: list(DATA_SPLIT))
+    supported_img_ext: list = field(default_factory = lambda: list(VALID_IMG_EXT))
     artifacts_dir: Path = ARTIFACTS_ROOT/'data_validation'
+    num_workers: int = VALIDATION_WORKERS
+    chunk_size: int = VALIDATION_CHUNK_SIZE
+    cache_file: str = VALIDATION_CACHE
+    use_content_hash: bool = VALIDATION_CONTENT_HASH
+    force_full_recheck: bool = FORCE_FULL_RECHECK
+    issue_log_file: str = VALIDATION_ISSUE_LOG
+    max_errors: int = VALIDATION_ERROR_BUDGET
+    issue_buffer_size: int = VALIDATION_ISSUE_BUFFER
+    issue_sample_size: int = VALIDATION_ISSUE_SAMPLES
 
 @dataclass
 class DataValidationArtifact:
     validation_report: Path
     validation_status: bool
 
+@dataclass
+class DatasetPackingConfig:
+    dataset: Path
+    data_split: list = field(default_factory = lambda: list(DATA_SPLIT))
+    supported_img_ext: list = field(default_factory = lambda: list(VALID_IMG_EXT))
+    artifacts_dir: Path = ARTIFACTS_ROOT/'dataset_packing'
+    img_size: int = IMG_SIZE
+    shard_size: int = PACK_SHARD_SIZE
+    num_workers: int = PACK_WORKERS
+    benchmark_images: int = PACK_BENCHMARK_IMAGES
+
+@dataclass
+class DatasetPackingArtifact:
+    packed_dir: Path
+    packing_report: Path
+    images_packed: int
+    shards_written: int
+    shards_reused: int
+    loader_images_per_sec: dict = None
+    index_files: list = None
+
+@dataclass
+class DatasetDedupConfig:
+    dataset: Path
+    data_split: list = field(default_factory = lambda: list(DATA_SPLIT))
+    supported_img_ext: list = field(default_factory = lambda: list(VALID_IMG_EXT))
+    artifacts_dir: Path = ARTIFACTS_ROOT/'dataset_dedup'
+    num_workers: int = VALIDATION_WORKERS
+    chunk_size: int = VALIDATION_CHUNK_SIZE
+    cache_file: str = DEDUP_CACHE
+    hash_size: int = DEDUP_HASH_SIZE
+    radius: int = DEDUP_RADIUS
+    thin_splits: list = field(default_factory = lambda: list(DEDUP_THIN_SPLITS))
+    drop_leaks: bool = DEDUP_DROP_LEAKS
+    sample_size: int = DEDUP_REPORT_SAMPLES
+    train_images_per_sec: float = TRAIN_IMAGES_PER_SEC
+    epochs: int = EPOCHS
+
+@dataclass
+class DatasetDedupArtifact:
+    dedup_report: Path
+    data_yaml: Path
+    duplicate_clusters: int
+    cross_split_pairs: int
+    images_removed: int
+    epoch_seconds_saved: float = None
+
 @dataclass
 class ModelTrainingConfig:
     dataset: Path
@@ -47,6 +116,55 @@ class ModelTrainingConfig:
     plots: bool = PLOTS
     s3_bucket: str = S3_Bucket
     s3_model_key: str = S3_Model_Key
+    export_formats: list = field(default_factory = lambda: list(EXPORT_FORMATS))
+    export_tolerance: float = EXPORT_TOLERANCE
+    calibration_images: int = CALIBRATION_IMAGES
+    quantize: bool = QUANTIZE_MODEL
+    max_map_drop: float = QUANT_MAX_MAP_DROP
+    packed_dataset: Path = None
+    data_yaml: Path = None
+    supported_img_ext: list = field(default_factory = lambda: list(VALID_IMG_EXT))
+    state_file: str = TRAINING_STATE_FILE
+    manifest: Path = None
+    s3_prefix: str = S3_Prefix
+    incremental: bool = INCREMENTAL_TRAINING
+    incremental_epochs: int = INCREMENTAL_EPOCHS
+    incremental_optimizer: str = INCREMENTAL_OPTIMIZER
+    incremental_lr0: float = INCREMENTAL_LR0
+    replay_ratio: float = INCREMENTAL_REPLAY_RATIO
+    min_replay: int = INCREMENTAL_MIN_REPLAY
+    max_map_regression: float = INCREMENTAL_MAX_MAP_REGRESSION
+    gate_split: str = INCREMENTAL_GATE_SPLIT
+    seed: int = RANDOM_SEED
+
+
+@dataclass
+class HyperparameterSearchConfig:
+    dataset: Path
+    artifacts_dir: Path = ARTIFACTS_ROOT/'hyperparameter_search'
+    model_name: str = MODEL_NAME
+    search_space: dict = field(default_factory = lambda: dict(HPARAM_SEARCH_SPACE))
+    num_trials: int = HPARAM_TRIALS
+    min_epochs: int = HPARAM_MIN_EPOCHS
+    max_epochs: int = HPARAM_MAX_EPOCHS
+    reduction_factor: int = HPARAM_REDUCTION_FACTOR
+    optimizer: str = HPARAM_OPTIMIZER
+    max_workers: int = HPARAM_WORKERS
+    threads_per_trial: int = HPARAM_THREADS_PER_TRIAL
+    dataloader_workers: int = HPARAM_DATALOADER_WORKERS
+    data_fraction: float = HPARAM_DATA_FRACTION
+    device: str = HPARAM_DEVICE
+    seed: int = RANDOM_SEED
+    packed_dataset: Path = None
+    log_to_mlflow: bool = HPARAM_LOG_TO_MLFLOW
+
+@dataclass
+class HyperparameterSearchArtifact:
+    best_params: dict
+    best_fitness: float
+    search_report: Path
+    trials_run: int
+    epochs_spent: int
 
 
 @dataclass
@@ -55,3 +173,171 @@ class ModelTrainingArtifact:
     last_model: Path
     s3_model_path: str
     s3_uri: str
+    exported_models: dict = None
+    backend_latency_ms: dict = None
+    export_report: Path = None
+    quantized_model: Path = None
+    quantization_promoted: bool = False
+    release_manifest: str = None
+    promoted: bool = True
+    incremental_report: Path = None
+
+@dataclass
+class ModelExportConfig:
+    best_model: Path
+    dataset: Path
+    artifacts_dir: Path = ARTIFACTS_ROOT/'training'
+    img_size: int = IMG_SIZE
+    export_formats: list = field(default_factory = lambda: list(EXPORT_FORMATS))
+    tolerance: float = EXPORT_TOLERANCE
+    calibration_images: int = CALIBRATION_IMAGES
+    warmup_runs: int = WARMUP_RUNS
+    supported_img_ext: list = field(default_factory = lambda: list(VALID_IMG_EXT))
+
+@dataclass
+class ModelExportArtifact:
+    exported_models: dict
+    latency_ms: dict
+    max_relative_error: dict
+    export_report: Path
+
+@dataclass
+class ModelQuantizationConfig:
+    best_model: Path
+    dataset: Path
+    artifacts_dir: Path = ARTIFACTS_ROOT/'training'
+    img_size: int = IMG_SIZE
+    batch_size: int = PREDICT_BATCH_SIZE
+    calibration_images: int = QUANT_CALIBRATION_IMAGES
+    latency_images: int = QUANT_LATENCY_IMAGES
+    max_map_drop: float = QUANT_MAX_MAP_DROP
+    eval_split: str = QUANT_EVAL_SPLIT
+    seed: int = RANDOM_SEED
+    supported_img_ext: list = field(default_factory = lambda: list(VALID_IMG_EXT))
+
+@dataclass
+class ModelQuantizationArtifact:
+    quantized_model: Path
+    promoted: bool
+    map50_delta: float
+    map50_95_delta: float
+    quantization_report: Path
+
+
+@dataclass
+class PredictionConfig:
+    model_path: Path = PREDICT_MODEL_PATH
+    model_uri: str = None
+    img_size: int = IMG_SIZE
+    batch_size: int = PREDICT_BATCH_SIZE
+    conf_threshold: float = CONF_THRESHOLD
+    iou_threshold: float = IOU_THRESHOLD
+    device: str = PREDICT_DEVICE
+    preprocess_workers: int = PREPROCESS_WORKERS
+    prefetch_batches: int = PREFETCH_BATCHES
+    inference_threads: int = INFERENCE_THREADS
+    backend: str = PREDICT_BACKEND
+    export_report: Path = EXPORT_REPORT_PATH
+    supported_img_ext: list = field(default_factory = lambda: list(VALID_IMG_EXT))
+
+@dataclass
+class VideoPredictionConfig:
+    frame_queue_size: int = FRAME_QUEUE_SIZE
+    min_keyframe_interval: int = MIN_KEYFRAME_INTERVAL
+    max_keyframe_interval: int = MAX_KEYFRAME_INTERVAL
+    iou_threshold: float = TRACK_IOU_THRESHOLD
+    max_age: int = TRACK_MAX_AGE
+    min_hits: int = MIN_TRACK_HITS
+
+@dataclass
+class TiledPredictionConfig:
+    tile_size: int = IMG_SIZE
+    tile_overlap: float = TILE_OVERLAP
+    horizon_fraction: float = HORIZON_FRACTION
+    min_mask_coverage: float = MIN_MASK_COVERAGE
+    merge_method: str = TILE_MERGE_METHOD
+    merge_iou: float = TILE_MERGE_IOU
+    full_image_pass: bool = FULL_IMAGE_PASS
+
+@dataclass
+class DetectionSinkConfig:
+    output_dir: Path = DETECTIONS_DIR
+    partition_by: list = field(default_factory = lambda: list(DETECTION_PARTITION_BY))
+    row_group_size: int = DETECTION_ROW_GROUP_SIZE
+    max_buffered_rows: int = DETECTION_MAX_BUFFERED_ROWS
+    compression: str = DETECTION_COMPRESSION
+
+@dataclass
+class PotholeMapConfig:
+    map_file: Path = MAP_FILE
+    cell_size_m: float = MAP_CELL_SIZE_M
+    merge_radius_m: float = MAP_MERGE_RADIUS_M
+    merge_window_s: float = MAP_MERGE_WINDOW_S
+    min_score: float = MAP_MIN_SCORE
+    min_confidence: float = MAP_MIN_CONFIDENCE
+    min_vehicles: int = MAP_MIN_VEHICLES
+    consolidate_every: int = MAP_CONSOLIDATE_EVERY
+    benchmark_center: tuple = MAP_BENCHMARK_CENTER
+    benchmark_extent_m: float = MAP_BENCHMARK_EXTENT_M
+    benchmark_potholes: int = MAP_BENCHMARK_POTHOLES
+    benchmark_reports: int = MAP_BENCHMARK_REPORTS
+    benchmark_vehicles: int = MAP_BENCHMARK_VEHICLES
+    benchmark_duration_s: float = MAP_BENCHMARK_DURATION_S
+    benchmark_gps_noise_m: float = MAP_BENCHMARK_GPS_NOISE_M
+    benchmark_false_positive_rate: float = MAP_BENCHMARK_FALSE_POSITIVES
+    benchmark_queries: int = MAP_BENCHMARK_QUERIES
+    benchmark_bbox_m: float = MAP_BENCHMARK_BBOX_M
+
+@dataclass
+class ServingConfig:
+    host: str = SERVER_HOST
+    port: int = SERVER_PORT
+    max_batch_size: int = MAX_BATCH_SIZE
+    max_batch_wait_ms: float = MAX_BATCH_WAIT_MS
+    max_queue_size: int = MAX_QUEUE_SIZE
+    max_queue_delay_ms: float = MAX_QUEUE_DELAY_MS
+    enable_ui: bool = ENABLE_UI
+
+@dataclass
+class ModelStoreConfig:
+    cache_dir: Path = MODEL_CACHE_DIR
+    max_cache_bytes: int = MODEL_CACHE_MAX_BYTES
+    lock_timeout: float = MODEL_CACHE_LOCK_TIMEOUT
+
+
+@dataclass
+class ArtifactPublisherConfig:
+    s3_bucket: str = S3_Bucket
+    release_prefix: str = S3_Release_Prefix
+    max_workers: int = PUBLISH_MAX_WORKERS
+    multipart_threshold: int = PUBLISH_MULTIPART_THRESHOLD
+    multipart_chunksize: int = PUBLISH_MULTIPART_CHUNKSIZE
+    max_concurrency: int = PUBLISH_MAX_CONCURRENCY
+
+
+@dataclass
+class ModelEvaluationConfig:
+    model_path: Path
+    dataset: Path
+    artifacts_dir: Path = ARTIFACTS_ROOT/'evaluation'
+    split: str = EVAL_SPLIT
+    img_size: int = IMG_SIZE
+    batch_size: int = PREDICT_BATCH_SIZE
+    device: str = PREDICT_DEVICE
+    conf_floor: float = EVAL_CONF_FLOOR
+    nms_iou: float = EVAL_NMS_IOU
+    conf_threshold: float = EVAL_CONF_THRESHOLD
+    iou_thresholds: list = field(default_factory = lambda: list(EVAL_IOU_THRESHOLDS))
+    size_ranges: dict = field(default_factory = lambda: dict(EVAL_SIZE_RANGES))
+    supported_img_ext: list = field(default_factory = lambda: list(VALID_IMG_EXT))
+
+
+@dataclass
+class ModelEvaluationArtifact:
+    map50: float
+    map50_95: float
+    precision: float
+    recall: float
+    metrics_by_size: dict
+    evaluation_report: Path
+    predictions_cache: Path
@@ -5,8 +5,37 @@ ARTIFACTS_ROOT = PROJECT_ROOT_DIR/'artifacts'
 S3_Bucket = 'pothotle-dataset'
 S3_Prefix = 'dataset/'
 S3_Model_Key = 'models/best_model.pt'
+S3_Release_Prefix = 'models/releases/'
+SYNC_MODE = True
+INGESTION_MAX_WORKERS = 16
+INGESTION_MANIFEST = 'manifest.json'
+DELETE_STALE_FILES = True
+STREAM_VALIDATION = True
+STREAM_QUEUE_SIZE = 1024
 DATA_SPLIT = ['train', 'test', 'valid']
 VALID_IMG_EXT = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.webp']
+VALIDATION_WORKERS = None
+VALIDATION_CHUNK_SIZE = 256
+VALIDATION_CACHE = 'validation_cache.db'
+VALIDATION_CONTENT_HASH = False
+FORCE_FULL_RECHECK = False
+VALIDATION_ISSUE_LOG = 'validation_issues.jsonl'
+VALIDATION_ERROR_BUDGET = 1000
+VALIDATION_ISSUE_BUFFER = 256
+VALIDATION_ISSUE_SAMPLES = 20
+PACK_SHARD_SIZE = 1024
+PACK_WORKERS = 8
+PACK_BENCHMARK_IMAGES = 256
+USE_PACKED_DATASET = True
+DEDUP_DATASET = True
+DEDUP_CACHE = 'phash_cache.db'
+DEDUP_HASH_SIZE = 8
+DEDUP_RADIUS = 6
+DEDUP_THIN_SPLITS = ['train']
+DEDUP_DROP_LEAKS = True
+DEDUP_REPORT_SAMPLES = 20
+TRAIN_ON_THINNED = False
+TRAIN_IMAGES_PER_SEC = 40.0
 MODEL_NAME = 'yolov8s.pt'
 IMG_SIZE = 640
 EPOCHS = 50
@@ -21,6 +50,123 @@ WORKERS = 8
 WARMUP_EPOCHS = 3
 VAL_DATA = True
 PLOTS = True
+TRAINING_STATE_FILE = 'training_state.json'
+INCREMENTAL_TRAINING = False
+INCREMENTAL_EPOCHS = 10
+INCREMENTAL_OPTIMIZER = 'SGD'
+INCREMENTAL_LR0 = 0.002
+INCREMENTAL_REPLAY_RATIO = 2.0
+INCREMENTAL_MIN_REPLAY = 256
+INCREMENTAL_MAX_MAP_REGRESSION = 0.0
+INCREMENTAL_GATE_SPLIT = 'test'
+HPARAM_SEARCH = False
+HPARAM_SEARCH_SPACE = {
+    'lr0': ('log', 1e-4, 1e-1),
+    'lrf': ('uniform', 0.01, 0.5),
+    'momentum': ('uniform', 0.6, 0.98),
+    'weight_decay': ('log', 1e-5, 1e-3),
+    'batch_size': ('choice', [8, 16, 32]),
+    'img_size': ('choice', [480, 640])
+}
+HPARAM_TRIALS = 27
+HPARAM_MIN_EPOCHS = 2
+HPARAM_MAX_EPOCHS = 18
+HPARAM_REDUCTION_FACTOR = 3
+HPARAM_OPTIMIZER = 'SGD'
+HPARAM_WORKERS = 4
+HPARAM_THREADS_PER_TRIAL = None
+HPARAM_DATALOADER_WORKERS = 2
+HPARAM_DATA_FRACTION = 1.0
+HPARAM_DEVICE = 'cpu'
+HPARAM_LOG_TO_MLFLOW = True
+EXPORT_FORMATS = ['onnx', 'openvino']
+EXPORT_TOLERANCE = 1e-3
+CALIBRATION_IMAGES = 32
+WARMUP_RUNS = 3
+QUANTIZE_MODEL = True
+QUANT_CALIBRATION_IMAGES = 200
+QUANT_LATENCY_IMAGES = 32
+QUANT_MAX_MAP_DROP = 0.01
+QUANT_EVAL_SPLIT = 'test'
+RANDOM_SEED = 42
+PREDICT_MODEL_PATH = ARTIFACTS_ROOT/'training'/'best.pt'
+PREDICT_BATCH_SIZE = 8
+CONF_THRESHOLD = 0.25
+IOU_THRESHOLD = 0.45
+PREDICT_DEVICE = 'cpu'
+PREPROCESS_WORKERS = 4
+PREFETCH_BATCHES = 2
+INFERENCE_THREADS = None
+PREDICT_BACKEND = 'auto'
+EXPORT_REPORT_PATH = ARTIFACTS_ROOT/'training'/'export_report.json'
+FRAME_QUEUE_SIZE = 64
+MIN_KEYFRAME_INTERVAL = 1
+MAX_KEYFRAME_INTERVAL = 8
+TRACK_IOU_THRESHOLD = 0.3
+TRACK_MAX_AGE = 30
+MIN_TRACK_HITS = 2
+TILE_OVERLAP = 0.2
+HORIZON_FRACTION = 0.0
+MIN_MASK_COVERAGE = 0.05
+TILE_MERGE_METHOD = 'nms'
+TILE_MERGE_IOU = 0.5
+FULL_IMAGE_PASS = True
+DETECTIONS_DIR = ARTIFACTS_ROOT/'detections'
+DETECTION_PARTITION_BY = ['date']
+DETECTION_ROW_GROUP_SIZE = 131072
+DETECTION_MAX_BUFFERED_ROWS = 524288
+DETECTION_COMPRESSION = 'zstd'
+MAP_FILE = ARTIFACTS_ROOT/'pothole_map'/'potholes.geojson'
+MAP_CELL_SIZE_M = 25.0
+MAP_MERGE_RADIUS_M = 10.0
+MAP_MERGE_WINDOW_S = 30*24*3600
+MAP_MIN_SCORE = CONF_THRESHOLD
+MAP_MIN_CONFIDENCE = 0.5
+MAP_MIN_VEHICLES = 2
+MAP_CONSOLIDATE_EVERY = 100000
+MAP_BENCHMARK_CENTER = (28.6139, 77.2090)
+MAP_BENCHMARK_EXTENT_M = 20000.0
+MAP_BENCHMARK_POTHOLES = 20000
+MAP_BENCHMARK_REPORTS = 1000000
+MAP_BENCHMARK_VEHICLES = 500
+MAP_BENCHMARK_DURATION_S = 7*24*3600
+MAP_BENCHMARK_GPS_NOISE_M = 3.0
+MAP_BENCHMARK_FALSE_POSITIVES = 0.05
+MAP_BENCHMARK_QUERIES = 1000
+MAP_BENCHMARK_BBOX_M = 500.0
+SERVER_HOST = '0.0.0.0'
+SERVER_PORT = 8000
+MAX_BATCH_SIZE = 16
+MAX_BATCH_WAIT_MS = 10
+MAX_QUEUE_SIZE = 64
+MAX_QUEUE_DELAY_MS = 2000
+ENABLE_UI = True
+MODEL_CACHE_DIR = ARTIFACTS_ROOT/'model_cache'
+MODEL_CACHE_MAX_BYTES = 2*1024**3
+MODEL_CACHE_LOCK_TIMEOUT = 600
+PUBLISH_MAX_WORKERS = 4
+PUBLISH_MULTIPART_THRESHOLD = 16*1024**2
+PUBLISH_MULTIPART_CHUNKSIZE = 16*1024**2
+PUBLISH_MAX_CONCURRENCY = 8
+PIPELINE_STATE_FILE = ARTIFACTS_ROOT/'pipeline_state.json'
+PIPELINE_MAX_WORKERS = 2
+PIPELINE_FINGERPRINT_DIR = ARTIFACTS_ROOT/'stages'
+LOG_SPANS_TO_MLFLOW = False
+IMPORT_TIME_REPEATS = 3
+IMPORT_TIME_BUDGETS = {
+    'main': 0.25,
+    'PotholeDetection.components.data_validation': 0.6,
+    'PotholeDetection.pipeline.predict_pipeline': 0.6,
+    'PotholeDetection.pipeline.serving': 1.5,
+    'PotholeDetection.pipeline.train_pipeline': 1.5
+}
+LAZY_IMPORTS = ['torch', 'ultralytics', 'onnx', 'onnxruntime', 'openvino', 'mlflow', 'dvc', 'gradio']
+EVAL_SPLIT = 'test'
+EVAL_CONF_FLOOR = 0.001
+EVAL_NMS_IOU = 0.7
+EVAL_CONF_THRESHOLD = 0.25
+EVAL_IOU_THRESHOLDS = [0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95]
+EVAL_SIZE_RANGES = {'small': (0, 32**2), 'medium': (32**2, 96**2), 'large': (96**2, float('inf'))}
 
 
 DATASET_PATH = Path(r'C:\AI_ML\Projects\Pothole_Detection\dataset')
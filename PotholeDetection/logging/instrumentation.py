@@ -0,0 +1,287 @@
+import os
+import json
+import time
+import threading
+import functools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import psutil
+from PotholeDetection.logging.logger import logger, LOG_PATH
+
+
+DEFAULT_METRICS_FILE_PATH = LOG_PATH/f'metrics_{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.jsonl'
+# JSONL sink of finished spans. Off until an entry point calls configure_metrics(), so library use writes no files
+METRICS_FILE_PATH = None
+RSS_SAMPLE_INTERVAL = 0.05
+# Finished spans kept in memory; the metrics file has all of them. Bounded so long-running processes do not leak
+MAX_SPAN_RECORDS = 10000
+
+current_span = contextvars.ContextVar('current_span', default = None)
+
+
+def cpu_seconds() -> float:
+    """
+    Returns: float: User + system CPU time of this process and its finished child processes (e.g. process pool workers)
+    """
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class RssSampler:
+    """
+    Background thread tracking the peak resident set size of every open span
+    """
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.open_spans = set()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def rss(self) -> int:
+        return self.process.memory_info().rss
+
+    def register(self, span):
+        with self.lock:
+            self.open_spans.add(span)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target = self.run, name = 'rss-sampler', daemon = True)
+                self.thread.start()
+
+    def unregister(self, span):
+        with self.lock:
+            self.open_spans.discard(span)
+
+    def run(self):
+        while True:
+            with self.lock:
+                if not self.open_spans:
+                    self.thread = None
+                    return
+                spans = list(self.open_spans)
+
+            rss = self.rss()
+            for span in spans:
+                span.peak_rss = max(span.peak_rss, rss)
+            time.sleep(self.interval)
+
+
+class Aggregate:
+    """
+    Accumulates the timings of a hot inner loop (one download, one image chunk) into a single record
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall_s = 0.0
+        self.max_s = 0.0
+        self.counters = {}
+
+    def add(self, seconds: float, **counters):
+        self.calls += 1
+        self.wall_s += seconds
+        self.max_s = max(self.max_s, seconds)
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'wall_s': round(self.wall_s, 6),
+            'mean_ms': round(self.wall_s/self.calls*1000, 3) if self.calls else 0.0,
+            'max_ms': round(self.max_s*1000, 3),
+            **self.counters
+        }
+
+
+class Span:
+    """
+    Times a block of work: wall time, CPU time, peak RSS, items processed and throughput.
+    Nested spans are named parent/child. Finished spans are appended to the metrics JSONL file (if configured); the most recent
+    MAX_SPAN_RECORDS are also kept in Span.records, and every record is handed to the active collect_records() lists
+    """
+    sampler = RssSampler()
+    records = deque(maxlen = MAX_SPAN_RECORDS)
+    collectors = []
+    records_lock = threading.Lock()
+
+    def __init__(self, name: str, parent = None, **attributes):
+        self.parent = parent
+        self.name = f'{parent.name}/{name}' if parent else name
+        self.attributes = attributes
+        self.counters = {}
+        self.aggregates = {}
+        self.lock = threading.Lock()
+        self.peak_rss = 0
+        self.status = 'ok'
+
+    def __enter__(self):
+        self.token = current_span.set(self)
+        self.start_rss = self.sampler.rss()
+        self.peak_rss = self.start_rss
+        self.sampler.register(self)
+        self.start_cpu = cpu_seconds()
+        self.start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall_s = time.perf_counter() - self.start_wall
+        cpu_s = cpu_seconds() - self.start_cpu
+        self.sampler.unregister(self)
+        end_rss = self.sampler.rss()
+        self.peak_rss = max(self.peak_rss, end_rss)
+        current_span.reset(self.token)
+        if exc_type is not None:
+            self.status = 'error'
+
+        items = self.counters.get('items')
+        record = {
+            'span': self.name,
+            'depth': self.name.count('/'),
+            'status': self.status,
+            'started_at': time.time() - wall_s,
+            'wall_s': round(wall_s, 6),
+            'cpu_s': round(cpu_s, 6),
+            'cpu_utilization': round(cpu_s/wall_s, 3) if wall_s > 0 else 0.0,
+            'rss_start_mb': round(self.start_rss/1024**2, 1),
+            'rss_end_mb': round(end_rss/1024**2, 1),
+            'peak_rss_mb': round(self.peak_rss/1024**2, 1),
+            **self.attributes,
+            **self.counters,
+            'items_per_sec': round(items/wall_s, 3) if items and wall_s > 0 else None,
+            'loops': {name: aggregate.to_dict() for name, aggregate in self.aggregates.items()}
+        }
+        emit(record)
+        return False
+
+    def count(self, items: int = 1, **counters):
+        """
+        Add to the items processed by the span and to any other named counters (e.g. bytes)
+        """
+        with self.lock:
+            self.counters['items'] = self.counters.get('items', 0) + items
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    @contextmanager
+    def track(self, name: str, **counters):
+        """
+        Time one iteration of an inner loop. Safe to use from worker threads; iterations are aggregated per name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                if name not in self.aggregates:
+                    self.aggregates[name] = Aggregate(name)
+                self.aggregates[name].add(elapsed, **counters)
+
+
+def span(name: str, **attributes) -> Span:
+    """
+    Open a span nested under the current span of this thread (or context)
+    """
+    return Span(name, parent = current_span.get(), **attributes)
+
+
+def instrument(name: str):
+    """
+    Decorator running the wrapped function inside a span
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def collect_records():
+    """
+    Collect every span record emitted inside the block, e.g. for the summary of one pipeline run
+    Yields: list: The records, filled in as spans finish
+    """
+    records = []
+    with Span.records_lock:
+        Span.collectors.append(records)
+    try:
+        yield records
+    finally:
+        with Span.records_lock:
+            Span.collectors.remove(records)
+
+
+def configure_metrics(metrics_file: Path = DEFAULT_METRICS_FILE_PATH) -> Path:
+    """
+    Append every finished span to a JSONL file. Like configure_logging, called once by the entry points
+    Returns: Path: Metrics file
+    """
+    global METRICS_FILE_PATH
+    METRICS_FILE_PATH = Path(metrics_file)
+    return METRICS_FILE_PATH
+
+
+def emit(record: dict):
+    with Span.records_lock:
+        Span.records.append(record)
+        for collector in Span.collectors:
+            collector.append(record)
+        if METRICS_FILE_PATH is None:
+            return
+        try:
+            METRICS_FILE_PATH.parent.mkdir(parents = True, exist_ok = True)
+            with open(METRICS_FILE_PATH, 'a') as f:
+                f.write(json.dumps(record, default = str) + '\n')
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {METRICS_FILE_PATH}: {e}")
+
+
+def log_to_mlflow(records: list = None, run_name: str = 'pipeline_metrics'):
+    """
+    Log span metrics to the active MLflow run, or to a new run if none is active
+    """
+    try:
+        import mlflow
+    except ImportError:
+        logger.warning("MLflow is not installed. Span metrics are only kept in memory and the metrics file, if configured")
+        return
+
+    metrics = {}
+    for record in records if records is not None else Span.records:
+        key = record['span'].replace('/', '.')
+        for field in ('wall_s', 'cpu_s', 'peak_rss_mb', 'items', 'items_per_sec'):
+            if record.get(field) is not None:
+                metrics[f'{key}.{field}'] = record[field]
+
+    try:
+        if mlflow.active_run() is not None:
+            mlflow.log_metrics(metrics)
+        else:
+            with mlflow.start_run(run_name = run_name):
+                mlflow.log_metrics(metrics)
+        logger.info(f"Logged {len(metrics)} span metrics to MLflow")
+    except Exception as e:
+        logger.warning(f"Could not log span metrics to MLflow: {e}")
+
+
+def summary_table(records: list = None, max_depth: int = 1) -> str:
+    """
+    Returns: str: Table of the given (default: all recorded) spans up to max_depth, in completion order
+    """
+    header = f"{'span':<48} {'status':<6} {'wall s':>9} {'cpu s':>9} {'peak MB':>9} {'items':>9} {'items/s':>10}"
+    rows = [header, '-'*len(header)]
+    for record in records if records is not None else Span.records:
+        if record['depth'] > max_depth:
+            continue
+        rows.append(
+            f"{record['span']:<48} {record['status']:<6} {record['wall_s']:>9.2f} {record['cpu_s']:>9.2f} {record['peak_rss_mb']:>9.1f} "
+            f"{record.get('items') or '':>9} {record.get('items_per_sec') or '':>10}"
+        )
+    return '\n'.join(rows)
@@ -7,14 +7,26 @@ from datetime import datetime
 LOG_FILE = f'{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.log'
 LOG_PATH = Path('logs')
 LOG_FILE_PATH = LOG_PATH / LOG_FILE
+LOG_FORMAT = '[%(asctime)s] %(lineno)d %(name)s - %(levelname)s - %(message)s'
 
-if not LOG_PATH.exists():
-    LOG_PATH.mkdir(parents=True, exist_ok=True)
+logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    format='[%(asctime)s] %(lineno)d %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO)
 
-logger = logging.getLogger(__name__)
-logger.info("Logger has been configured successfully.")
\ No newline at end of file
+def configure_logging(log_file: Path = LOG_FILE_PATH, level: int = logging.INFO) -> Path:
+    """
+    Send the package's log records to a log file. Importing the package has no side effects; entry points
+    (main.py, pipeline scripts) call this once at startup, library users may configure logging themselves instead
+    Returns: Path: Log file
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, logging.FileHandler) and Path(h.baseFilename) == Path(log_file).resolve() for h in root.handlers):
+        return log_file
+
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.FileHandler(log_file)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    logger.info("Logger has been configured successfully.")
+    return log_file
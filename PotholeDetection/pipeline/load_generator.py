@@ -0,0 +1,85 @@
+import time
+import asyncio
+import argparse
+from pathlib import Path
+import cv2
+import httpx
+import numpy as np
+from PotholeDetection.constants.constants import VALID_IMG_EXT
+from PotholeDetection.utils.utils import list_images
+
+
+async def worker(client: httpx.AsyncClient, url: str, payloads: list, deadline: float, stats: dict, worker_id: int):
+    i = worker_id
+    while time.perf_counter() < deadline:
+        name, data = payloads[i % len(payloads)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await client.post(url, files = {'file': (name, data, 'image/jpeg')})
+            if response.status_code == 200:
+                stats['latencies'].append(time.perf_counter() - start)
+            elif response.status_code == 503:
+                stats['rejected'] += 1
+            else:
+                stats['errors'] += 1
+        except httpx.HTTPError:
+            stats['errors'] += 1
+
+
+async def run_load(url: str, payloads: list, concurrency: int, duration: float) -> dict:
+    """
+    Keep `concurrency` requests in flight against the server for `duration` seconds
+    Returns: dict: Sustained requests/sec, latency percentiles and rejection/error counts
+    """
+    stats = {'latencies': [], 'rejected': 0, 'errors': 0}
+    limits = httpx.Limits(max_connections = concurrency)
+    async with httpx.AsyncClient(timeout = 60, limits = limits) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(worker(client, url, payloads, deadline, stats, i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies = np.array(stats['latencies'])*1000
+    return {
+        'concurrency': concurrency,
+        'completed': len(latencies),
+        'rejected': stats['rejected'],
+        'errors': stats['errors'],
+        'requests_per_sec': len(latencies)/elapsed,
+        'p50_latency_ms': float(np.percentile(latencies, 50)) if len(latencies) else None,
+        'p95_latency_ms': float(np.percentile(latencies, 95)) if len(latencies) else None,
+        'p99_latency_ms': float(np.percentile(latencies, 99)) if len(latencies) else None
+    }
+
+
+def load_payloads(images_dir: str, num_synthetic: int = 16) -> list:
+    """
+    Encode the images of a directory as request payloads, or synthetic frames if no directory is given
+    """
+    if images_dir:
+        return [(f.name, f.read_bytes()) for f in list_images(Path(images_dir), VALID_IMG_EXT)]
+
+    rng = np.random.default_rng(0)
+    return [
+        (f'synthetic_{i}.jpg', cv2.imencode('.jpg', rng.integers(0, 255, (720, 1280, 3), dtype = np.uint8))[1].tobytes())
+        for i in range(num_synthetic)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Measure sustained requests/sec of the inference server')
+    parser.add_argument('--url', default = 'http://127.0.0.1:8000/predict')
+    parser.add_argument('--images', default = None, help = 'Directory of images to send. Synthetic frames are used if omitted')
+    parser.add_argument('--concurrency', type = int, nargs = '+', default = [1, 4, 16, 64])
+    parser.add_argument('--duration', type = float, default = 30.0, help = 'Seconds per concurrency level')
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.images)
+    for concurrency in args.concurrency:
+        result = asyncio.run(run_load(args.url, payloads, concurrency, args.duration))
+        print(' '.join(f'{k}={v:.1f}' if isinstance(v, float) else f'{k}={v}' for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
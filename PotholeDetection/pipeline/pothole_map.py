@@ -0,0 +1,329 @@
+import json
+import math
+import time
+from pathlib import Path
+from dataclasses import dataclass, field
+import numpy as np
+from PotholeDetection.config_manager.component_config import PotholeMapConfig
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.utils.geo_index import GridIndex, METERS_PER_DEGREE
+
+
+@dataclass
+class PotholeReport:
+    vehicle_id: str
+    timestamp: float
+    lat: float
+    lon: float
+    score: float
+
+
+@dataclass(eq = False)
+class PotholeRecord:
+    pothole_id: int
+    lat: float
+    lon: float
+    first_seen: float
+    last_seen: float
+    reports: int = 0
+    weight: float = 0.0
+    vehicles: dict = field(default_factory = dict)
+
+    @property
+    def confidence(self) -> float:
+        """
+        Noisy-OR over the best score of every vehicle: repeated frames of one pass are correlated,
+        independent vehicles confirming the pothole are not
+        """
+        miss = 1.0
+        for score in self.vehicles.values():
+            miss *= 1.0 - score
+        return 1.0 - miss
+
+    def to_feature(self) -> dict:
+        return {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [self.lon, self.lat]},
+            'properties': {
+                'pothole_id': self.pothole_id,
+                'confidence': self.confidence,
+                'reports': self.reports,
+                'vehicles': len(self.vehicles),
+                'first_seen': self.first_seen,
+                'last_seen': self.last_seen
+            }
+        }
+
+
+def exif_gps(image_path: Path) -> tuple:
+    """
+    Read the GPS position and capture time of a geotagged image from its EXIF tags
+    Returns: tuple: (lat, lon, timestamp or None), None if the image has no GPS tags
+    """
+    from PIL import Image
+    from datetime import datetime
+
+    with Image.open(image_path) as img:
+        exif = img.getexif()
+    gps = exif.get_ifd(0x8825)
+    if 2 not in gps or 4 not in gps:
+        return None
+
+    def degrees(dms, ref) -> float:
+        value = float(dms[0]) + float(dms[1])/60 + float(dms[2])/3600
+        return -value if ref in ('S', 'W') else value
+
+    taken = exif.get_ifd(0x8769).get(0x9003) or exif.get(0x0132)
+    timestamp = datetime.strptime(taken, '%Y:%m:%d %H:%M:%S').timestamp() if taken else None
+    return degrees(gps[2], gps.get(1, 'N')), degrees(gps[4], gps.get(3, 'E')), timestamp
+
+
+class PotholeMap:
+    """
+    Aggregates geotagged detections from many vehicles into one record per physical pothole.
+    Every report is snapped into a grid index and merged into the nearest record within merge_radius_m that was
+    last reported within merge_window_s; the record's position is the score-weighted centroid of its reports.
+    A report with no such record starts a new one (a pothole seen again after the window is treated as new,
+    e.g. after a repair). Bounding box and nearest-pothole queries are answered from the same index
+    """
+    def __init__(self, config: PotholeMapConfig):
+        self.config = config
+        self.index = GridIndex(config.cell_size_m)
+        self.records = []
+        self.next_id = 0
+        self.reports_ingested = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    def ingest(self, report: PotholeReport) -> PotholeRecord:
+        """
+        Merge one report into the map
+        Returns: PotholeRecord: The record the report was merged into
+        """
+        self.reports_ingested += 1
+        candidates = [
+            (distance, record) for distance, record in self.index.within(report.lat, report.lon, self.config.merge_radius_m)
+            if abs(report.timestamp - record.last_seen) <= self.config.merge_window_s
+        ]
+        if candidates:
+            record = min(candidates, key = lambda candidate: candidate[0])[1]
+            total = record.weight + report.score
+            self.index.move(
+                record,
+                (record.lat*record.weight + report.lat*report.score)/total,
+                (record.lon*record.weight + report.lon*report.score)/total
+            )
+            record.weight = total
+            record.first_seen = min(record.first_seen, report.timestamp)
+            record.last_seen = max(record.last_seen, report.timestamp)
+        else:
+            record = PotholeRecord(self.next_id, report.lat, report.lon, report.timestamp, report.timestamp, weight = report.score)
+            self.next_id += 1
+            self.records.append(record)
+            self.index.insert(record)
+
+        record.reports += 1
+        if report.score > record.vehicles.get(report.vehicle_id, 0.0):
+            record.vehicles[report.vehicle_id] = report.score
+
+        if self.config.consolidate_every and self.reports_ingested % self.config.consolidate_every == 0:
+            self.consolidate()
+        return record
+
+    def ingest_many(self, reports) -> int:
+        """
+        Returns: int: Number of reports ingested
+        """
+        n = 0
+        for report in reports:
+            self.ingest(report)
+            n += 1
+        return n
+
+    def consolidate(self) -> int:
+        """
+        A GPS outlier that arrives before a pothole's centroid settles starts a satellite record a few meters away,
+        which then collects the pothole's other outliers. Heaviest first, every record absorbs the lighter records
+        that ended up within merge_radius_m of it and were seen within merge_window_s
+        Returns: int: Number of records merged away
+        """
+        merged = set()
+        for record in sorted(self.records, key = lambda r: -r.weight):
+            if record.pothole_id in merged:
+                continue
+            for _, other in self.index.within(record.lat, record.lon, self.config.merge_radius_m):
+                if other is record or other.weight > record.weight or other.pothole_id in merged:
+                    continue
+                if other.first_seen - record.last_seen > self.config.merge_window_s or record.first_seen - other.last_seen > self.config.merge_window_s:
+                    continue
+
+                total = record.weight + other.weight
+                self.index.remove(other)
+                self.index.move(record, (record.lat*record.weight + other.lat*other.weight)/total, (record.lon*record.weight + other.lon*other.weight)/total)
+                record.weight = total
+                record.reports += other.reports
+                record.first_seen = min(record.first_seen, other.first_seen)
+                record.last_seen = max(record.last_seen, other.last_seen)
+                for vehicle_id, score in other.vehicles.items():
+                    record.vehicles[vehicle_id] = max(score, record.vehicles.get(vehicle_id, 0.0))
+                merged.add(other.pothole_id)
+
+        if merged:
+            self.records = [record for record in self.records if record.pothole_id not in merged]
+        return len(merged)
+
+    def ingest_detections(self, detections, vehicle_id: str, lat: float = None, lon: float = None, timestamp: float = None) -> int:
+        """
+        Turn the Detections of one image from the Predictor into reports at the vehicle's GPS position.
+        Without an explicit position, the GPS EXIF tags of the source image are used
+        Returns: int: Number of reports ingested
+        """
+        if lat is None or lon is None:
+            gps = exif_gps(detections.source)
+            if gps is None:
+                logger.warning(f"No GPS position for {detections.source}, detections not added to the pothole map")
+                return 0
+            lat, lon, exif_time = gps
+            timestamp = timestamp if timestamp is not None else exif_time
+        timestamp = timestamp if timestamp is not None else time.time()
+
+        scores = [float(s) for s in detections.scores if s >= self.config.min_score]
+        for score in scores:
+            self.ingest(PotholeReport(vehicle_id, timestamp, lat, lon, score))
+        return len(scores)
+
+    def confirmed(self, min_confidence: float = None, min_vehicles: int = None):
+        """
+        Returns: Predicate accepting records with at least min_confidence reported by at least min_vehicles vehicles,
+                 None if every record is accepted
+        """
+        min_confidence = self.config.min_confidence if min_confidence is None else min_confidence
+        min_vehicles = self.config.min_vehicles if min_vehicles is None else min_vehicles
+        if min_confidence <= 0 and min_vehicles <= 1:
+            return None
+        return lambda record: len(record.vehicles) >= min_vehicles and record.confidence >= min_confidence
+
+    def bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float, min_confidence: float = None, min_vehicles: int = None) -> list:
+        """
+        Returns: list: Confirmed pothole records inside the bounding box
+        """
+        accept = self.confirmed(min_confidence, min_vehicles)
+        return [record for record in self.index.bbox(min_lat, min_lon, max_lat, max_lon) if accept is None or accept(record)]
+
+    def nearest(self, lat: float, lon: float, k: int = 1, max_distance_m: float = None, min_confidence: float = None, min_vehicles: int = None) -> list:
+        """
+        Returns: list: (distance in meters, record) of the k nearest confirmed potholes, closest first
+        """
+        return self.index.nearest(lat, lon, k, max_distance_m, self.confirmed(min_confidence, min_vehicles))
+
+    def save_geojson(self, path: Path = None, min_confidence: float = None, min_vehicles: int = None) -> Path:
+        """
+        Returns: Path: GeoJSON FeatureCollection of the confirmed potholes
+        """
+        path = Path(path or self.config.map_file)
+        self.consolidate()
+        accept = self.confirmed(min_confidence, min_vehicles)
+        path.parent.mkdir(parents = True, exist_ok = True)
+        with open(path, 'w') as f:
+            json.dump({
+                'type': 'FeatureCollection',
+                'features': [record.to_feature() for record in self.records if accept is None or accept(record)]
+            }, f)
+        logger.info(f"Pothole map with {len(self.records)} potholes from {self.reports_ingested} reports saved at {path}")
+        return path
+
+
+def synthetic_tracks(config: PotholeMapConfig, seed: int = 0) -> tuple:
+    """
+    Simulate a fleet driving a city grid of roads: every pass over a pothole yields a few detections
+    with GPS noise, plus a trickle of low-score false positives off the potholes
+    Returns: tuple: (list of PotholeReport in time order, (N, 2) array of the true pothole positions)
+    """
+    rng = np.random.default_rng(seed)
+    center_lat, center_lon = config.benchmark_center
+    half_m = config.benchmark_extent_m/2
+    lat_m, lon_m = METERS_PER_DEGREE, METERS_PER_DEGREE*math.cos(math.radians(center_lat))
+
+    # Potholes lie on a Manhattan grid of roads every 100 m
+    n = config.benchmark_potholes
+    along = rng.uniform(-half_m, half_m, n)
+    across = np.round(rng.uniform(-half_m, half_m, n)/100)*100
+    horizontal = rng.random(n) < 0.5
+    north = np.where(horizontal, across, along)
+    east = np.where(horizontal, along, across)
+    potholes = np.stack([center_lat + north/lat_m, center_lon + east/lon_m], axis = 1)
+
+    # Every report: a vehicle passing a pothole, a few frames apart, with GPS noise
+    m = config.benchmark_reports
+    true_positive = rng.random(m) >= config.benchmark_false_positive_rate
+    pothole_ids = rng.integers(0, n, m)
+    noise = rng.normal(0, config.benchmark_gps_noise_m, (m, 2))
+    north_m = np.where(true_positive, north[pothole_ids], rng.uniform(-half_m, half_m, m)) + noise[:, 0]
+    east_m = np.where(true_positive, east[pothole_ids], rng.uniform(-half_m, half_m, m)) + noise[:, 1]
+    scores = np.where(true_positive, rng.uniform(0.3, 0.95, m), rng.uniform(0.25, 0.4, m))
+    vehicles = rng.integers(0, config.benchmark_vehicles, m)
+    timestamps = np.sort(rng.uniform(0, config.benchmark_duration_s, m))
+
+    reports = [
+        PotholeReport(f'vehicle_{v}', float(t), float(center_lat + y/lat_m), float(center_lon + x/lon_m), float(s))
+        for v, t, y, x, s in zip(vehicles, timestamps, north_m, east_m, scores)
+    ]
+    return reports, potholes
+
+
+def benchmark_map(config: PotholeMapConfig = None, queries: int = None) -> dict:
+    """
+    Measure ingest rate, merge quality and bounding box / nearest query latency on synthetic fleet tracks
+    Returns: dict: Benchmark report
+    """
+    config = config or PotholeMapConfig()
+    queries = queries or config.benchmark_queries
+    reports, potholes = synthetic_tracks(config)
+    pothole_map = PotholeMap(config)
+
+    start = time.perf_counter()
+    pothole_map.ingest_many(reports)
+    pothole_map.consolidate()
+    ingest_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(1)
+    center_lat, center_lon = config.benchmark_center
+    span_deg = config.benchmark_extent_m/2/METERS_PER_DEGREE
+    points = np.stack([center_lat + rng.uniform(-span_deg, span_deg, queries), center_lon + rng.uniform(-span_deg, span_deg, queries)], axis = 1)
+    box_deg = config.benchmark_bbox_m/METERS_PER_DEGREE
+
+    latencies = {'bbox': [], 'nearest': []}
+    for lat, lon in points:
+        t0 = time.perf_counter()
+        pothole_map.bbox(lat, lon, lat + box_deg, lon + box_deg)
+        t1 = time.perf_counter()
+        pothole_map.nearest(lat, lon)
+        t2 = time.perf_counter()
+        latencies['bbox'].append((t1 - t0)*1000)
+        latencies['nearest'].append((t2 - t1)*1000)
+
+    accept = pothole_map.confirmed()
+    confirmed = [record for record in pothole_map.records if accept is None or accept(record)]
+    found = sum(1 for lat, lon in potholes if pothole_map.nearest(lat, lon, max_distance_m = config.merge_radius_m))
+
+    report = {
+        'reports': len(reports),
+        'true_potholes': len(potholes),
+        'records': len(pothole_map),
+        'confirmed_records': len(confirmed),
+        'potholes_recalled': found/len(potholes),
+        'ingest_reports_per_sec': len(reports)/ingest_s,
+        **{f'{kind}_p50_ms': float(np.percentile(ms, 50)) for kind, ms in latencies.items()},
+        **{f'{kind}_p95_ms': float(np.percentile(ms, 95)) for kind, ms in latencies.items()}
+    }
+    logger.info(f"Pothole map benchmark: {report}")
+    return report
+
+
+if __name__ == "__main__":
+    from PotholeDetection.logging.logger import configure_logging
+    from PotholeDetection.logging.instrumentation import configure_metrics
+    configure_logging()
+    configure_metrics()
+    print(json.dumps(benchmark_map(), indent = 4))
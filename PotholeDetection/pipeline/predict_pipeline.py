@@ -1,2 +1,212 @@
+import json
+import time
+from pathlib import Path
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PotholeDetection.config_manager.component_config import PredictionConfig, ModelStoreConfig
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.components.model_export import format_available
+from PotholeDetection.utils.utils import load_image, letterbox, unletterbox_boxes, list_images
 
 
+@dataclass
+class Detections:
+    source: str
+    boxes: np.ndarray
+    scores: np.ndarray
+    classes: np.ndarray
+    orig_shape: tuple
+    latency: float
+
+
+@dataclass
+class PreparedImage:
+    source: str
+    image: np.ndarray
+    ratio: float
+    pad: tuple
+    orig_shape: tuple
+    submitted: float
+
+
+class Predictor:
+    def __init__(self, config: PredictionConfig):
+        self.config = config
+
+        if self.config.inference_threads:
+            import torch
+            torch.set_num_threads(self.config.inference_threads)
+
+        if self.config.model_uri:
+            from PotholeDetection.utils.model_store import ModelStore
+            self.config.model_path = ModelStore(ModelStoreConfig()).resolve(self.config.model_uri)
+
+        self.backend, model_path = self.select_model()
+        logger.info(f"Loading {self.backend} model from {model_path}")
+        from ultralytics import YOLO
+        self.model = YOLO(str(model_path), task = 'detect')
+        self.executor = ThreadPoolExecutor(max_workers = self.config.preprocess_workers)
+
+    def select_model(self) -> tuple:
+        """
+        Pick the model to load. With backend 'auto' the fastest backend from the export report whose
+        runtime is installed is used, falling back to the PyTorch weights
+        Returns: tuple: (backend name, model path)
+        """
+        if not self.config.export_report.exists():
+            return 'pt', self.config.model_path
+
+        with open(self.config.export_report, 'r') as f:
+            backends = json.load(f)['backends']
+
+        if Path(backends['pt']['model']).resolve() != Path(self.config.model_path).resolve():
+            return 'pt', self.config.model_path
+
+        if self.config.backend != 'auto':
+            if self.config.backend == 'pt' or self.config.backend not in backends:
+                return 'pt', self.config.model_path
+            return self.config.backend, Path(backends[self.config.backend]['model'])
+
+        candidates = [
+            (info['median_latency_ms'], backend, Path(info['model'])) for backend, info in backends.items()
+            if backend != 'pt' and format_available(backend) and Path(info['model']).exists()
+        ]
+        if not candidates or min(candidates)[0] >= backends.get('pt', {}).get('median_latency_ms', float('inf')):
+            return 'pt', self.config.model_path
+
+        _, backend, model_path = min(candidates)
+        return backend, model_path
+
+    def iter_sources(self, sources):
+        """
+        Expand the input into (source id, image source) pairs
+        Accepts an image path, a directory, a decoded array, or a list/generator of any of these
+        """
+        if isinstance(sources, (str, Path)):
+            sources = [sources]
+        elif isinstance(sources, np.ndarray):
+            sources = [sources]
+
+        for i, source in enumerate(sources):
+            if isinstance(source, np.ndarray):
+                yield f'array_{i}', source
+            elif Path(source).is_dir():
+                for img_file in list_images(source, self.config.supported_img_ext):
+                    yield str(img_file), img_file
+            else:
+                yield str(source), source
+
+    def prepare(self, source_id: str, source, submitted: float) -> PreparedImage:
+        """
+        Decode and letterbox a single image. Runs on the preprocessing thread pool
+        Returns: PreparedImage: Letterboxed image with the metadata needed to map boxes back
+        """
+        img = load_image(source)
+        padded, ratio, pad = letterbox(img, self.config.img_size)
+        return PreparedImage(source_id, padded, ratio, pad, img.shape[:2], submitted)
+
+    def prefetch(self, sources):
+        """
+        Keep up to prefetch_batches batches of images decoding on the thread pool ahead of the model
+        Yields: PreparedImage in input order
+        """
+        in_flight = deque()
+        max_in_flight = self.config.batch_size*self.config.prefetch_batches
+
+        for source_id, source in self.iter_sources(sources):
+            in_flight.append(self.executor.submit(self.prepare, source_id, source, time.perf_counter()))
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().result()
+
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    def batches(self, sources):
+        batch = []
+        for prepared in self.prefetch(sources):
+            batch.append(prepared)
+            if len(batch) == self.config.batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def run_batch(self, batch: list) -> list:
+        """
+        Run one forward pass over a batch of letterboxed images
+        Returns: list: Detections for every image, in original image coordinates
+        """
+        results = self.model.predict(
+            [prepared.image for prepared in batch],
+            imgsz = self.config.img_size,
+            conf = self.config.conf_threshold,
+            iou = self.config.iou_threshold,
+            device = self.config.device,
+            verbose = False
+        )
+
+        finished = time.perf_counter()
+        detections = []
+        for prepared, result in zip(batch, results):
+            boxes = result.boxes.xyxy.cpu().numpy().astype(np.float32)
+            detections.append(Detections(
+                source = prepared.source,
+                boxes = unletterbox_boxes(boxes, prepared.ratio, prepared.pad, prepared.orig_shape),
+                scores = result.boxes.conf.cpu().numpy().astype(np.float32),
+                classes = result.boxes.cls.cpu().numpy().astype(np.int32),
+                orig_shape = prepared.orig_shape,
+                latency = finished - prepared.submitted
+            ))
+
+        return detections
+
+    def predict(self, sources):
+        """
+        Stream predictions for the given images. Decoding and letterboxing of the next images overlaps
+        with the forward pass of the current batch
+        Yields: Detections for every image, in input order
+        """
+        try:
+            for batch in self.batches(sources):
+                yield from self.run_batch(batch)
+
+        except Exception as e:
+            logger.error(f"Error during prediction: {e}")
+            raise e
+
+    def benchmark(self, sources, batch_sizes: tuple = (1, 4, 8, 16), warmup: int = 2) -> dict:
+        """
+        Measure throughput and per-image latency of the streaming predictor at different batch sizes
+        Returns: dict: images/sec and p50/p95 latency in milliseconds per batch size
+        """
+        sources = [source for _, source in self.iter_sources(sources)]
+        default_batch_size = self.config.batch_size
+        report = {}
+
+        try:
+            for batch_size in batch_sizes:
+                self.config.batch_size = batch_size
+                for _ in self.predict(sources[:batch_size*warmup]):
+                    pass
+
+                start = time.perf_counter()
+                latencies = [detections.latency for detections in self.predict(sources)]
+                elapsed = time.perf_counter() - start
+
+                report[batch_size] = {
+                    'images_per_sec': len(latencies)/elapsed,
+                    'p50_latency_ms': float(np.percentile(latencies, 50))*1000,
+                    'p95_latency_ms': float(np.percentile(latencies, 95))*1000
+                }
+                logger.info(f"Batch size {batch_size}: {report[batch_size]}")
+
+        finally:
+            self.config.batch_size = default_batch_size
+
+        return report
+
+    def close(self):
+        self.executor.shutdown()
@@ -0,0 +1,257 @@
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from PotholeDetection.config_manager.component_config import PredictionConfig, ServingConfig
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.pipeline.predict_pipeline import Predictor, Detections
+from PotholeDetection.utils.utils import decode_image
+
+
+class ServerOverloaded(Exception):
+    pass
+
+
+class ServingMetrics:
+    LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf'))
+
+    def __init__(self, window_seconds: float = 60.0):
+        self.window_seconds = window_seconds
+        self.started = time.time()
+        self.requests = 0
+        self.completed = 0
+        self.rejected = 0
+        self.shed = 0
+        self.failed = 0
+        self.latency_counts = [0]*len(self.LATENCY_BUCKETS_MS)
+        self.batch_sizes = {}
+        self.completions = deque()
+
+    def record_completion(self, latency_ms: float):
+        self.completed += 1
+        now = time.time()
+        self.completions.append(now)
+        while self.completions and self.completions[0] < now - self.window_seconds:
+            self.completions.popleft()
+
+        for i, bound in enumerate(self.LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.latency_counts[i] += 1
+                break
+
+    def record_batch(self, size: int):
+        self.batch_sizes[size] = self.batch_sizes.get(size, 0) + 1
+
+    def snapshot(self, queue_depth: int) -> dict:
+        window = min(self.window_seconds, time.time() - self.started) or 1.0
+        return {
+            'requests': self.requests,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'shed': self.shed,
+            'failed': self.failed,
+            'queue_depth': queue_depth,
+            'throughput_rps': len(self.completions)/window,
+            'latency_histogram_ms': {
+                ('+Inf' if bound == float('inf') else str(bound)): count
+                for bound, count in zip(self.LATENCY_BUCKETS_MS, self.latency_counts)
+            },
+            'batch_size_histogram': dict(sorted(self.batch_sizes.items()))
+        }
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests into micro-batches for the resident model. A batch is flushed once it
+    reaches max_batch_size or max_batch_wait_ms after its first request. The queue is bounded: requests are
+    rejected when it is full, and requests that waited longer than max_queue_delay_ms are shed.
+    """
+    def __init__(self, predictor: Predictor, config: ServingConfig, metrics: ServingMetrics):
+        self.predictor = predictor
+        self.config = config
+        self.metrics = metrics
+        self.queue = asyncio.Queue(maxsize = config.max_queue_size)
+        self.slots = asyncio.Semaphore(config.max_queue_size)
+        self.model_executor = ThreadPoolExecutor(max_workers = 1)
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.model_executor.shutdown()
+
+    async def submit(self, img, source_id: str = 'request') -> Detections:
+        """
+        Decode (if img is encoded bytes) and preprocess an image on the predictor's thread pool and queue it for the
+        next micro-batch. A slot is reserved before any work is done, so at most max_queue_size requests are decoded,
+        preprocessed or queued at a time
+        Returns: Detections: Predictions for the image
+        """
+        self.metrics.requests += 1
+        if self.slots.locked():
+            self.metrics.rejected += 1
+            raise ServerOverloaded("Inference queue is full")
+
+        await self.slots.acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            submitted = time.perf_counter()
+            if isinstance(img, bytes):
+                img = await loop.run_in_executor(self.predictor.executor, decode_image, img)
+            prepared = await loop.run_in_executor(self.predictor.executor, self.predictor.prepare, source_id, img, submitted)
+
+            future = loop.create_future()
+            try:
+                self.queue.put_nowait((prepared, future))
+            except asyncio.QueueFull:
+                self.metrics.rejected += 1
+                raise ServerOverloaded("Inference queue is full")
+
+            detections = await future
+            self.metrics.record_completion((time.perf_counter() - submitted)*1000)
+            return detections
+
+        finally:
+            self.slots.release()
+
+    async def collect_batch(self) -> list:
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.config.max_batch_wait_ms/1000
+
+        while len(batch) < self.config.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.collect_batch()
+
+            now = time.perf_counter()
+            live = []
+            for prepared, future in batch:
+                if (now - prepared.submitted)*1000 > self.config.max_queue_delay_ms:
+                    self.metrics.shed += 1
+                    future.set_exception(ServerOverloaded("Request waited too long in the inference queue"))
+                else:
+                    live.append((prepared, future))
+
+            if not live:
+                continue
+
+            self.metrics.record_batch(len(live))
+            try:
+                results = await loop.run_in_executor(self.model_executor, self.predictor.run_batch, [p for p, _ in live])
+                for (_, future), detections in zip(live, results):
+                    if not future.done():
+                        future.set_result(detections)
+
+            except Exception as e:
+                logger.error(f"Error in inference batch: {e}")
+                self.metrics.failed += len(live)
+                for _, future in live:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+def detections_to_dict(detections: Detections, names: dict) -> dict:
+    return {
+        'detections': [
+            {'box': box.round(1).tolist(), 'score': round(float(score), 4), 'class_id': int(cls), 'class_name': names.get(int(cls), str(cls))}
+            for box, score, cls in zip(detections.boxes, detections.scores, detections.classes)
+        ],
+        'image_shape': list(detections.orig_shape),
+        'latency_ms': round(detections.latency*1000, 2)
+    }
+
+
+def build_ui(batcher: MicroBatcher, names: dict):
+    """
+    Gradio front end sharing the micro-batcher of the HTTP API
+    """
+    import cv2
+    import gradio as gr
+
+    async def detect(image: np.ndarray):
+        img = np.ascontiguousarray(image[..., ::-1])
+        detections = await batcher.submit(img, 'ui')
+        annotated = img.copy()
+        for box, score in zip(detections.boxes.astype(int), detections.scores):
+            cv2.rectangle(annotated, tuple(box[:2]), tuple(box[2:]), (0, 0, 255), 2)
+            cv2.putText(annotated, f'{score:.2f}', (box[0], max(box[1] - 5, 0)), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+        return annotated[..., ::-1], detections_to_dict(detections, names)
+
+    return gr.Interface(fn = detect, inputs = gr.Image(type = 'numpy'), outputs = [gr.Image(), gr.JSON()], title = 'Pothole Detection')
+
+
+def create_app(serving_config: ServingConfig = None, prediction_config: PredictionConfig = None) -> FastAPI:
+    """
+    Build the inference server. The model is loaded once at startup and shared by all requests
+    Returns: FastAPI: Application exposing /predict, /metrics and /health (and the Gradio UI at /ui)
+    """
+    serving_config = serving_config or ServingConfig()
+    prediction_config = prediction_config or PredictionConfig()
+    predictor = Predictor(prediction_config)
+    metrics = ServingMetrics()
+    batcher = MicroBatcher(predictor, serving_config, metrics)
+    names = predictor.model.names
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        batcher.start()
+        logger.info(f"Inference server started with {predictor.backend} backend")
+        yield
+        await batcher.stop()
+        predictor.close()
+        logger.info("Inference server stopped")
+
+    app = FastAPI(title = 'Pothole Detection', lifespan = lifespan)
+
+    @app.post('/predict')
+    async def predict(file: UploadFile = File(...)):
+        try:
+            detections = await batcher.submit(await file.read(), file.filename or 'request')
+        except ValueError as e:
+            raise HTTPException(status_code = 400, detail = str(e))
+        except ServerOverloaded as e:
+            raise HTTPException(status_code = 503, detail = str(e), headers = {'Retry-After': '1'})
+
+        return detections_to_dict(detections, names)
+
+    @app.get('/metrics')
+    async def get_metrics():
+        return metrics.snapshot(batcher.queue.qsize())
+
+    @app.get('/health')
+    async def health():
+        return {'status': 'ok', 'backend': predictor.backend}
+
+    if serving_config.enable_ui:
+        import gradio as gr
+        app = gr.mount_gradio_app(app, build_ui(batcher, names), path = '/ui')
+
+    return app
+
+
+def serve(serving_config: ServingConfig = None, prediction_config: PredictionConfig = None):
+    import uvicorn
+
+    serving_config = serving_config or ServingConfig()
+    uvicorn.run(create_app(serving_config, prediction_config), host = serving_config.host, port = serving_config.port)
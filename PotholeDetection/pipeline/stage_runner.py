@@ -0,0 +1,274 @@
+import json
+import time
+import hashlib
+import threading
+import contextvars
+from pathlib import Path
+from dataclasses import dataclass, field, fields, asdict, is_dataclass
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable
+from PotholeDetection.logging.logger import logger
+
+
+def to_jsonable(value):
+    if is_dataclass(value):
+        return {k: to_jsonable(v) for k, v in asdict(value).items()}
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def restore_artifact(artifact_cls: type, data: dict):
+    """
+    Rebuild an artifact dataclass from its JSON form, converting Path fields back to Path
+    """
+    kwargs = {}
+    for f in fields(artifact_cls):
+        if f.name in data:
+            value = data[f.name]
+            kwargs[f.name] = Path(value) if f.type is Path and value is not None else value
+    return artifact_cls(**kwargs)
+
+
+def files_fingerprint(paths: list, hash_limit: int = 256*1024**2) -> str:
+    """
+    Fingerprint a set of files by content, or by size and mtime for files larger than hash_limit
+    Returns: str: SHA-256 hex digest, or None if a file is missing
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        path = Path(path)
+        if not path.is_file():
+            return None
+
+        stat = path.stat()
+        digest.update(f'{path}:{stat.st_size}'.encode())
+        if stat.st_size > hash_limit:
+            digest.update(str(stat.st_mtime_ns).encode())
+            continue
+
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+
+    return digest.hexdigest()
+
+
+@dataclass
+class Stage:
+    """
+    A pipeline stage.
+    config: builds the stage config from the artifacts of its dependencies
+    run: runs the stage on that config and returns its artifact
+    outputs: files that make up the artifact. Their content fingerprint is what downstream stages depend on;
+             stages without outputs pass on their input fingerprint
+    always_run: for stages whose inputs live outside the pipeline (e.g. remote data) and that are incremental themselves
+    """
+    name: str
+    artifact_cls: type
+    config: Callable
+    run: Callable
+    deps: list = field(default_factory = list)
+    outputs: Callable = None
+    always_run: bool = False
+
+
+class StageRunner:
+    """
+    Runs a DAG of stages, skipping those whose fingerprint (config values and upstream output fingerprints)
+    matches the last successful run. State is persisted after every stage, so a crashed run resumes from where
+    it stopped. Stages whose dependencies are done run concurrently.
+    With a fingerprint_dir, the output fingerprint of every stage is also written to <fingerprint_dir>/<stage>.fingerprint,
+    so external tools (dvc.yaml) can depend on exactly what invalidates downstream stages here.
+    """
+    def __init__(self, stages: list, state_file: Path, max_workers: int = 2, fingerprint_dir: Path = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_file = Path(state_file)
+        self.max_workers = max_workers
+        self.fingerprint_dir = Path(fingerprint_dir) if fingerprint_dir else None
+        self.state = self.load_state()
+        self.lock = threading.Lock()
+
+        for stage in stages:
+            unknown = [dep for dep in stage.deps if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages {unknown}")
+
+    def load_state(self) -> dict:
+        if not self.state_file.exists():
+            return {}
+
+        with open(self.state_file, 'r') as f:
+            return json.load(f)
+
+    def save_state(self):
+        self.state_file.parent.mkdir(parents = True, exist_ok = True)
+        tmp_path = self.state_file.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent = 4)
+        tmp_path.replace(self.state_file)
+
+    def write_fingerprint(self, name: str, fingerprint: str):
+        """
+        Write a stage's output fingerprint file, leaving it untouched if unchanged
+        """
+        if self.fingerprint_dir is None:
+            return
+        path = self.fingerprint_dir/f'{name}.fingerprint'
+        if path.exists() and path.read_text() == fingerprint:
+            return
+        path.parent.mkdir(parents = True, exist_ok = True)
+        path.write_text(fingerprint)
+
+    def downstream(self, names: set) -> set:
+        """
+        Returns: set: The given stages and every stage depending on them, directly or transitively
+        """
+        result = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for stage in self.stages.values():
+                if stage.name not in result and result.intersection(stage.deps):
+                    result.add(stage.name)
+                    changed = True
+        return result
+
+    def upstream(self, names: set) -> set:
+        result = set(names)
+        pending = list(names)
+        while pending:
+            for dep in self.stages[pending.pop()].deps:
+                if dep not in result:
+                    result.add(dep)
+                    pending.append(dep)
+        return result
+
+    def fingerprint(self, stage: Stage, config, upstream_fingerprints: dict) -> str:
+        payload = json.dumps({'stage': stage.name, 'config': to_jsonable(config), 'deps': upstream_fingerprints}, sort_keys = True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def output_fingerprint(self, stage: Stage, artifact, input_fingerprint: str) -> str:
+        if stage.outputs is None:
+            return input_fingerprint
+        return files_fingerprint(stage.outputs(artifact))
+
+    def prepare(self, stage: Stage, artifacts: dict, output_fingerprints: dict) -> tuple:
+        """
+        Returns: tuple: (config, input fingerprint, cached artifact or None if the stage has to run)
+        """
+        config = stage.config({dep: artifacts[dep] for dep in stage.deps})
+        fingerprint = self.fingerprint(stage, config, {dep: output_fingerprints[dep] for dep in stage.deps})
+
+        record = self.state.get(stage.name)
+        if stage.always_run or not record or record.get('status') != 'completed' or record.get('fingerprint') != fingerprint:
+            return config, fingerprint, None
+
+        artifact = restore_artifact(stage.artifact_cls, record['artifact'])
+        if self.output_fingerprint(stage, artifact, fingerprint) != record['output_fingerprint']:
+            logger.info(f"Outputs of stage {stage.name} changed or are missing. Re-running it")
+            return config, fingerprint, None
+
+        return config, fingerprint, artifact
+
+    def execute(self, stage: Stage, config, fingerprint: str):
+        start = time.perf_counter()
+        with self.lock:
+            self.state[stage.name] = {'status': 'running', 'fingerprint': fingerprint, 'started_at': time.time()}
+            self.save_state()
+
+        try:
+            artifact = stage.run(config)
+        except Exception as e:
+            with self.lock:
+                self.state[stage.name].update(status = 'failed', error = str(e))
+                self.save_state()
+            raise e
+
+        output_fingerprint = self.output_fingerprint(stage, artifact, fingerprint)
+        with self.lock:
+            self.state[stage.name] = {
+                'status': 'completed',
+                'fingerprint': fingerprint,
+                'output_fingerprint': output_fingerprint,
+                'artifact': to_jsonable(artifact),
+                'completed_at': time.time(),
+                'duration_s': time.perf_counter() - start
+            }
+            self.save_state()
+
+        logger.info(f"Stage {stage.name} completed in {time.perf_counter() - start:.1f}s")
+        return artifact, output_fingerprint
+
+    def run(self, force: bool = False, from_stage: str = None, only: list = None) -> dict:
+        """
+        Run the pipeline
+        force: re-run every selected stage
+        from_stage: re-run this stage and everything downstream of it
+        only: run just these stages; their dependencies must have completed before
+        Returns: dict: Artifact of every stage
+        """
+        unknown = [name for name in (only or []) + ([from_stage] if from_stage else []) if name not in self.stages]
+        if unknown:
+            raise ValueError(f"Unknown stages {unknown}. Available stages: {list(self.stages)}")
+
+        selected = set(only) if only else set(self.stages)
+        forced = set(selected) if force else self.downstream({from_stage}) if from_stage else set()
+        needed = self.upstream(selected)
+
+        artifacts, output_fingerprints = {}, {}
+        for name in needed - selected:
+            record = self.state.get(name)
+            if not record or record.get('status') != 'completed':
+                raise RuntimeError(f"Stage {name} is required by {sorted(selected)} but has not completed yet")
+            artifacts[name] = restore_artifact(self.stages[name].artifact_cls, record['artifact'])
+            output_fingerprints[name] = record['output_fingerprint']
+
+        pending = {name for name in needed if name not in artifacts}
+        running = {}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers = self.max_workers) as executor:
+            while pending or running:
+                ready = [name for name in sorted(pending) if all(dep in artifacts for dep in self.stages[name].deps)]
+                for name in ready:
+                    pending.discard(name)
+                    stage = self.stages[name]
+                    config, fingerprint, cached = self.prepare(stage, artifacts, output_fingerprints)
+                    if cached is not None and name not in forced:
+                        logger.info(f"Stage {name} is up to date. Skipping")
+                        artifacts[name] = cached
+                        output_fingerprints[name] = self.state[name]['output_fingerprint']
+                        self.write_fingerprint(name, output_fingerprints[name])
+                    else:
+                        # Run in a copy of the current context so the stage's spans nest under the pipeline span
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, self.execute, stage, config, fingerprint)] = name
+
+                if not running:
+                    if pending and not ready:
+                        raise RuntimeError(f"Stages {sorted(pending)} have circular dependencies")
+                    # Newly skipped stages may have unblocked others
+                    continue
+
+                done, _ = wait(running, return_when = FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        artifacts[name], output_fingerprints[name] = future.result()
+                        self.write_fingerprint(name, output_fingerprints[name])
+                    except Exception as e:
+                        logger.error(f"Stage {name} failed: {e}. Waiting for running stages before stopping")
+                        wait(running)
+                        for other, other_name in running.items():
+                            if other.exception() is None:
+                                artifacts[other_name], output_fingerprints[other_name] = other.result()
+                        raise e
+
+        logger.info(f"Pipeline finished in {time.perf_counter() - start:.1f}s")
+        return artifacts
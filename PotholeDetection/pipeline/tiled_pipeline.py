@@ -0,0 +1,180 @@
+import time
+from pathlib import Path
+import numpy as np
+from PotholeDetection.config_manager.component_config import TiledPredictionConfig
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.pipeline.predict_pipeline import Predictor, Detections, PreparedImage
+from PotholeDetection.utils.utils import load_image, box_iou, nms, weighted_box_fusion
+
+
+class TiledPredictor:
+    def __init__(self, predictor: Predictor, config: TiledPredictionConfig):
+        self.predictor = predictor
+        self.config = config
+
+    def tile_origins(self, length: int) -> list:
+        """
+        Returns: list: Start offsets of overlapping tiles covering a dimension of the given length
+        """
+        if length <= self.config.tile_size:
+            return [0]
+
+        stride = max(1, int(self.config.tile_size*(1 - self.config.tile_overlap)))
+        return list(range(0, length - self.config.tile_size, stride)) + [length - self.config.tile_size]
+
+    def select_tiles(self, shape: tuple, road_mask: np.ndarray = None) -> list:
+        """
+        Lay out the tiles of an image, skipping tiles entirely above the horizon or barely covering the road mask
+        Returns: list: (x, y) origins of the tiles to run
+        """
+        h, w = shape[:2]
+        horizon = int(h*self.config.horizon_fraction)
+        tiles = []
+        for y in self.tile_origins(h):
+            if y + self.config.tile_size <= horizon:
+                continue
+
+            for x in self.tile_origins(w):
+                if road_mask is not None:
+                    coverage = road_mask[y:y + self.config.tile_size, x:x + self.config.tile_size].mean()
+                    if coverage < self.config.min_mask_coverage:
+                        continue
+                tiles.append((x, y))
+
+        return tiles
+
+    def merge(self, boxes: np.ndarray, scores: np.ndarray, classes: np.ndarray) -> tuple:
+        """
+        Merge duplicate detections of objects cut by tile borders, per class, with NMS or weighted box fusion
+        Returns: tuple: (boxes, scores, classes) after merging
+        """
+        merged_boxes, merged_scores, merged_classes = [], [], []
+        for cls in np.unique(classes):
+            idx = np.flatnonzero(classes == cls)
+            if self.config.merge_method == 'wbf':
+                cls_boxes, cls_scores, _ = weighted_box_fusion(boxes[idx], scores[idx], self.config.merge_iou)
+            else:
+                keep = nms(boxes[idx], scores[idx], self.config.merge_iou)
+                cls_boxes, cls_scores = boxes[idx][keep], scores[idx][keep]
+
+            merged_boxes.append(cls_boxes)
+            merged_scores.append(cls_scores)
+            merged_classes.append(np.full(len(cls_boxes), cls, dtype = np.int32))
+
+        if not merged_boxes:
+            return np.empty((0, 4), dtype = np.float32), np.empty(0, dtype = np.float32), np.empty(0, dtype = np.int32)
+
+        return np.concatenate(merged_boxes), np.concatenate(merged_scores), np.concatenate(merged_classes)
+
+    def predict_image(self, source_id: str, source, road_mask: np.ndarray = None) -> Detections:
+        """
+        Run all selected tiles of an image (plus the downscaled full image, if enabled) as one batch
+        Returns: Detections: Merged detections in original image coordinates
+        """
+        submitted = time.perf_counter()
+        img = load_image(source)
+        tile_size = self.config.tile_size
+
+        batch, origins = [], []
+        for x, y in self.select_tiles(img.shape, road_mask):
+            tile = img[y:y + tile_size, x:x + tile_size]
+            if tile.shape[:2] == (tile_size, tile_size):
+                batch.append(PreparedImage(source_id, tile, 1.0, (0, 0), tile.shape[:2], submitted))
+            else:
+                batch.append(self.predictor.prepare(source_id, tile, submitted))
+            origins.append((x, y))
+
+        if self.config.full_image_pass:
+            batch.append(self.predictor.prepare(source_id, img, submitted))
+            origins.append((0, 0))
+
+        boxes, scores, classes = [], [], []
+        if batch:
+            for (x, y), detections in zip(origins, self.predictor.run_batch(batch)):
+                boxes.append(detections.boxes + np.array([x, y, x, y], dtype = np.float32))
+                scores.append(detections.scores)
+                classes.append(detections.classes)
+
+        if boxes:
+            boxes, scores, classes = self.merge(np.concatenate(boxes), np.concatenate(scores), np.concatenate(classes))
+        else:
+            boxes, scores, classes = np.empty((0, 4), dtype = np.float32), np.empty(0, dtype = np.float32), np.empty(0, dtype = np.int32)
+
+        return Detections(source_id, boxes, scores, classes, img.shape[:2], time.perf_counter() - submitted)
+
+    def predict(self, sources, road_mask: np.ndarray = None):
+        """
+        Stream tiled predictions for the given images
+        Yields: Detections for every image, in input order
+        """
+        try:
+            for source_id, source in self.predictor.iter_sources(sources):
+                yield self.predict_image(source_id, source, road_mask)
+
+        except Exception as e:
+            logger.error(f"Error during tiled prediction: {e}")
+            raise e
+
+    @staticmethod
+    def load_ground_truth(label_file: Path, shape: tuple) -> np.ndarray:
+        """
+        Returns: np.ndarray: YOLO label boxes converted to xyxy pixel coordinates
+        """
+        if not label_file.exists() or not label_file.read_text().strip():
+            return np.empty((0, 4), dtype = np.float32)
+
+        h, w = shape[:2]
+        xc, yc, bw, bh = np.loadtxt(label_file, ndmin = 2)[:, 1:5].T
+        return np.stack([(xc - bw/2)*w, (yc - bh/2)*h, (xc + bw/2)*w, (yc + bh/2)*h], axis = 1).astype(np.float32)
+
+    @staticmethod
+    def matched_ground_truth(pred_boxes: np.ndarray, gt_boxes: np.ndarray, iou_threshold: float) -> np.ndarray:
+        """
+        Returns: np.ndarray: Mask of the ground truth boxes matched by a prediction
+        """
+        matched = np.zeros(len(gt_boxes), dtype = bool)
+        if not len(pred_boxes) or not len(gt_boxes):
+            return matched
+
+        iou = box_iou(gt_boxes, pred_boxes)
+        pairs = np.argwhere(iou >= iou_threshold)
+        used_predictions = set()
+        for g, p in pairs[np.argsort(-iou[pairs[:, 0], pairs[:, 1]])]:
+            if not matched[g] and p not in used_predictions:
+                matched[g] = True
+                used_predictions.add(p)
+
+        return matched
+
+    def compare(self, image_files: list, labels_dir: Path, iou_threshold: float = 0.5, small_box_px: int = 64) -> dict:
+        """
+        Compare tiled against whole-image inference on labelled images
+        Returns: dict: Recall (overall and for boxes smaller than small_box_px) and latency of both modes
+        """
+        report = {}
+        modes = {
+            'whole_image': lambda source: next(iter(self.predictor.predict([source]))),
+            'tiled': lambda source: self.predict_image(str(source), source)
+        }
+
+        for mode, run in modes.items():
+            matched, small, latencies = [], [], []
+            for img_file in image_files:
+                start = time.perf_counter()
+                detections = run(img_file)
+                latencies.append(time.perf_counter() - start)
+
+                gt_boxes = self.load_ground_truth(Path(labels_dir)/(Path(img_file).stem + '.txt'), detections.orig_shape)
+                matched.append(self.matched_ground_truth(detections.boxes, gt_boxes, iou_threshold))
+                small.append(np.sqrt((gt_boxes[:, 2:] - gt_boxes[:, :2]).prod(axis = 1)) < small_box_px)
+
+            matched, small = np.concatenate(matched), np.concatenate(small)
+            report[mode] = {
+                'recall': float(matched.mean()) if len(matched) else 0.0,
+                'recall_small': float(matched[small].mean()) if small.any() else 0.0,
+                'mean_latency_ms': float(np.mean(latencies))*1000,
+                'p95_latency_ms': float(np.percentile(latencies, 95))*1000
+            }
+            logger.info(f"{mode}: {report[mode]}")
+
+        return report
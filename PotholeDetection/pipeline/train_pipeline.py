@@ -2,28 +2,191 @@ from pathlib import Path
 from dotenv import load_dotenv
 from PotholeDetection.config_manager.component_config import DataIngestionConfig, DataIngestionArtifact
 from PotholeDetection.config_manager.component_config import DataValidationConfig, DataValidationArtifact
+from PotholeDetection.config_manager.component_config import DatasetPackingConfig, DatasetPackingArtifact
+from PotholeDetection.config_manager.component_config import DatasetDedupConfig, DatasetDedupArtifact
+from PotholeDetection.config_manager.component_config import HyperparameterSearchConfig, HyperparameterSearchArtifact
 from PotholeDetection.config_manager.component_config import ModelTrainingConfig, ModelTrainingArtifact
+from PotholeDetection.config_manager.component_config import ModelEvaluationConfig, ModelEvaluationArtifact
 from PotholeDetection.components.data_ingestion import DataIngestion
 from PotholeDetection.components.data_validation import DataValidation
+from PotholeDetection.components.dataset_packing import DatasetPacker
+from PotholeDetection.components.dataset_dedup import DatasetDeduplicator
+from PotholeDetection.components.hyperparameter_search import HyperparameterSearch
 from PotholeDetection.components.train import ModelTrainer
+from PotholeDetection.components.evaluate import ModelEvaluator
+from PotholeDetection.constants.constants import USE_PACKED_DATASET, DEDUP_DATASET, TRAIN_ON_THINNED, HPARAM_SEARCH, INCREMENTAL_TRAINING, PIPELINE_STATE_FILE, PIPELINE_MAX_WORKERS, PIPELINE_FINGERPRINT_DIR, LOG_SPANS_TO_MLFLOW
+from PotholeDetection.logging.logger import logger, configure_logging
+from PotholeDetection.logging import instrumentation
+from PotholeDetection.logging.instrumentation import collect_records, configure_metrics, span, summary_table, log_to_mlflow
+from PotholeDetection.pipeline.stage_runner import Stage, StageRunner
 
-load_dotenv()
 
-ingestion_obj = DataIngestionConfig()
-data_ingestion = DataIngestion(ingestion_obj)
-ingestion_artifacts = data_ingestion.initiate_data_ingestion()
+def run_data_ingestion(config: DataIngestionConfig) -> DataIngestionArtifact:
+    return DataIngestion(config).initiate_data_ingestion()
 
-validation_obj = DataValidationConfig(dataset = ingestion_artifacts.dataset)
-data_validation = DataValidation(validation_obj)
-validation_artifacts = DataValidation.initiate_data_validation()
 
-if not validation_artifacts.validation_status:
-    raise Exception("Data Validation Failed. Stopping the pipeline.")
+def run_data_validation(config: DataValidationConfig) -> DataValidationArtifact:
+    validation_artifacts = DataValidation(config).initiate_data_validation()
+    if not validation_artifacts.validation_status:
+        raise Exception(f"Data Validation Failed. Stopping the pipeline. See {validation_artifacts.validation_report}")
+    return validation_artifacts
 
-training_object = ModelTrainingConfig(
-    dataset = ingestion_artifacts.dataset,
-    validation_status = validation_artifacts.validation_status
-)
 
-model_trainer = ModelTrainer(training_object)
-training_artifacts = model_trainer.initiate_model_training()
\ No newline at end of file
+def run_dataset_packing(config: DatasetPackingConfig) -> DatasetPackingArtifact:
+    return DatasetPacker(config).initiate_dataset_packing()
+
+
+def run_dataset_dedup(config: DatasetDedupConfig) -> DatasetDedupArtifact:
+    return DatasetDeduplicator(config).initiate_dataset_dedup()
+
+
+def run_hyperparameter_search(config: HyperparameterSearchConfig) -> HyperparameterSearchArtifact:
+    return HyperparameterSearch(config).initiate_hyperparameter_search()
+
+
+def run_model_training(config: ModelTrainingConfig) -> ModelTrainingArtifact:
+    return ModelTrainer(config).initiate_model_training()
+
+
+def run_model_evaluation(config: ModelEvaluationConfig) -> ModelEvaluationArtifact:
+    return ModelEvaluator(config).initiate_model_evaluation()
+
+
+def ingestion_outputs(artifact: DataIngestionArtifact) -> list:
+    """
+    The sync manifest (keys, sizes and ETags) identifies the dataset contents. Without it, the label and image files are used
+    """
+    if artifact.manifest is not None:
+        return [artifact.manifest]
+    return sorted(f for f in Path(artifact.dataset).rglob('*') if f.is_file())
+
+
+OPTIONAL_STAGES = ('dataset_packing', 'dataset_dedup', 'hyperparameter_search')
+
+
+def build_stages(incremental: bool = INCREMENTAL_TRAINING) -> list:
+    """
+    incremental: fine-tune the previous model on the newly ingested data instead of training from scratch
+    Returns: list: Stages of the training pipeline. Validation, packing and deduplication only depend on ingestion and run concurrently
+    """
+    training_deps = ['data_ingestion', 'data_validation'] + (['dataset_packing'] if USE_PACKED_DATASET else []) \
+        + (['dataset_dedup'] if DEDUP_DATASET and TRAIN_ON_THINNED else [])
+    stages = [
+        Stage(
+            name = 'data_ingestion',
+            artifact_cls = DataIngestionArtifact,
+            config = lambda deps: DataIngestionConfig(),
+            run = run_data_ingestion,
+            outputs = ingestion_outputs,
+            always_run = True
+        ),
+        Stage(
+            name = 'data_validation',
+            artifact_cls = DataValidationArtifact,
+            config = lambda deps: DataValidationConfig(dataset = deps['data_ingestion'].dataset),
+            run = run_data_validation,
+            deps = ['data_ingestion'],
+            outputs = lambda artifact: [artifact.validation_report]
+        ),
+        Stage(
+            name = 'model_training',
+            artifact_cls = ModelTrainingArtifact,
+            config = lambda deps: ModelTrainingConfig(
+                dataset = deps['data_ingestion'].dataset,
+                validation_status = deps['data_validation'].validation_status,
+                packed_dataset = deps['dataset_packing'].packed_dir if 'dataset_packing' in deps else None,
+                data_yaml = deps['dataset_dedup'].data_yaml if 'dataset_dedup' in deps else None,
+                manifest = deps['data_ingestion'].manifest,
+                incremental = incremental,
+                **(deps['hyperparameter_search'].best_params if 'hyperparameter_search' in deps else {})
+            ),
+            run = run_model_training,
+            deps = training_deps + (['hyperparameter_search'] if HPARAM_SEARCH else []),
+            outputs = lambda artifact: [artifact.best_model]
+        ),
+        Stage(
+            name = 'model_evaluation',
+            artifact_cls = ModelEvaluationArtifact,
+            config = lambda deps: ModelEvaluationConfig(
+                model_path = deps['model_training'].best_model,
+                dataset = deps['data_ingestion'].dataset
+            ),
+            run = run_model_evaluation,
+            deps = ['data_ingestion', 'model_training'],
+            outputs = lambda artifact: [artifact.evaluation_report]
+        )
+    ]
+
+    if USE_PACKED_DATASET:
+        stages.insert(2, Stage(
+            name = 'dataset_packing',
+            artifact_cls = DatasetPackingArtifact,
+            config = lambda deps: DatasetPackingConfig(dataset = deps['data_ingestion'].dataset),
+            run = run_dataset_packing,
+            deps = ['data_ingestion'],
+            # The shard indexes fingerprint the packed images and labels; the packing report also holds benchmark timings
+            outputs = lambda artifact: artifact.index_files
+        ))
+
+    if DEDUP_DATASET:
+        stages.insert(2, Stage(
+            name = 'dataset_dedup',
+            artifact_cls = DatasetDedupArtifact,
+            config = lambda deps: DatasetDedupConfig(dataset = deps['data_ingestion'].dataset),
+            run = run_dataset_dedup,
+            deps = ['data_ingestion'],
+            outputs = lambda artifact: [artifact.dedup_report, artifact.data_yaml]
+        ))
+
+    if HPARAM_SEARCH:
+        stages.insert(len(stages) - 2, Stage(
+            name = 'hyperparameter_search',
+            artifact_cls = HyperparameterSearchArtifact,
+            config = lambda deps: HyperparameterSearchConfig(
+                dataset = deps['data_ingestion'].dataset,
+                packed_dataset = deps['dataset_packing'].packed_dir if 'dataset_packing' in deps else None
+            ),
+            run = run_hyperparameter_search,
+            deps = training_deps,
+            outputs = lambda artifact: [artifact.search_report]
+        ))
+
+    return stages
+
+
+def run_training_pipeline(force: bool = False, from_stage: str = None, only: list = None, incremental: bool = INCREMENTAL_TRAINING) -> dict:
+    """
+    Run the training pipeline, skipping stages whose inputs did not change since their last successful run
+    Returns: dict: Artifact of every stage
+    """
+    load_dotenv()
+    runner = StageRunner(build_stages(incremental), PIPELINE_STATE_FILE, max_workers = PIPELINE_MAX_WORKERS, fingerprint_dir = PIPELINE_FINGERPRINT_DIR)
+
+    # Optional stages switched off in the constants are not part of the graph. dvc.yaml still lists them, so
+    # running one on its own only records that it is disabled
+    disabled = [name for name in only or [] if name in OPTIONAL_STAGES and name not in runner.stages]
+    for name in disabled:
+        logger.info(f"Stage {name} is disabled. Skipping")
+        runner.write_fingerprint(name, 'disabled')
+    if only and disabled:
+        only = [name for name in only if name not in disabled]
+        if not only:
+            return {}
+
+    with collect_records() as records:
+        try:
+            with span('pipeline'):
+                artifacts = runner.run(force = force, from_stage = from_stage, only = only)
+        finally:
+            logger.info(f"Stage timings (full records in {instrumentation.METRICS_FILE_PATH or 'memory only'}):\n{summary_table(records, max_depth = 2)}")
+            if LOG_SPANS_TO_MLFLOW:
+                log_to_mlflow(records)
+
+    logger.info(f"Training pipeline finished: {', '.join(artifacts)}")
+    return artifacts
+
+
+if __name__ == "__main__":
+    configure_logging()
+    configure_metrics()
+    run_training_pipeline()
@@ -0,0 +1,260 @@
+import time
+import queue
+import threading
+from dataclasses import dataclass
+import cv2
+import numpy as np
+from PotholeDetection.config_manager.component_config import VideoPredictionConfig
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.pipeline.predict_pipeline import Predictor
+from PotholeDetection.utils.utils import box_iou
+
+
+LIVE_SOURCE_PREFIXES = ('rtsp://', 'rtmp://', 'http://', 'https://', 'udp://', 'tcp://')
+
+
+@dataclass
+class PotholeEvent:
+    track_id: int
+    first_frame: int
+    last_frame: int
+    first_time: float
+    last_time: float
+    best_frame: int
+    best_box: np.ndarray
+    best_score: float
+    hits: int
+
+
+@dataclass
+class Track:
+    track_id: int
+    box: np.ndarray
+    velocity: np.ndarray
+    last_frame: int
+    event: PotholeEvent
+    missed: bool = False
+
+    def predicted_box(self, frame_index: int) -> np.ndarray:
+        return self.box + self.velocity*(frame_index - self.last_frame)
+
+
+class IoUTracker:
+    """
+    Lightweight tracker for keyframe detections. Boxes are carried across the frames between keyframes
+    with a constant-velocity model and associated to new detections by greedy IoU matching.
+    """
+    def __init__(self, iou_threshold: float, max_age: int, min_hits: int):
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.tracks = []
+        self.next_id = 0
+
+    def predict(self, frame_index: int) -> tuple:
+        """
+        Returns: tuple: (predicted xyxy boxes, track ids) of the active tracks at the given frame
+        """
+        if not self.tracks:
+            return np.empty((0, 4), dtype = np.float32), []
+
+        return np.stack([track.predicted_box(frame_index) for track in self.tracks]), [track.track_id for track in self.tracks]
+
+    def match(self, predicted: np.ndarray, boxes: np.ndarray) -> list:
+        if not len(predicted) or not len(boxes):
+            return []
+
+        iou = box_iou(predicted, boxes)
+        pairs = np.argwhere(iou >= self.iou_threshold)
+        pairs = pairs[np.argsort(-iou[pairs[:, 0], pairs[:, 1]])]
+
+        matches, used_tracks, used_boxes = [], set(), set()
+        for t, d in pairs:
+            if t not in used_tracks and d not in used_boxes:
+                matches.append((t, d))
+                used_tracks.add(t)
+                used_boxes.add(d)
+
+        return matches
+
+    def update(self, frame_index: int, timestamp: float, boxes: np.ndarray, scores: np.ndarray) -> tuple:
+        """
+        Associate keyframe detections with the active tracks
+        Returns: tuple: (finished pothole events, whether the scene changed, i.e. tracks were started or lost)
+        """
+        predicted, _ = self.predict(frame_index)
+        matches = self.match(predicted, boxes)
+        matched_boxes = {d for _, d in matches}
+        matched_tracks = {t for t, _ in matches}
+
+        # A track counts as lost only on the keyframe it first misses, not on every keyframe until it is retired
+        lost = 0
+        for t, track in enumerate(self.tracks):
+            if t not in matched_tracks:
+                lost += not track.missed
+                track.missed = True
+
+        for t, d in matches:
+            track = self.tracks[t]
+            track.missed = False
+            elapsed = frame_index - track.last_frame
+            track.velocity = 0.5*track.velocity + 0.5*(boxes[d] - track.box)/max(elapsed, 1)
+            track.box, track.last_frame = boxes[d], frame_index
+
+            event = track.event
+            event.last_frame, event.last_time, event.hits = frame_index, timestamp, event.hits + 1
+            if scores[d] > event.best_score:
+                event.best_frame, event.best_box, event.best_score = frame_index, boxes[d], float(scores[d])
+
+        for d in range(len(boxes)):
+            if d not in matched_boxes:
+                event = PotholeEvent(self.next_id, frame_index, frame_index, timestamp, timestamp, frame_index, boxes[d], float(scores[d]), 1)
+                self.tracks.append(Track(self.next_id, boxes[d], np.zeros(4, dtype = np.float32), frame_index, event))
+                self.next_id += 1
+
+        finished = [track for track in self.tracks if frame_index - track.last_frame > self.max_age]
+        self.tracks = [track for track in self.tracks if frame_index - track.last_frame <= self.max_age]
+
+        scene_changed = lost > 0 or len(boxes) > len(matched_boxes)
+        return [track.event for track in finished if track.event.hits >= self.min_hits], scene_changed
+
+    def flush(self) -> list:
+        """
+        Returns: list: Events of all remaining tracks at the end of the stream
+        """
+        events = [track.event for track in self.tracks if track.event.hits >= self.min_hits]
+        self.tracks = []
+        return events
+
+
+class FrameReader(threading.Thread):
+    """
+    Reads frames from a video file or live stream into a bounded queue. File sources block when the queue is
+    full; live sources drop the oldest frame instead, so the consumer always works on recent frames.
+    """
+    def __init__(self, source, queue_size: int):
+        super().__init__(daemon = True)
+        self.source = source
+        self.live = isinstance(source, int) or str(source).lower().startswith(LIVE_SOURCE_PREFIXES)
+        self.frames = queue.Queue(maxsize = queue_size)
+        self.stopped = threading.Event()
+        self.dropped = 0
+        self.fps = None
+
+    def put(self, item):
+        if not self.live:
+            self.frames.put(item)
+            return
+
+        while True:
+            try:
+                self.frames.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.frames.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def run(self):
+        capture = cv2.VideoCapture(self.source)
+        try:
+            if not capture.isOpened():
+                logger.error(f"Unable to open video source: {self.source}")
+                return
+
+            self.fps = capture.get(cv2.CAP_PROP_FPS) or None
+            frame_index = 0
+            while not self.stopped.is_set():
+                ok, frame = capture.read()
+                if not ok:
+                    break
+
+                timestamp = time.time() if self.live else capture.get(cv2.CAP_PROP_POS_MSEC)/1000
+                self.put((frame_index, timestamp, frame))
+                frame_index += 1
+
+        finally:
+            capture.release()
+            self.put(None)
+
+    def stop(self):
+        self.stopped.set()
+        while not self.frames.empty():
+            try:
+                self.frames.get_nowait()
+            except queue.Empty:
+                break
+
+
+class VideoPredictor:
+    def __init__(self, predictor: Predictor, config: VideoPredictionConfig):
+        self.predictor = predictor
+        self.config = config
+        self.report = {}
+
+    def detect(self, frame_index: int, frame: np.ndarray):
+        prepared = self.predictor.prepare(str(frame_index), frame, time.perf_counter())
+        return self.predictor.run_batch([prepared])[0]
+
+    def process(self, source, on_frame = None):
+        """
+        Run the detector on adaptive keyframes of a video file or stream and track potholes in between.
+        The keyframe interval doubles while the scene is stable, up to max_keyframe_interval, and drops back
+        to min_keyframe_interval as soon as a track starts or is lost.
+        on_frame, if given, is called with (frame_index, frame, boxes, track_ids) for every frame
+        Yields: PotholeEvent once per tracked pothole, when it leaves the scene or the stream ends
+        """
+        reader = FrameReader(source, self.config.frame_queue_size)
+        tracker = IoUTracker(self.config.iou_threshold, self.config.max_age, self.config.min_hits)
+        interval = self.config.min_keyframe_interval
+        next_keyframe, frames_read, frames_inferred, events = 0, 0, 0, 0
+
+        logger.info(f"Video inference started on {source}")
+        start = time.perf_counter()
+        reader.start()
+        try:
+            while True:
+                item = reader.frames.get()
+                if item is None:
+                    break
+
+                frame_index, timestamp, frame = item
+                frames_read += 1
+
+                if frame_index >= next_keyframe:
+                    detections = self.detect(frame_index, frame)
+                    finished, scene_changed = tracker.update(frame_index, timestamp, detections.boxes, detections.scores)
+                    frames_inferred += 1
+
+                    interval = self.config.min_keyframe_interval if scene_changed else min(2*interval, self.config.max_keyframe_interval)
+                    next_keyframe = frame_index + interval
+
+                    events += len(finished)
+                    yield from finished
+
+                if on_frame is not None:
+                    on_frame(frame_index, frame, *tracker.predict(frame_index))
+
+            remaining = tracker.flush()
+            events += len(remaining)
+            yield from remaining
+
+        except Exception as e:
+            logger.error(f"Error during video inference: {e}")
+            raise e
+
+        finally:
+            reader.stop()
+            elapsed = time.perf_counter() - start
+            self.report = {
+                'frames_read': frames_read,
+                'frames_inferred': frames_inferred,
+                'inferred_fraction': frames_inferred/frames_read if frames_read else 0.0,
+                'dropped_frames': reader.dropped,
+                'source_fps': reader.fps,
+                'effective_fps': frames_read/elapsed if elapsed > 0 else 0.0,
+                'events': events
+            }
+            logger.info(f"Video inference finished: {self.report}")
@@ -0,0 +1,161 @@
+import json
+import time
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from PotholeDetection.config_manager.component_config import ArtifactPublisherConfig
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.utils.utils import file_sha256
+
+
+def expand_artifacts(artifacts: dict) -> dict:
+    """
+    Expand directory artifacts (e.g. OpenVINO model folders) into one entry per file
+    Returns: dict: Release file name -> local file
+    """
+    files = {}
+    for name, path in artifacts.items():
+        path = Path(path)
+        if path.is_dir():
+            for f in sorted(p for p in path.rglob('*') if p.is_file()):
+                files[f'{name}/{f.relative_to(path).as_posix()}'] = f
+        elif path.is_file():
+            files[name] = path
+        else:
+            logger.warning(f"Artifact {name} not found at {path}. Not publishing it")
+    return files
+
+
+class ArtifactPublisher:
+    """
+    Publishes a set of local artifacts as an immutable release:
+
+    <release_prefix>blobs/<sha256><suffix>      file contents, content-addressed, uploaded only if missing
+    <release_prefix>manifests/<version>.json    file name -> blob key, SHA-256 and size
+    <release_prefix>latest.json                 the current manifest, replaced in a single PUT
+
+    Blobs are uploaded before the manifest and the manifest before latest.json, so a consumer reading
+    latest.json always finds a complete release. Large files use concurrent multipart transfers and several
+    files are uploaded in parallel.
+    """
+    def __init__(self, config: ArtifactPublisherConfig):
+        self.config = config
+        self.s3 = boto3.client('s3')
+        self.transfer_config = TransferConfig(
+            multipart_threshold = self.config.multipart_threshold,
+            multipart_chunksize = self.config.multipart_chunksize,
+            max_concurrency = self.config.max_concurrency,
+            use_threads = True
+        )
+
+    def remote_sha256(self, key: str):
+        """
+        Returns: str: SHA-256 recorded in the object's metadata, or None if the object does not exist
+        """
+        try:
+            return self.s3.head_object(Bucket = self.config.s3_bucket, Key = key).get('Metadata', {}).get('sha256')
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise e
+
+    def upload_file(self, local_file: Path, key: str, sha256: str) -> bool:
+        """
+        Upload a file unless the remote object already carries the same checksum
+        Returns: bool: True if the file was uploaded, False if it was unchanged
+        """
+        if self.remote_sha256(key) == sha256:
+            return False
+
+        self.s3.upload_file(
+            Filename = str(local_file),
+            Bucket = self.config.s3_bucket,
+            Key = key,
+            ExtraArgs = {'Metadata': {'sha256': sha256}, 'ChecksumAlgorithm': 'SHA256'},
+            Config = self.transfer_config
+        )
+        return True
+
+    def put_json(self, key: str, content: dict):
+        body = json.dumps(content, indent = 4).encode()
+        self.s3.put_object(
+            Bucket = self.config.s3_bucket,
+            Key = key,
+            Body = body,
+            ContentType = 'application/json',
+            Metadata = {'sha256': hashlib.sha256(body).hexdigest()}
+        )
+
+    def latest_manifest(self):
+        try:
+            response = self.s3.get_object(Bucket = self.config.s3_bucket, Key = self.config.release_prefix + 'latest.json')
+            return json.loads(response['Body'].read())
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise e
+
+    def publish(self, artifacts: dict, aliases: dict = None) -> dict:
+        """
+        Publish artifacts as a new release if any of them changed since the latest release
+        aliases: release file name -> fixed S3 key that should also hold the file (e.g. S3_Model_Key for best.pt).
+                 Aliases are refreshed with a server-side copy of the blob, only when their checksum differs
+        Returns: dict: Release manifest, with upload statistics
+        """
+        try:
+            start = time.perf_counter()
+            files = expand_artifacts(artifacts)
+            with ThreadPoolExecutor(max_workers = self.config.max_workers) as executor:
+                checksums = dict(zip(files, executor.map(file_sha256, files.values())))
+
+                entries = {
+                    name: {
+                        'key': f"{self.config.release_prefix}blobs/{checksums[name]}{path.suffix}",
+                        'sha256': checksums[name],
+                        'size': path.stat().st_size
+                    } for name, path in files.items()
+                }
+                uploaded = list(executor.map(lambda name: self.upload_file(files[name], entries[name]['key'], checksums[name]), files))
+
+            files_uploaded = sum(uploaded)
+            bytes_uploaded = sum(entries[name]['size'] for name, done in zip(files, uploaded) if done)
+
+            for name, alias_key in (aliases or {}).items():
+                if name in entries and self.remote_sha256(alias_key) != entries[name]['sha256']:
+                    self.s3.copy(
+                        CopySource = {'Bucket': self.config.s3_bucket, 'Key': entries[name]['key']},
+                        Bucket = self.config.s3_bucket,
+                        Key = alias_key,
+                        ExtraArgs = {'Metadata': {'sha256': entries[name]['sha256']}, 'MetadataDirective': 'REPLACE'},
+                        Config = self.transfer_config
+                    )
+                    logger.info(f"Updated s3://{self.config.s3_bucket}/{alias_key} to {name} ({entries[name]['sha256'][:12]})")
+
+            latest = self.latest_manifest()
+            if latest is not None and latest['files'] == entries:
+                logger.info(f"All {len(entries)} artifacts unchanged since release {latest['version']}. Nothing to publish")
+                return dict(latest, files_uploaded = files_uploaded, bytes_uploaded = bytes_uploaded)
+
+            content_hash = hashlib.sha256(json.dumps(entries, sort_keys = True).encode()).hexdigest()
+            version = f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{content_hash[:8]}"
+            manifest = {
+                'version': version,
+                'created_at': time.time(),
+                'bucket': self.config.s3_bucket,
+                'previous_version': latest['version'] if latest else None,
+                'files': entries
+            }
+            self.put_json(f'{self.config.release_prefix}manifests/{version}.json', manifest)
+            self.put_json(f'{self.config.release_prefix}latest.json', manifest)
+
+            elapsed = time.perf_counter() - start
+            logger.info(f"Published release {version}: {files_uploaded}/{len(entries)} files uploaded "
+                        f"({bytes_uploaded/1e6:.1f} MB in {elapsed:.1f}s), {len(entries) - files_uploaded} unchanged")
+            return dict(manifest, files_uploaded = files_uploaded, bytes_uploaded = bytes_uploaded)
+
+        except Exception as e:
+            logger.error(f"Error publishing artifacts to s3://{self.config.s3_bucket}/{self.config.release_prefix}: {e}")
+            raise e
@@ -0,0 +1,168 @@
+import os
+from pathlib import Path
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.logging.instrumentation import current_span, span
+from PotholeDetection.utils.label_loader import LabelArray, parse_labels
+from PotholeDetection.utils.pairing_index import PairingIndex
+
+
+@dataclass
+class SplitIndex:
+    split: str
+    image_files: list = field(default_factory = list)
+    label_files: list = field(default_factory = list)
+    image_results: dict = field(default_factory = dict)
+    label_results: dict = field(default_factory = dict)
+    labels: LabelArray = None
+    pairs: PairingIndex = None
+
+
+def verify_images(image_paths: list) -> list:
+    """
+    Decode and verify a chunk of images. Runs inside a worker process
+    Returns: list: (path, is_valid, error message) for every image in the chunk
+    """
+    results = []
+    for img_path in image_paths:
+        try:
+            with Image.open(img_path) as img:
+                img.verify()
+            results.append((img_path, True, None))
+        except Exception as e:
+            results.append((img_path, False, str(e)))
+
+    return results
+
+
+class DatasetScanner:
+    def __init__(self, dataset: Path, data_split: list, supported_img_ext: list, num_workers: int = None, chunk_size: int = 256, cache = None):
+        self.dataset = dataset
+        self.cache = cache
+        self.data_split = data_split
+        self.supported_img_ext = supported_img_ext
+        self.num_workers = num_workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.executor = None
+
+    def walk_split(self, split: str) -> SplitIndex:
+        """
+        Walk a split directory once and index its image and label files
+        Returns: SplitIndex: Index with the image and label files of the split
+        """
+        index = SplitIndex(split = split)
+        split_path = self.dataset/split
+
+        for subdir, target in (('images', index.image_files), ('labels', index.label_files)):
+            for root, _, files in os.walk(split_path/subdir):
+                for file_name in files:
+                    if subdir == 'labels' and not file_name.endswith('.txt'):
+                        continue
+                    target.append(Path(root)/file_name)
+
+        return index
+
+    def chunks(self, items: list) -> list:
+        return [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+
+    def run_chunked(self, func, items: list):
+        """
+        Run a chunk worker over the items, inline when the work does not justify a process pool
+        Yields: list: Worker results of each chunk, in order, as soon as the chunk is done
+        """
+        chunks = self.chunks([str(item) for item in items])
+        if self.num_workers <= 1 or len(chunks) <= 1:
+            yield from map(func, chunks)
+            return
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers = self.num_workers)
+
+        yield from self.executor.map(func, chunks)
+
+    def run_cached(self, func, items: list, kind: str, on_results = None) -> dict:
+        """
+        Run a chunk worker only over the files without an up-to-date cached verdict
+        on_results: called with every batch of verdicts ({path: verdict}) as it becomes available. An exception
+                    raised by it stops the run; the fresh verdicts computed so far are still cached
+        Returns: dict: Mapping of file path to its (cached or fresh) verdict
+        """
+        results, pending = {}, []
+        if self.cache is None:
+            pending = list(items)
+        else:
+            for item in items:
+                cached = self.cache.lookup(item, kind)
+                if cached is None:
+                    pending.append(item)
+                else:
+                    results[item] = tuple(cached)
+
+            parent = current_span.get()
+            if parent is not None:
+                parent.count(0, cache_hits = len(results), cache_misses = len(pending))
+
+        if on_results is not None and results:
+            on_results(results)
+
+        fresh = {}
+        try:
+            for chunk_results in self.run_chunked(func, pending):
+                chunk = {Path(path): tuple(result) for path, *result in chunk_results}
+                fresh.update(chunk)
+                if on_results is not None:
+                    on_results(chunk)
+        finally:
+            if self.cache is not None:
+                self.cache.store(kind, fresh)
+
+        results.update(fresh)
+        return results
+
+    def scan_split(self, index: SplitIndex, on_image_results = None) -> SplitIndex:
+        """
+        Verify the images and parse the labels of a walked split across the process pool
+        on_image_results: called with every chunk of image verdicts as soon as it is verified
+        Returns: SplitIndex: The index, with verdicts, label array and pairing index filled in
+        """
+        images = [f for f in index.image_files if f.suffix.lower() in self.supported_img_ext]
+        with span(f'verify_images_{index.split}', workers = self.num_workers) as verify_span:
+            index.image_results = self.run_cached(verify_images, images, 'image', on_image_results)
+            verify_span.count(len(images))
+        with span(f'parse_labels_{index.split}', workers = self.num_workers) as parse_span:
+            index.label_results = self.run_cached(parse_labels, index.label_files, 'label')
+            parse_span.count(len(index.label_files))
+        index.labels = LabelArray.from_results(index.label_results)
+        index.pairs = PairingIndex.from_split(self.dataset/index.split, index)
+        logger.info(f"Scanned split '{index.split}': {len(index.image_files)} images, {len(index.label_files)} labels")
+        return index
+
+    def iter_splits(self, on_walk = None, on_image_results = None):
+        """
+        Scan the splits one at a time, so callers can validate a split (and stop) before the next one is read
+        on_walk: called with every SplitIndex right after its directory walk, before any file is opened
+        on_image_results: called with the split name and every chunk of image verdicts
+        Yields: SplitIndex: Fully scanned index of each split
+        """
+        logger.info(f"Scanning dataset at {self.dataset} with {self.num_workers} workers")
+        try:
+            for split in self.data_split:
+                index = self.walk_split(split)
+                if on_walk is not None:
+                    on_walk(index)
+                callback = (lambda results, split = split: on_image_results(split, results)) if on_image_results else None
+                yield self.scan_split(index, callback)
+
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures = True)
+                self.executor = None
+
+    def scan(self) -> dict:
+        """
+        Index every split and verify its images and labels across a process pool
+        Returns: dict: Mapping of split name to its SplitIndex
+        """
+        return {index.split: index for index in self.iter_splits()}
@@ -0,0 +1,257 @@
+import uuid
+import time
+import datetime
+from pathlib import Path
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from PotholeDetection.config_manager.component_config import DetectionSinkConfig
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.logging.instrumentation import span
+
+
+SCHEMA = pa.schema([
+    ('image_id', pa.dictionary(pa.int32(), pa.string())),
+    ('class_id', pa.int16()),
+    ('conf', pa.float32()),
+    ('x1', pa.float32()),
+    ('y1', pa.float32()),
+    ('x2', pa.float32()),
+    ('y2', pa.float32())
+])
+
+
+class PartitionBuffer:
+    """
+    Detections of one partition waiting for the next row group: image ids are kept once per image
+    (the dictionary of the row group's image_id column), detections as column arrays
+    """
+    def __init__(self):
+        self.images = []
+        self.image_index = []
+        self.classes = []
+        self.scores = []
+        self.boxes = []
+        self.rows = 0
+
+    def append(self, image_id: str, boxes: np.ndarray, scores: np.ndarray, classes: np.ndarray):
+        self.image_index.append(np.full(len(boxes), len(self.images), dtype = np.int32))
+        self.images.append(image_id)
+        self.boxes.append(np.asarray(boxes, dtype = np.float32).reshape(-1, 4))
+        self.scores.append(np.asarray(scores, dtype = np.float32))
+        self.classes.append(np.asarray(classes, dtype = np.int16))
+        self.rows += len(boxes)
+
+    def append_bulk(self, image_ids: np.ndarray, boxes: np.ndarray, scores: np.ndarray, classes: np.ndarray):
+        names, index = np.unique(np.asarray(image_ids), return_inverse = True)
+        self.image_index.append(index.astype(np.int32) + len(self.images))
+        self.images.extend(str(name) for name in names)
+        self.boxes.append(np.asarray(boxes, dtype = np.float32).reshape(-1, 4))
+        self.scores.append(np.asarray(scores, dtype = np.float32))
+        self.classes.append(np.asarray(classes, dtype = np.int16))
+        self.rows += len(boxes)
+
+    def to_table(self) -> pa.Table:
+        boxes = np.concatenate(self.boxes) if self.boxes else np.empty((0, 4), dtype = np.float32)
+        return pa.Table.from_arrays([
+            pa.DictionaryArray.from_arrays(
+                pa.array(np.concatenate(self.image_index) if self.image_index else np.empty(0, dtype = np.int32)),
+                pa.array(self.images, type = pa.string())
+            ),
+            pa.array(np.concatenate(self.classes) if self.classes else np.empty(0, dtype = np.int16)),
+            pa.array(np.concatenate(self.scores) if self.scores else np.empty(0, dtype = np.float32)),
+            *(pa.array(np.ascontiguousarray(boxes[:, i])) for i in range(4))
+        ], schema = SCHEMA)
+
+
+class DetectionWriter:
+    """
+    Buffered columnar sink for detections. Rows are collected per partition (e.g. date=2026-10-18) as column
+    arrays and written as one Parquet row group once row_group_size rows are buffered, so memory stays flat
+    however many detections flow through, and a million detections are a handful of bulk writes.
+    Every writer writes its own part file per partition: <output_dir>/<key>=<value>/part-<uuid>.parquet
+    """
+    def __init__(self, config: DetectionSinkConfig):
+        self.config = config
+        self.buffers = {}
+        self.writers = {}
+        self.files = []
+        self.rows_written = 0
+        self.images_written = 0
+        self.write_id = uuid.uuid4().hex[:12]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def partition_key(self, partition: dict) -> tuple:
+        partition = dict(partition or {})
+        if 'date' in self.config.partition_by and 'date' not in partition:
+            partition['date'] = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d')
+        missing = [key for key in self.config.partition_by if key not in partition]
+        if missing:
+            raise ValueError(f"Missing partition values for {missing}")
+        return tuple((key, str(partition[key])) for key in self.config.partition_by)
+
+    def buffer(self, partition: dict) -> tuple:
+        key = self.partition_key(partition)
+        if key not in self.buffers:
+            self.buffers[key] = PartitionBuffer()
+        return key, self.buffers[key]
+
+    def write(self, detections, partition: dict = None):
+        """
+        Add the Detections of one image from the Predictor
+        """
+        key, buffer = self.buffer(partition)
+        buffer.append(str(detections.source), detections.boxes, detections.scores, detections.classes)
+        self.images_written += 1
+        self.maybe_flush(key, buffer)
+
+    def write_result(self, result, image_id: str = None, partition: dict = None):
+        """
+        Add an ultralytics Results object, keeping only its box, confidence and class tensors
+        """
+        key, buffer = self.buffer(partition)
+        boxes = result.boxes
+        buffer.append(image_id or str(result.path), boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(), boxes.cls.cpu().numpy())
+        self.images_written += 1
+        self.maybe_flush(key, buffer)
+
+    def write_batch(self, image_ids: np.ndarray, boxes: np.ndarray, scores: np.ndarray, classes: np.ndarray, partition: dict = None):
+        """
+        Add many detections at once as flat arrays (one image id per detection)
+        """
+        for start in range(0, len(boxes), self.config.row_group_size):
+            stop = start + self.config.row_group_size
+            key, buffer = self.buffer(partition)
+            buffer.append_bulk(image_ids[start:stop], boxes[start:stop], scores[start:stop], classes[start:stop])
+            self.maybe_flush(key, buffer)
+
+    def maybe_flush(self, key: tuple, buffer: PartitionBuffer):
+        if buffer.rows >= self.config.row_group_size:
+            self.flush_partition(key)
+        elif sum(b.rows for b in self.buffers.values()) >= self.config.max_buffered_rows:
+            self.flush_partition(max(self.buffers, key = lambda k: self.buffers[k].rows))
+
+    def flush_partition(self, key: tuple):
+        buffer = self.buffers.pop(key)
+        if not buffer.rows:
+            return
+
+        if key not in self.writers:
+            part_dir = Path(self.config.output_dir).joinpath(*(f'{k}={v}' for k, v in key))
+            part_dir.mkdir(parents = True, exist_ok = True)
+            path = part_dir/f'part-{self.write_id}.parquet'
+            self.writers[key] = pq.ParquetWriter(path, SCHEMA, compression = self.config.compression)
+            self.files.append(path)
+
+        self.writers[key].write_table(buffer.to_table(), row_group_size = buffer.rows)
+        self.rows_written += buffer.rows
+
+    def flush(self):
+        for key in list(self.buffers):
+            self.flush_partition(key)
+
+    def close(self) -> dict:
+        """
+        Flush the remaining rows and finalize every part file
+        Returns: dict: Rows and images written and the part files
+        """
+        self.flush()
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+        return {'rows': self.rows_written, 'images': self.images_written, 'files': [str(f) for f in self.files]}
+
+
+class DetectionReader:
+    """
+    Reads a partitioned detection store back as Arrow tables or flat NumPy columns. Part files are
+    memory-mapped and only the requested columns and partitions are read
+    """
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def table(self, columns: list = None, filters = None) -> pa.Table:
+        """
+        filters: pyarrow filters on partition keys or columns, e.g. [('date', '=', '2026-10-18'), ('conf', '>=', 0.5)]
+        Returns: pa.Table: Detections of the store, with the partition keys as columns
+        """
+        return pq.read_table(self.root, columns = columns, filters = filters, memory_map = True, partitioning = 'hive')
+
+    def to_numpy(self, filters = None) -> dict:
+        """
+        Returns: dict: image_id, class_id and conf columns and an (N, 4) xyxy boxes array
+        """
+        table = self.table(columns = list(SCHEMA.names), filters = filters)
+        image_ids = table.column('image_id').combine_chunks()
+        return {
+            'image_id': (image_ids.dictionary.to_numpy(zero_copy_only = False)[image_ids.indices.to_numpy()]
+                         if isinstance(image_ids, pa.DictionaryArray) else image_ids.to_numpy(zero_copy_only = False)),
+            'class_id': table.column('class_id').to_numpy(),
+            'conf': table.column('conf').to_numpy(),
+            'boxes': np.stack([table.column(c).to_numpy() for c in ('x1', 'y1', 'x2', 'y2')], axis = 1)
+        }
+
+    def predictions(self, image_files: list, filters = None) -> dict:
+        """
+        Gather the detections of the given images in the flat format used by ModelEvaluator (image_idx refers to image_files)
+        Returns: dict: images, image_idx, boxes, scores and classes arrays, grouped by image
+        """
+        columns = self.to_numpy(filters)
+        position = {str(f): i for i, f in enumerate(image_files)}
+        image_idx = np.array([position.get(str(i), -1) for i in columns['image_id']], dtype = np.int32)
+        keep = np.flatnonzero(image_idx >= 0)
+        order = keep[np.argsort(image_idx[keep], kind = 'stable')]
+        return {
+            'images': np.array([Path(f).name for f in image_files]),
+            'image_idx': image_idx[order],
+            'boxes': columns['boxes'][order],
+            'scores': columns['conf'][order],
+            'classes': columns['class_id'][order].astype(np.int32)
+        }
+
+
+def benchmark_sink(config: DetectionSinkConfig, num_detections: int = 1000000, detections_per_image: int = 4) -> dict:
+    """
+    Write synthetic detections image by image through the buffered writer, then read them back
+    Returns: dict: Write and read seconds, peak RSS growth and bytes on disk
+    """
+    from PotholeDetection.pipeline.predict_pipeline import Detections
+
+    rng = np.random.default_rng(0)
+    num_images = num_detections//detections_per_image
+    xy = rng.uniform(0, 1800, (detections_per_image, 2)).astype(np.float32)
+    boxes = np.concatenate([xy, xy + rng.uniform(10, 200, (detections_per_image, 2)).astype(np.float32)], axis = 1)
+    scores = rng.uniform(0.25, 1.0, detections_per_image).astype(np.float32)
+    classes = np.zeros(detections_per_image, dtype = np.int32)
+
+    with span('write_detections') as write_span:
+        start = time.perf_counter()
+        with DetectionWriter(config) as writer:
+            for i in range(num_images):
+                writer.write(Detections(f'vehicle_{i % 500}/frame_{i:08d}.jpg', boxes, scores, classes, (1080, 1920), 0.0))
+        write_s = time.perf_counter() - start
+        write_span.count(writer.rows_written)
+
+    with span('read_detections') as read_span:
+        start = time.perf_counter()
+        columns = DetectionReader(config.output_dir).to_numpy()
+        read_s = time.perf_counter() - start
+        read_span.count(len(columns['conf']))
+
+    report = {
+        'detections': writer.rows_written,
+        'images': writer.images_written,
+        'write_s': write_s,
+        'write_detections_per_sec': writer.rows_written/write_s,
+        'write_peak_rss_growth_mb': (write_span.peak_rss - write_span.start_rss)/1024**2,
+        'read_s': read_s,
+        'bytes_on_disk': sum(f.stat().st_size for f in Path(config.output_dir).rglob('*.parquet'))
+    }
+    logger.info(f"Detection sink benchmark: {report}")
+    return report
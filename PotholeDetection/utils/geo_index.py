@@ -0,0 +1,150 @@
+import math
+import heapq
+
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = math.pi*EARTH_RADIUS_M/180
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Returns: float: Great-circle distance in meters
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((phi2 - phi1)/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(math.radians(lon2 - lon1)/2)**2
+    return 2*EARTH_RADIUS_M*math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    """
+    Uniform lat/lon grid of cell_m sized cells (in latitude; cells narrow in longitude towards the poles), stored
+    sparsely in a dict. Indexed items expose lat and lon attributes. A radius query only visits the cells the radius
+    can reach, a bounding box the cells it overlaps and a nearest query grows square rings of cells around the point
+    until no unvisited cell can hold anything closer, so queries cost the same over thousands or millions of items
+    """
+    def __init__(self, cell_m: float):
+        self.cell_deg = cell_m/METERS_PER_DEGREE
+        self.cells = {}
+        self.size = 0
+        # Bounding cell rows and columns ever occupied, so nearest() knows when the rings have covered everything
+        self.bounds = None
+
+    def __len__(self):
+        return self.size
+
+    def cell(self, lat: float, lon: float) -> tuple:
+        return math.floor(lat/self.cell_deg), math.floor(lon/self.cell_deg)
+
+    def insert(self, item):
+        key = self.cell(item.lat, item.lon)
+        self.cells.setdefault(key, []).append(item)
+        self.size += 1
+        if self.bounds is None:
+            self.bounds = [key[0], key[0], key[1], key[1]]
+        else:
+            self.bounds = [min(self.bounds[0], key[0]), max(self.bounds[1], key[0]), min(self.bounds[2], key[1]), max(self.bounds[3], key[1])]
+
+    def remove(self, item):
+        key = self.cell(item.lat, item.lon)
+        members = self.cells[key]
+        members.remove(item)
+        if not members:
+            del self.cells[key]
+        self.size -= 1
+
+    def move(self, item, lat: float, lon: float):
+        """
+        Update the position of an indexed item, re-filing it only if it crossed into another cell
+        """
+        if self.cell(lat, lon) == self.cell(item.lat, item.lon):
+            item.lat, item.lon = lat, lon
+            return
+        self.remove(item)
+        item.lat, item.lon = lat, lon
+        self.insert(item)
+
+    def col_m(self, lat: float, meters: float = 0.0) -> float:
+        """
+        Meridians converge: a cell spans cos(lat) of its height in longitude. Uses the highest latitude within meters of lat
+        Returns: float: Smallest east-west width in meters of the cells within meters of lat
+        """
+        highest = min(89.9, abs(lat) + meters/METERS_PER_DEGREE + self.cell_deg)
+        return self.cell_deg*METERS_PER_DEGREE*math.cos(math.radians(highest))
+
+    def within(self, lat: float, lon: float, radius_m: float) -> list:
+        """
+        Returns: list: (distance in meters, item) of every item within radius_m of the point
+        """
+        row, col = self.cell(lat, lon)
+        rows = math.ceil(radius_m/(self.cell_deg*METERS_PER_DEGREE))
+        cols = math.ceil(radius_m/self.col_m(lat, radius_m))
+        matches = []
+        for r in range(row - rows, row + rows + 1):
+            for c in range(col - cols, col + cols + 1):
+                for item in self.cells.get((r, c), ()):
+                    distance = haversine_m(lat, lon, item.lat, item.lon)
+                    if distance <= radius_m:
+                        matches.append((distance, item))
+        return matches
+
+    def bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> list:
+        """
+        Returns: list: Every item inside the bounding box
+        """
+        (row0, col0), (row1, col1) = self.cell(min_lat, min_lon), self.cell(max_lat, max_lon)
+        if (row1 - row0 + 1)*(col1 - col0 + 1) <= len(self.cells):
+            keys = ((r, c) for r in range(row0, row1 + 1) for c in range(col0, col1 + 1))
+        else:
+            # A box covering more cells than are occupied is cheaper to answer from the occupied cells
+            keys = (key for key in self.cells if row0 <= key[0] <= row1 and col0 <= key[1] <= col1)
+
+        return [
+            item
+            for key in keys
+            for item in self.cells.get(key, ())
+            if min_lat <= item.lat <= max_lat and min_lon <= item.lon <= max_lon
+        ]
+
+    def nearest(self, lat: float, lon: float, k: int = 1, max_distance_m: float = None, accept = None) -> list:
+        """
+        accept: optional predicate on items, to skip items the caller does not want (e.g. below a confidence)
+        Returns: list: (distance in meters, item) of the k nearest items, closest first
+        """
+        if not self.cells:
+            return []
+
+        row, col = self.cell(lat, lon)
+        min_row, max_row, min_col, max_col = self.bounds
+        max_ring = max(row - min_row, max_row - row, col - min_col, max_col - col)
+        best = []
+
+        def visit(items):
+            for item in items:
+                if accept is not None and not accept(item):
+                    continue
+                distance = haversine_m(lat, lon, item.lat, item.lon)
+                if max_distance_m is not None and distance > max_distance_m:
+                    continue
+                entry = (-distance, id(item), item)
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, entry)
+
+        for ring in range(max_ring + 1):
+            # Everything outside the rings visited so far is at least this far away
+            bound = (ring - 1)*self.col_m(lat, ring*self.cell_deg*METERS_PER_DEGREE)
+            if (len(best) == k and -best[0][0] <= bound) or (max_distance_m is not None and bound > max_distance_m):
+                break
+
+            if (2*ring + 1)**2 > 4*len(self.cells):
+                # Sparse data far from the point: scanning the occupied cells beats walking empty rings
+                visit(item for key, items in self.cells.items() if max(abs(key[0] - row), abs(key[1] - col)) >= ring for item in items)
+                break
+
+            for r in range(row - ring, row + ring + 1):
+                edge = abs(r - row) == ring
+                for c in (range(col - ring, col + ring + 1) if edge else (col - ring, col + ring)):
+                    visit(self.cells.get((r, c), ()))
+
+        return [(-neg, item) for neg, _, item in sorted(best, reverse = True)]
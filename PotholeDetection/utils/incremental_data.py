@@ -0,0 +1,100 @@
+import json
+import random
+from pathlib import Path
+import yaml
+from PotholeDetection.logging.logger import logger
+from PotholeDetection.utils.utils import list_images
+
+
+def load_state(state_file: Path) -> dict:
+    """
+    Returns: dict: The last training state (trained_through timestamp, model and test metrics), empty if there is none
+    """
+    if not state_file.exists():
+        return {}
+    with open(state_file, 'r') as f:
+        return json.load(f)
+
+
+def save_state(state_file: Path, state: dict):
+    state_file.parent.mkdir(parents = True, exist_ok = True)
+    tmp_path = state_file.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent = 4)
+    tmp_path.replace(state_file)
+
+
+def synced_through(manifest_file: Path) -> float:
+    """
+    Returns: float: Sync time of the most recently synced object of the ingestion manifest, None without a manifest
+    """
+    if manifest_file is None or not Path(manifest_file).exists():
+        return None
+    with open(manifest_file, 'r') as f:
+        manifest = json.load(f)
+    return max((entry.get('synced_at', 0.0) for entry in manifest.values()), default = None)
+
+
+def training_pool(dataset: Path, data_yaml: Path, supported_img_ext: list) -> list:
+    """
+    Returns: list: Training images of the data.yaml. A thinned image list (see DatasetDeduplicator) is respected
+    """
+    with open(data_yaml, 'r') as f:
+        train = yaml.safe_load(f).get('train')
+    if isinstance(train, str) and train.endswith('.txt') and Path(train).exists():
+        return [Path(line) for line in Path(train).read_text().split('\n') if line]
+    return list_images(dataset/'train'/'images', supported_img_ext)
+
+
+def select_images(manifest_file: Path, dataset: Path, s3_prefix: str, pool: list, since: float,
+                  replay_ratio: float, min_replay: int, seed: int) -> tuple:
+    """
+    Split the training images into the ones synced after since (new) and a random replay sample of the older ones,
+    sized replay_ratio times the new images but at least min_replay, so fine-tuning does not forget the old data
+    Returns: tuple: (new images, replay images)
+    """
+    with open(manifest_file, 'r') as f:
+        manifest = json.load(f)
+
+    new_files = {
+        (dataset/Path(key).relative_to(s3_prefix)).resolve()
+        for key, entry in manifest.items() if entry.get('synced_at', 0.0) > since
+    }
+    new_images = [f for f in pool if Path(f).resolve() in new_files]
+    old_images = [f for f in pool if Path(f).resolve() not in new_files]
+
+    # Images whose label file alone changed (e.g. re-annotated) count as new too. A label is paired with its image by
+    # the path relative to train/labels, mirrored under train/images (as in DatasetPacker.pack_labels)
+    images_dir, labels_dir = (dataset/'train'/'images').resolve(), (dataset/'train'/'labels').resolve()
+    new_labels = {(images_dir/f.relative_to(labels_dir)).with_suffix('') for f in new_files if f.is_relative_to(labels_dir)}
+    relabeled = [f for f in old_images if Path(f).resolve().with_suffix('') in new_labels]
+    if relabeled:
+        new_images += relabeled
+        old_images = [f for f in old_images if f not in set(relabeled)]
+
+    num_replay = min(len(old_images), max(min_replay, round(replay_ratio*len(new_images)))) if new_images else 0
+    replay = random.Random(seed).sample(old_images, num_replay)
+    logger.info(f"Incremental training set: {len(new_images)} new images ({len(relabeled)} relabeled) "
+                f"and {len(replay)} replayed of {len(old_images)} older images")
+    return new_images, replay
+
+
+def write_training_set(images: list, data_yaml: Path, dataset: Path, output_dir: Path) -> Path:
+    """
+    Write the image list to <output_dir>/train/images.txt (so the packed trainer still finds the packed train split)
+    and a copy of data_yaml training on it
+    Returns: Path: The incremental data.yaml
+    """
+    with open(data_yaml, 'r') as f:
+        data = yaml.safe_load(f)
+    data.setdefault('path', str(Path(dataset).resolve()))
+
+    list_file = output_dir/'train'/'images.txt'
+    list_file.parent.mkdir(parents = True, exist_ok = True)
+    list_file.write_text(''.join(f'{Path(p).resolve()}\n' for p in images))
+    data['train'] = str(list_file.resolve())
+
+    incremental_yaml = output_dir/'data.yaml'
+    with open(incremental_yaml, 'w') as f:
+        yaml.safe_dump(data, f, sort_keys = False)
+    return incremental_yaml
@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+from PotholeDetection.logging.logger import logger
+
+
+class ErrorBudgetExceeded(Exception):
+    pass
+
+
+class IssueLog:
+    """
+    Streams validation findings to a JSONL file as they are found, one {split, check, severity, path, detail}
+    record per line, through a bounded write buffer. Only counters and the first few findings of every check
+    are kept in memory, so a badly corrupted dataset does not grow the report without bound.
+    Once more than max_errors errors were recorded, ErrorBudgetExceeded is raised so validation can stop early.
+    """
+    def __init__(self, log_file: Path, max_errors: int = None, buffer_size: int = 256, sample_size: int = 20):
+        self.log_file = Path(log_file)
+        self.max_errors = max_errors
+        self.buffer_size = buffer_size
+        self.sample_size = sample_size
+        self.buffer = []
+        self.errors = 0
+        self.warnings = 0
+        self.counts = {}
+        self.samples = {}
+
+        self.log_file.parent.mkdir(parents = True, exist_ok = True)
+        self.file = open(self.log_file, 'w')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def record(self, split: str, check: str, path, detail: str = None, severity: str = 'error'):
+        """
+        Record one finding. Warnings (e.g. empty label files) are logged but do not count against the error budget
+        """
+        self.buffer.append(json.dumps({'split': split, 'check': check, 'severity': severity, 'path': str(path), 'detail': detail}) + '\n')
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+        split_counts = self.counts.setdefault(split, {})
+        split_counts[check] = split_counts.get(check, 0) + 1
+        samples = self.samples.setdefault(check, [])
+        if len(samples) < self.sample_size:
+            samples.append(str(path))
+            if severity == 'error':
+                logger.error(f"{check} in split '{split}': {path}{f' ({detail})' if detail else ''}")
+
+        if severity != 'error':
+            self.warnings += 1
+            return
+
+        self.errors += 1
+        if self.max_errors is not None and self.errors > self.max_errors:
+            self.flush()
+            raise ErrorBudgetExceeded(f"{self.errors} validation errors exceed the error budget of {self.max_errors}. See {self.log_file}")
+
+    def count(self, split: str, check: str) -> int:
+        return self.counts.get(split, {}).get(check, 0)
+
+    def totals(self) -> dict:
+        """
+        Returns: dict: Number of findings of every check summed over all splits
+        """
+        totals = {}
+        for split_counts in self.counts.values():
+            for check, n in split_counts.items():
+                totals[check] = totals.get(check, 0) + n
+        return totals
+
+    def flush(self):
+        if self.buffer:
+            self.file.writelines(self.buffer)
+            self.file.flush()
+            self.buffer = []
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
@@ -0,0 +1,160 @@
+from dataclasses import dataclass, field
+import numpy as np
+
+
+def diagnose_label_text(text: str) -> tuple:
+    """
+    Slow path for label files that fail bulk parsing. Locates the malformed lines
+    Returns: tuple: (rows of the well-formed lines, list of errors)
+    """
+    rows, errors = [], []
+    for line_no, line in enumerate(text.splitlines(), start = 1):
+        parts = line.split()
+        if not parts:
+            continue
+
+        if len(parts) != 5:
+            errors.append(f"line {line_no}: expected 5 values, found {len(parts)}")
+            continue
+
+        try:
+            rows.append([float(v) for v in parts])
+        except ValueError:
+            errors.append(f"line {line_no}: non-numeric values '{line.strip()}'")
+
+    return np.asarray(rows, dtype = np.float64).reshape(-1, 5), errors
+
+
+def parse_labels(label_paths: list) -> list:
+    """
+    Bulk parse a chunk of YOLO label files. Runs inside a worker process
+    The tokens of all well-formed files in the chunk are converted to floats with a single NumPy call;
+    only files that fail this fast path are parsed line by line to locate the errors.
+    Returns: list: (path, rows array of shape (n, 5), errors) for every label file in the chunk
+    """
+    texts, errors = {}, {}
+    for label_path in label_paths:
+        try:
+            with open(label_path, 'r') as f:
+                texts[label_path] = f.read()
+        except Exception as e:
+            errors[label_path] = [str(e)]
+
+    file_tokens = {}
+    for label_path, text in texts.items():
+        line_tokens = [line.split() for line in text.splitlines()]
+        if all(len(tokens) in (0, 5) for tokens in line_tokens):
+            file_tokens[label_path] = [t for tokens in line_tokens for t in tokens]
+
+    rows = {}
+    try:
+        values = np.array([t for tokens in file_tokens.values() for t in tokens], dtype = np.float64).reshape(-1, 5)
+        split_points = np.cumsum([len(tokens)//5 for tokens in file_tokens.values()])[:-1]
+        rows = dict(zip(file_tokens, np.split(values, split_points)))
+
+    except ValueError:
+        for label_path, tokens in file_tokens.items():
+            try:
+                rows[label_path] = np.array(tokens, dtype = np.float64).reshape(-1, 5)
+            except ValueError:
+                pass
+
+    for label_path, text in texts.items():
+        if label_path not in rows:
+            rows[label_path], errors[label_path] = diagnose_label_text(text)
+
+    return [
+        (label_path, rows.get(label_path, np.empty((0, 5))), errors.get(label_path, []))
+        for label_path in label_paths
+    ]
+
+
+@dataclass
+class LabelArray:
+    """
+    All boxes of a split in one array with columns (file_id, class, x_center, y_center, width, height).
+    file_id indexes into `files`.
+    """
+    files: list
+    boxes: np.ndarray
+    format_errors: dict = field(default_factory = dict)
+
+    @classmethod
+    def from_results(cls, label_results: dict) -> 'LabelArray':
+        """
+        Build the split-wide array from per-file parse results
+        Returns: LabelArray: Boxes of every label file of the split
+        """
+        files = list(label_results)
+        per_file = [np.asarray(rows, dtype = np.float64).reshape(-1, 5) for rows, _ in label_results.values()]
+        format_errors = {path: errors for path, (_, errors) in label_results.items() if errors}
+
+        if not per_file:
+            return cls(files = files, boxes = np.empty((0, 6)), format_errors = format_errors)
+
+        file_ids = np.repeat(np.arange(len(files)), [len(rows) for rows in per_file])
+        boxes = np.column_stack([file_ids, np.concatenate(per_file)])
+        return cls(files = files, boxes = boxes, format_errors = format_errors)
+
+    def failing_files(self, mask: np.ndarray) -> list:
+        return [self.files[i] for i in np.unique(self.boxes[mask, 0]).astype(int)]
+
+    def validate(self, num_classes: int = None) -> dict:
+        """
+        Run class-id, range, zero-area and duplicate-box checks as vectorized masks
+        Returns: dict: Mapping of failing label file to the list of failed checks
+        """
+        classes, coords = self.boxes[:, 1], self.boxes[:, 2:]
+
+        invalid_class = (classes < 0) | (classes != np.floor(classes))
+        if num_classes is not None:
+            invalid_class |= classes >= num_classes
+
+        out_of_range = ((coords < 0) | (coords > 1)).any(axis = 1)
+        zero_area = (self.boxes[:, 4] <= 0) | (self.boxes[:, 5] <= 0)
+
+        duplicate = np.zeros(len(self.boxes), dtype = bool)
+        if len(self.boxes):
+            _, first_idx = np.unique(np.round(self.boxes, 6), axis = 0, return_index = True)
+            duplicate[:] = True
+            duplicate[first_idx] = False
+
+        failures = {path: list(errors) for path, errors in self.format_errors.items()}
+        for check, mask in (('invalid class ID', invalid_class), ('box values out of range', out_of_range),
+                            ('zero-area box', zero_area), ('duplicate box', duplicate)):
+            for path in self.failing_files(mask):
+                failures.setdefault(path, []).append(check)
+
+        return failures
+
+    def boxes_per_image(self) -> np.ndarray:
+        return np.bincount(self.boxes[:, 0].astype(int), minlength = len(self.files))
+
+    def class_histogram(self) -> dict:
+        classes, counts = np.unique(self.boxes[:, 1].astype(int), return_counts = True)
+        return {int(c): int(n) for c, n in zip(classes, counts)}
+
+    def box_size_distribution(self, bins: int = 10) -> dict:
+        """
+        Histogram of box sizes, measured as sqrt(width*height) in normalized image units
+        Returns: dict: Bin edges and counts
+        """
+        sizes = np.sqrt(np.clip(self.boxes[:, 4]*self.boxes[:, 5], 0, None))
+        counts, edges = np.histogram(sizes, bins = bins, range = (0, 1))
+        return {'edges': edges.round(3).tolist(), 'counts': counts.tolist()}
+
+    def statistics(self) -> dict:
+        """
+        Dataset statistics computed from the already-parsed boxes
+        Returns: dict: Box counts, per-image box counts, class histogram and box-size distribution
+        """
+        per_image = self.boxes_per_image()
+        return {
+            'label_files': len(self.files),
+            'total_boxes': int(len(self.boxes)),
+            'empty_label_files': int((per_image == 0).sum()),
+            'mean_boxes_per_image': float(per_image.mean()) if len(per_image) else 0.0,
+            'max_boxes_per_image': int(per_image.max()) if len(per_image) else 0,
+            'class_histogram': self.class_histogram(),
+            'box_size_distribution': self.box_size_distribution()
+        }
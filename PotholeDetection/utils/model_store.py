@@ -0,0 +1,171 @@
+import json
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+import boto3
+from filelock import FileLock
+from PotholeDetection.config_manager.component_config import ModelStoreConfig
+from PotholeDetection.logging.logger import logger
+
+
+def parse_s3_uri(uri: str) -> tuple:
+    """
+    Returns: tuple: (bucket, key) of an s3://bucket/key URI
+    """
+    if not uri.startswith('s3://'):
+        raise ValueError(f"Not an S3 URI: {uri}")
+
+    bucket, _, key = uri[len('s3://'):].partition('/')
+    return bucket, key
+
+
+class ModelStore:
+    """
+    Local content-addressed cache of S3-hosted model weights.
+
+    cache_dir/objects/<sha256><suffix>  model files, named by the SHA-256 of their content
+    cache_dir/refs/<bucket>/<key>.json  ETag, size and SHA-256 of the object last resolved for an S3 key
+
+    A resolve costs a single HEAD request while the remote ETag matches the ref. Downloads are serialized
+    across processes with a per-key file lock, so concurrent workers share one download.
+    """
+    def __init__(self, config: ModelStoreConfig):
+        self.config = config
+        self.s3 = boto3.client('s3')
+        self.objects_dir = self.config.cache_dir/'objects'
+        self.refs_dir = self.config.cache_dir/'refs'
+        self.locks_dir = self.config.cache_dir/'locks'
+        for directory in (self.objects_dir, self.refs_dir, self.locks_dir):
+            directory.mkdir(parents = True, exist_ok = True)
+
+    def ref_path(self, bucket: str, key: str) -> Path:
+        return self.refs_dir/bucket/f'{key}.json'
+
+    def read_ref(self, bucket: str, key: str):
+        ref_path = self.ref_path(bucket, key)
+        if not ref_path.exists():
+            return None
+
+        with open(ref_path, 'r') as f:
+            return json.load(f)
+
+    def write_ref(self, bucket: str, key: str, ref: dict):
+        ref_path = self.ref_path(bucket, key)
+        ref_path.parent.mkdir(parents = True, exist_ok = True)
+        tmp_path = ref_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(ref, f, indent = 4)
+        tmp_path.replace(ref_path)
+
+    def cached_object(self, ref: dict, etag: str):
+        """
+        Returns: Path: Cached model file if the ref matches the remote ETag and the file is intact, None otherwise
+        """
+        if ref is None or ref['etag'] != etag:
+            return None
+
+        object_path = self.objects_dir/ref['object']
+        if not object_path.exists() or object_path.stat().st_size != ref['size']:
+            return None
+
+        return object_path
+
+    def download(self, bucket: str, key: str, head: dict) -> dict:
+        """
+        Stream an object into the cache, hashing it on the fly and verifying its size and, if published, its SHA-256 checksum
+        Returns: dict: Ref describing the cached object
+        """
+        start = time.perf_counter()
+        with tempfile.NamedTemporaryFile(dir = self.objects_dir, suffix = '.part', delete = False) as tmp:
+            tmp_path = Path(tmp.name)
+
+        try:
+            response = self.s3.get_object(Bucket = bucket, Key = key, IfMatch = head['ETag'])
+            digest = hashlib.sha256()
+            with open(tmp_path, 'wb') as f:
+                for block in response['Body'].iter_chunks(1 << 20):
+                    digest.update(block)
+                    f.write(block)
+            sha256 = digest.hexdigest()
+
+            size = tmp_path.stat().st_size
+            if size != head['ContentLength']:
+                raise IOError(f"Size mismatch for s3://{bucket}/{key}: expected {head['ContentLength']}, got {size}")
+
+            expected = head.get('Metadata', {}).get('sha256')
+            if expected and expected != sha256:
+                raise IOError(f"Checksum mismatch for s3://{bucket}/{key}: expected {expected}, got {sha256}")
+
+            object_name = f'{sha256}{Path(key).suffix}'
+            tmp_path.replace(self.objects_dir/object_name)
+
+        finally:
+            tmp_path.unlink(missing_ok = True)
+
+        logger.info(f"Downloaded s3://{bucket}/{key} ({size} bytes) in {time.perf_counter() - start:.2f}s")
+        return {'etag': head['ETag'], 'size': size, 'sha256': sha256, 'object': object_name, 'fetched_at': time.time()}
+
+    def resolve(self, uri: str) -> Path:
+        """
+        Resolve an s3://bucket/key URI to a verified local model file, downloading it only if it changed
+        Returns: Path: Local path of the cached model
+        """
+        try:
+            bucket, key = parse_s3_uri(uri)
+            head = self.s3.head_object(Bucket = bucket, Key = key)
+
+            object_path = self.cached_object(self.read_ref(bucket, key), head['ETag'])
+            if object_path is None:
+                lock_path = self.locks_dir/(hashlib.sha256(uri.encode()).hexdigest() + '.lock')
+                with FileLock(str(lock_path), timeout = self.config.lock_timeout):
+                    # Another process may have finished the download while we waited for the lock
+                    object_path = self.cached_object(self.read_ref(bucket, key), head['ETag'])
+                    if object_path is None:
+                        ref = self.download(bucket, key, head)
+                        self.write_ref(bucket, key, ref)
+                        object_path = self.objects_dir/ref['object']
+                        self.evict(keep = object_path)
+            else:
+                logger.info(f"Model {uri} unchanged (ETag {head['ETag']}). Using cached {object_path.name}")
+
+            object_path.touch()
+            return object_path
+
+        except Exception as e:
+            logger.error(f"Error resolving model {uri}: {e}")
+            raise e
+
+    def resolve_release(self, release_uri: str, name: str = 'best.pt') -> Path:
+        """
+        Resolve a file of the latest release published by ArtifactPublisher under an s3://bucket/prefix/ URI.
+        Release blobs are immutable, so the file is consistent with the rest of the release it was listed in
+        Returns: Path: Local path of the cached file
+        """
+        bucket, prefix = parse_s3_uri(release_uri)
+        response = self.s3.get_object(Bucket = bucket, Key = prefix.rstrip('/') + '/latest.json')
+        manifest = json.loads(response['Body'].read())
+        if name not in manifest['files']:
+            raise KeyError(f"{name} is not part of release {manifest['version']}")
+
+        logger.info(f"Resolving {name} from release {manifest['version']}")
+        return self.resolve(f"s3://{bucket}/{manifest['files'][name]['key']}")
+
+    def evict(self, keep: Path = None):
+        """
+        Delete least recently used model files until the cache fits under max_cache_bytes
+        """
+        objects = sorted(
+            (f for f in self.objects_dir.iterdir() if f.is_file() and f.suffix != '.part'),
+            key = lambda f: f.stat().st_mtime
+        )
+        total = sum(f.stat().st_size for f in objects)
+        for object_path in objects:
+            if total <= self.config.max_cache_bytes:
+                break
+            if object_path == keep:
+                continue
+
+            total -= object_path.stat().st_size
+            object_path.unlink(missing_ok = True)
+            logger.info(f"Evicted {object_path.name} from the model cache")
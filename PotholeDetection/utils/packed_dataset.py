@@ -0,0 +1,75 @@
+import json
+import math
+from pathlib import Path
+import cv2
+import numpy as np
+
+
+INDEX_FILE = 'index.json'
+LABELS_FILE = 'labels.npz'
+
+
+def shard_path(split_dir: Path, shard: int) -> Path:
+    return split_dir/f'shard_{shard:05d}.npy'
+
+
+def resize_long_side(img: np.ndarray, img_size: int) -> np.ndarray:
+    """
+    Resize so the long side equals img_size, keeping the aspect ratio. Matches the resize ultralytics applies when loading images
+    Returns: np.ndarray: Resized image
+    """
+    h0, w0 = img.shape[:2]
+    r = img_size/max(h0, w0)
+    if r == 1:
+        return img
+
+    w, h = min(math.ceil(w0*r), img_size), min(math.ceil(h0*r), img_size)
+    return cv2.resize(img, (w, h), interpolation = cv2.INTER_LINEAR)
+
+
+class PackedImages:
+    """
+    Read side of a packed split. Every shard is a (n, img_size, img_size, 3) uint8 .npy file whose slots hold
+    one resized image each, anchored at the top-left corner. Shards are memory-mapped lazily in each process,
+    so DataLoader workers never pickle image data, and images are returned as zero-copy slices.
+    """
+    def __init__(self, split_dir: Path):
+        self.split_dir = Path(split_dir)
+        with open(self.split_dir/INDEX_FILE, 'r') as f:
+            index = json.load(f)
+
+        self.img_size = index['img_size']
+        self.entries = {entry['file']: entry for entry in index['images']}
+        with np.load(self.split_dir/LABELS_FILE) as labels:
+            self.label_rows = labels['rows']
+            self.label_offsets = labels['offsets']
+        self.shards = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['shards'] = {}
+        return state
+
+    def __contains__(self, im_file) -> bool:
+        return str(Path(im_file).resolve()) in self.entries
+
+    def shard(self, shard: int) -> np.ndarray:
+        if shard not in self.shards:
+            # Copy-on-write mapping: augmentations that modify images in place never touch the shard file
+            self.shards[shard] = np.load(shard_path(self.split_dir, shard), mmap_mode = 'c')
+        return self.shards[shard]
+
+    def image(self, im_file) -> tuple:
+        """
+        Returns: tuple: (zero-copy image view, original (h, w), resized (h, w))
+        """
+        entry = self.entries[str(Path(im_file).resolve())]
+        h, w = entry['hw']
+        return self.shard(entry['shard'])[entry['slot'], :h, :w], tuple(entry['hw0']), (h, w)
+
+    def labels(self, im_file) -> np.ndarray:
+        """
+        Returns: np.ndarray: (n, 5) YOLO label rows of an image
+        """
+        label_idx = self.entries[str(Path(im_file).resolve())]['label_idx']
+        return self.label_rows[self.label_offsets[label_idx]:self.label_offsets[label_idx + 1]]
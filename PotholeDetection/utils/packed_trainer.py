@@ -0,0 +1,89 @@
+from pathlib import Path
+import numpy as np
+from ultralytics.data.dataset import YOLODataset
+from ultralytics.models.yolo.detect import DetectionTrainer
+from ultralytics.utils.torch_utils import unwrap_model
+from PotholeDetection.utils.packed_dataset import INDEX_FILE, PackedImages
+
+
+class PackedYOLODataset(YOLODataset):
+    """
+    YOLODataset reading pre-resized images and labels from a packed split instead of decoding the original files
+    """
+    def __init__(self, *args, packed: PackedImages, **kwargs):
+        self.packed = packed
+        super().__init__(*args, **kwargs)
+
+    def get_labels(self) -> list:
+        self.label_files = self.get_label_files()
+        if not all(im_file in self.packed for im_file in self.im_files):
+            return super().get_labels()
+
+        labels = []
+        for im_file in self.im_files:
+            rows = self.packed.labels(im_file).astype(np.float32)
+            labels.append({
+                'im_file': im_file,
+                'shape': self.packed.image(im_file)[1],
+                'cls': rows[:, 0:1],
+                'bboxes': rows[:, 1:],
+                'segments': [],
+                'keypoints': None,
+                'normalized': True,
+                'bbox_format': 'xywh'
+            })
+        return labels
+
+    def load_image(self, i: int, rect_mode: bool = True, resize_short: bool = False) -> tuple:
+        if self.ims[i] is not None or not rect_mode or resize_short or self.imgsz != self.packed.img_size:
+            return super().load_image(i, rect_mode, resize_short)
+
+        im, hw0, hw = self.packed.image(self.im_files[i])
+        # Mosaic samples its partner images from the buffer of recently loaded images, as in BaseDataset.load_image
+        if self.augment and self.cache != 'ram':
+            self.ims[i], self.im_hw0[i], self.im_hw[i] = im, hw0, hw
+            self.buffer.append(i)
+            if 1 < len(self.buffer) >= self.max_buffer_length:
+                j = self.buffer.pop(0)
+                self.ims[j], self.im_hw0[j], self.im_hw[j] = None, None, None
+
+        return im, hw0, hw
+
+
+class PackedDetectionTrainer(DetectionTrainer):
+    """
+    DetectionTrainer building PackedYOLODatasets for the splits found under packed_dir
+    """
+    packed_dir = None
+
+    def build_dataset(self, img_path: str, mode: str = 'train', batch: int = None):
+        split_dir = Path(self.packed_dir)/Path(img_path).parent.name
+        if self.args.task != 'detect' or not (split_dir/INDEX_FILE).exists():
+            return super().build_dataset(img_path, mode, batch)
+
+        stride = max(int(unwrap_model(self.model).stride.max()), 32) if self.model else 32
+        return PackedYOLODataset(
+            img_path = img_path,
+            imgsz = self.args.imgsz,
+            batch_size = batch,
+            augment = mode == 'train',
+            hyp = self.args,
+            rect = self.args.rect or mode == 'val',
+            cache = self.args.cache or None,
+            single_cls = self.args.single_cls or False,
+            stride = stride,
+            pad = 0.0 if mode == 'train' else 0.5,
+            prefix = f'{mode}: ',
+            task = self.args.task,
+            classes = self.args.classes,
+            data = self.data,
+            fraction = self.args.fraction if mode == 'train' else 1.0,
+            packed = PackedImages(split_dir)
+        )
+
+
+def packed_trainer(packed_dir: Path) -> type:
+    """
+    Returns: type: PackedDetectionTrainer subclass bound to a packed dataset directory, for YOLO.train(trainer = ...)
+    """
+    return type('BoundPackedDetectionTrainer', (PackedDetectionTrainer,), {'packed_dir': str(packed_dir)})
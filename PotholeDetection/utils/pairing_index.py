@@ -0,0 +1,131 @@
+import time
+import tempfile
+from pathlib import Path
+from collections import defaultdict
+import numpy as np
+from PotholeDetection.logging.logger import logger
+
+
+class PairingIndex:
+    """
+    Hash index pairing the images and label files of a split by their stem, i.e. the path relative to
+    the images/ or labels/ directory without its suffix. Built in linear time and queried in constant time.
+    """
+    def __init__(self, images_dir: Path, labels_dir: Path, image_files: list, label_files: list, box_counts: dict = None):
+        self.images_dir = images_dir
+        self.labels_dir = labels_dir
+        self.images_by_stem = defaultdict(list)
+        self.labels_by_stem = {}
+
+        for img_file in image_files:
+            self.images_by_stem[self.stem(img_file, images_dir)].append(img_file)
+
+        for label_file in label_files:
+            self.labels_by_stem[self.stem(label_file, labels_dir)] = label_file
+
+        self.box_counts = box_counts or {}
+
+    @classmethod
+    def from_split(cls, split_path: Path, split_index) -> 'PairingIndex':
+        """
+        Build the pairing index of a scanned split
+        Returns: PairingIndex: Index over the split's images and labels
+        """
+        labels = split_index.labels
+        box_counts = None
+        if labels is not None:
+            box_counts = {label: count for label, count in zip(labels.files, labels.boxes_per_image().tolist())
+                          if label not in labels.format_errors}
+        return cls(split_path/'images', split_path/'labels', split_index.image_files, split_index.label_files, box_counts)
+
+    @staticmethod
+    def stem(file_path: Path, root: Path) -> str:
+        return file_path.relative_to(root).with_suffix('').as_posix()
+
+    def label_for(self, img_file: Path):
+        """
+        Returns: Path: Label file paired with the image, None if it has no label
+        """
+        return self.labels_by_stem.get(self.stem(img_file, self.images_dir))
+
+    def images_for(self, label_file: Path) -> list:
+        """
+        Returns: list: Images paired with the label file, empty for orphan labels
+        """
+        return self.images_by_stem.get(self.stem(label_file, self.labels_dir), [])
+
+    def missing_labels(self) -> list:
+        return [img for stem, imgs in self.images_by_stem.items() if stem not in self.labels_by_stem for img in imgs]
+
+    def orphan_labels(self) -> list:
+        return [label for stem, label in self.labels_by_stem.items() if stem not in self.images_by_stem]
+
+    def duplicate_stems(self) -> dict:
+        """
+        Returns: dict: Stems shared by several images (e.g. a.jpg and a.png), which makes their label ambiguous
+        """
+        return {stem: imgs for stem, imgs in self.images_by_stem.items() if len(imgs) > 1}
+
+    def empty_labels(self) -> list:
+        """
+        Returns: list: Paired label files without boxes, i.e. true negative images
+        """
+        return [label for stem, label in self.labels_by_stem.items()
+                if self.box_counts.get(label, 1) == 0 and stem in self.images_by_stem]
+
+
+def benchmark_pairing(num_files: int = 100_000, legacy_sample: int = 5_000) -> dict:
+    """
+    Benchmark the pairing index on a synthetic tree of num_files files (half images, half labels) with a
+    fraction of missing and orphan labels, against the previous list-membership pairing on a smaller sample
+    Returns: dict: Timings and findings of the benchmark
+    """
+    from PotholeDetection.utils.dataset_scanner import DatasetScanner
+
+    num_images = num_files//2
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        split_path = Path(tmp_dir)/'train'
+        (split_path/'images').mkdir(parents = True)
+        (split_path/'labels').mkdir(parents = True)
+
+        label_ids = np.arange(num_images)
+        label_ids[rng.random(num_images) < 0.01] += num_images
+        for i in range(num_images):
+            (split_path/'images'/f'{i:07d}.jpg').touch()
+            (split_path/'labels'/f'{label_ids[i]:07d}.txt').touch()
+
+        scanner = DatasetScanner(Path(tmp_dir), ['train'], ['.jpg'])
+        start = time.perf_counter()
+        split_index = scanner.walk_split('train')
+        walk_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pairs = PairingIndex(split_path/'images', split_path/'labels', split_index.image_files, split_index.label_files)
+        missing, orphans = pairs.missing_labels(), pairs.orphan_labels()
+        index_time = time.perf_counter() - start
+
+        images_sample = split_index.image_files[:legacy_sample]
+        labels_sample = split_index.label_files[:legacy_sample]
+        start = time.perf_counter()
+        for img_file in images_sample:
+            _ = (split_path/'labels'/(img_file.stem + '.txt')) in labels_sample
+        legacy_time = time.perf_counter() - start
+
+    results = {
+        'files': num_files,
+        'walk_seconds': walk_time,
+        'index_seconds': index_time,
+        'missing_labels': len(missing),
+        'orphan_labels': len(orphans),
+        'legacy_sample': legacy_sample,
+        'legacy_seconds': legacy_time,
+        'legacy_projected_seconds': legacy_time*(num_images/legacy_sample)**2
+    }
+    logger.info(f"Pairing benchmark: {results}")
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in benchmark_pairing().items():
+        print(f"{name:>26}: {value:.3f}" if isinstance(value, float) else f"{name:>26}: {value}")
@@ -0,0 +1,87 @@
+from PIL import Image
+
+
+def dhash(img: Image.Image, hash_size: int = 8) -> int:
+    """
+    Difference hash: compare neighbouring pixels of a grayscale thumbnail. Robust to rescaling, recompression
+    and small brightness changes, so consecutive dashcam frames land within a few bits of each other
+    Returns: int: hash_size*hash_size bit perceptual hash
+    """
+    img = img.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = img.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        offset = row*(hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+def hash_images(image_paths: list, hash_size: int = 8) -> list:
+    """
+    Perceptual hash a chunk of images. JPEGs are decoded at reduced scale, which is all a thumbnail needs. Runs inside a worker process
+    Returns: list: (path, hash, error message) for every image in the chunk
+    """
+    results = []
+    for img_path in image_paths:
+        try:
+            with Image.open(img_path) as img:
+                img.draft('RGB', (8*(hash_size + 1), 8*hash_size))
+                results.append((img_path, dhash(img, hash_size), None))
+        except Exception as e:
+            results.append((img_path, None, str(e)))
+
+    return results
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over the Hamming distance. Every child subtree is keyed by its distance to the parent,
+    so by the triangle inequality a radius query only descends into children keyed within radius of the
+    query's distance to the node, instead of comparing against every hash. Identical hashes share a node
+    """
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, value: int, item):
+        self.size += 1
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def query(self, value: int, radius: int) -> list:
+        """
+        Returns: list: (item, distance) of every indexed item within radius bits of the value
+        """
+        matches = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                matches.extend((item, distance) for item in node[1])
+            for child_distance, child in node[2].items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+
+        return matches
@@ -0,0 +1,74 @@
+import sys
+import json
+import subprocess
+from PotholeDetection.constants.constants import IMPORT_TIME_BUDGETS, IMPORT_TIME_REPEATS, LAZY_IMPORTS
+
+
+PROBE = (
+    "import sys, json, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "print(json.dumps({{'seconds': time.perf_counter() - start, 'modules': sorted(sys.modules)}}))\n"
+)
+
+
+def slowest_imports(importtime_log: str, top: int = 5) -> list:
+    """
+    Aggregate the self time reported by python -X importtime per top-level package
+    Returns: list: (package, milliseconds) of the slowest packages
+    """
+    totals = {}
+    for line in importtime_log.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        totals[package] = totals.get(package, 0) + int(self_us)
+    return [(package, us/1000) for package, us in sorted(totals.items(), key = lambda kv: -kv[1])[:top]]
+
+
+def measure_import(module: str, repeats: int = IMPORT_TIME_REPEATS) -> dict:
+    """
+    Cold-import a module in fresh interpreters and keep the fastest run, which is the least disturbed by the OS
+    Returns: dict: Import seconds, heavy modules it pulled in and the slowest packages of that run
+    """
+    best = None
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE.format(module = module)],
+            capture_output = True, text = True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        if best is None or probe['seconds'] < best['seconds']:
+            best = {
+                'seconds': probe['seconds'],
+                'heavy_imports': sorted(m for m in LAZY_IMPORTS if m in probe['modules']),
+                'slowest': slowest_imports(result.stderr)
+            }
+    return best
+
+
+def check_startup(budgets: dict = IMPORT_TIME_BUDGETS) -> bool:
+    """
+    Check that every entry point imports within its time budget and without loading the heavy
+    dependencies that should only be imported on first use (torch, ultralytics, onnx, mlflow, ...)
+    Returns: bool: True if every entry point is within budget
+    """
+    ok = True
+    for module, budget in budgets.items():
+        result = measure_import(module)
+        passed = result['seconds'] <= budget and not result['heavy_imports']
+        ok &= passed
+        print(f"{'ok' if passed else 'FAIL':<5} {module:<48} {result['seconds']*1000:>8.1f} ms (budget {budget*1000:.0f} ms)")
+        if not passed:
+            if result['heavy_imports']:
+                print(f"      eagerly imports {', '.join(result['heavy_imports'])}")
+            print(f"      slowest: {', '.join(f'{package} {ms:.0f} ms' for package, ms in result['slowest'])}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_startup() else 1)
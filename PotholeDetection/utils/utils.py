@@ -0,0 +1,132 @@
+import hashlib
+from pathlib import Path
+import cv2
+import numpy as np
+
+
+def file_sha256(path: Path, block_size: int = 8*1024**2) -> str:
+    """
+    Returns: str: Hex SHA-256 of the file's content, read in blocks
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_image(source) -> np.ndarray:
+    """
+    Decode an image from a file path, or pass an already decoded BGR array through
+    Returns: np.ndarray: BGR uint8 image
+    """
+    if isinstance(source, np.ndarray):
+        return source
+
+    img = cv2.imread(str(source), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError(f"Unable to decode image: {source}")
+
+    return img
+
+
+def letterbox(img: np.ndarray, new_size: int = 640, color: tuple = (114, 114, 114)) -> tuple:
+    """
+    Resize an image to fit a new_size x new_size square keeping its aspect ratio, padding the borders
+    Returns: tuple: (letterboxed image, scale ratio, (left pad, top pad))
+    """
+    h, w = img.shape[:2]
+    ratio = min(new_size/h, new_size/w)
+    new_h, new_w = round(h*ratio), round(w*ratio)
+
+    if (new_h, new_w) != (h, w):
+        img = cv2.resize(img, (new_w, new_h), interpolation = cv2.INTER_AREA if ratio < 1 else cv2.INTER_LINEAR)
+
+    top, left = (new_size - new_h)//2, (new_size - new_w)//2
+    padded = np.full((new_size, new_size, 3), color, dtype = np.uint8)
+    padded[top:top + new_h, left:left + new_w] = img
+
+    return padded, ratio, (left, top)
+
+
+def unletterbox_boxes(boxes: np.ndarray, ratio: float, pad: tuple, orig_shape: tuple) -> np.ndarray:
+    """
+    Map xyxy boxes from letterboxed coordinates back to the original image
+    Returns: np.ndarray: Boxes in original image pixels, clipped to the image
+    """
+    left, top = pad
+    boxes = (boxes - np.array([left, top, left, top], dtype = boxes.dtype))/ratio
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, orig_shape[1])
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, orig_shape[0])
+
+    return boxes
+
+
+def list_images(directory: Path, supported_img_ext: list) -> list:
+    """
+    Returns: list: Sorted image files under the directory with a supported extension
+    """
+    return sorted(f for f in Path(directory).rglob('*') if f.is_file() and f.suffix.lower() in supported_img_ext)
+
+
+def box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise IoU of two sets of xyxy boxes
+    Returns: np.ndarray: IoU matrix of shape (len(boxes_a), len(boxes_b))
+    """
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    intersection = np.clip(bottom_right - top_left, 0, None).prod(axis = 2)
+
+    area_a = (boxes_a[:, 2:] - boxes_a[:, :2]).prod(axis = 1)
+    area_b = (boxes_b[:, 2:] - boxes_b[:, :2]).prod(axis = 1)
+    return intersection/np.maximum(area_a[:, None] + area_b[None, :] - intersection, 1e-9)
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Greedy non-maximum suppression
+    Returns: np.ndarray: Indices of the kept boxes, in descending score order
+    """
+    order = np.argsort(-scores)
+    keep = []
+    while len(order):
+        best, order = order[0], order[1:]
+        keep.append(best)
+        if len(order):
+            order = order[box_iou(boxes[best:best + 1], boxes[order])[0] < iou_threshold]
+
+    return np.array(keep, dtype = np.int64)
+
+
+def weighted_box_fusion(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> tuple:
+    """
+    Fuse overlapping boxes into their score-weighted average instead of discarding all but the best one
+    Returns: tuple: (fused boxes, fused scores, index of the highest scoring box of every cluster)
+    """
+    order = np.argsort(-scores)
+    fused_boxes, fused_scores, representatives = [], [], []
+    while len(order):
+        cluster = order[box_iou(boxes[order[:1]], boxes[order])[0] >= iou_threshold]
+        weights = scores[cluster]
+        fused_boxes.append((boxes[cluster]*weights[:, None]).sum(axis = 0)/weights.sum())
+        fused_scores.append(weights.mean())
+        representatives.append(order[0])
+        order = order[~np.isin(order, cluster)]
+
+    if not fused_boxes:
+        return np.empty((0, 4), dtype = boxes.dtype), np.empty(0, dtype = scores.dtype), np.empty(0, dtype = np.int64)
+
+    return np.stack(fused_boxes).astype(boxes.dtype), np.array(fused_scores, dtype = scores.dtype), np.array(representatives)
+
+
+def decode_image(data: bytes) -> np.ndarray:
+    """
+    Decode encoded image bytes (JPEG, PNG, ...)
+    Returns: np.ndarray: BGR uint8 image
+    """
+    img = cv2.imdecode(np.frombuffer(data, dtype = np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("Unable to decode image bytes")
+
+    return img
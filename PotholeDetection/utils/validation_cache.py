@@ -0,0 +1,125 @@
+import json
+import hashlib
+import sqlite3
+from pathlib import Path
+from PotholeDetection.logging.logger import logger
+
+
+class ValidationCache:
+    """
+    SQLite table of per-file validation verdicts keyed by path and file fingerprint (size, mtime and optionally a content hash)
+    """
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path: Path, use_content_hash: bool = False):
+        self.db_path = db_path
+        self.use_content_hash = use_content_hash
+        self.hits = 0
+        self.misses = 0
+        self.seen = set()
+        # Fingerprints of files being verified, taken before they are read
+        self.pending = {}
+
+        self.db_path.parent.mkdir(parents = True, exist_ok = True)
+        self.conn = sqlite3.connect(str(self.db_path))
+
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            logger.info(f"Validation cache schema changed. Rebuilding cache at {self.db_path}")
+            self.conn.execute("DROP TABLE IF EXISTS files")
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT,
+                result TEXT NOT NULL
+            )"""
+        )
+        self.conn.commit()
+        self.entries = {
+            path: (kind, size, mtime_ns, content_hash, result)
+            for path, kind, size, mtime_ns, content_hash, result in self.conn.execute("SELECT * FROM files")
+        }
+        logger.info(f"Loaded {len(self.entries)} cached validation results from {self.db_path}")
+
+    @staticmethod
+    def content_hash(path: Path) -> str:
+        digest = hashlib.blake2b(digest_size = 16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    def lookup(self, path: Path, kind: str):
+        """
+        Look up the cached verdict of a file
+        Returns: Cached result if the file is unchanged since it was last validated, None otherwise
+        """
+        key = str(path)
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == kind:
+            stat = path.stat()
+            if (entry[1], entry[2]) == (stat.st_size, stat.st_mtime_ns):
+                self.hits += 1
+                return json.loads(entry[4])
+
+            if self.use_content_hash and entry[1] == stat.st_size and entry[3] == self.content_hash(path):
+                self.conn.execute("UPDATE files SET mtime_ns = ? WHERE path = ?", (stat.st_mtime_ns, key))
+                self.hits += 1
+                return json.loads(entry[4])
+
+        self.misses += 1
+        self.mark_pending(path)
+        return None
+
+    def mark_pending(self, path: Path):
+        """
+        Take the fingerprint of a file about to be verified. Its verdict is stored under this fingerprint, so a file
+        rewritten while it is verified does not match the verdict and is verified again on the next run
+        """
+        try:
+            stat = path.stat()
+            self.pending[str(path)] = (stat.st_size, stat.st_mtime_ns, self.content_hash(path) if self.use_content_hash else None)
+        except OSError:
+            # Missing or unreadable: the verdict is not cached
+            pass
+
+    def store(self, kind: str, results: dict):
+        """
+        Store freshly computed verdicts for a batch of files, under the fingerprints taken by lookup() or mark_pending()
+        """
+        rows = []
+        for path, result in results.items():
+            fingerprint = self.pending.pop(str(path), None)
+            if fingerprint is None:
+                logger.warning(f"No fingerprint taken before verifying {path}. Not caching its verdict")
+                continue
+            rows.append((str(path), kind, *fingerprint, json.dumps(result, default = lambda o: o.tolist())))
+
+        self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self.conn.commit()
+
+    def clear(self):
+        self.conn.execute("DELETE FROM files")
+        self.conn.commit()
+        self.entries = {}
+        logger.info("Validation cache cleared. All files will be rechecked")
+
+    def prune(self):
+        """
+        Drop cached verdicts of files that were not seen in the latest scan
+        """
+        stale = [(path,) for path in self.entries if path not in self.seen]
+        self.conn.executemany("DELETE FROM files WHERE path = ?", stale)
+        self.conn.commit()
+        if stale:
+            logger.info(f"Pruned {len(stale)} stale entries from the validation cache")
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
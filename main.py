@@ -0,0 +1,82 @@
+import argparse
+from pathlib import Path
+from PotholeDetection.config_manager.component_config import PredictionConfig, ServingConfig, PotholeMapConfig, DetectionSinkConfig
+from PotholeDetection.constants.constants import SERVER_HOST, SERVER_PORT, PREDICT_MODEL_PATH, INCREMENTAL_TRAINING
+from PotholeDetection.logging.logger import configure_logging
+from PotholeDetection.logging.instrumentation import configure_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Pothole detection')
+    subparsers = parser.add_subparsers(dest = 'command', required = True)
+
+    serve_parser = subparsers.add_parser('serve', help = 'Start the batching inference server')
+    serve_parser.add_argument('--host', default = SERVER_HOST)
+    serve_parser.add_argument('--port', type = int, default = SERVER_PORT)
+    serve_parser.add_argument('--model', type = Path, default = PREDICT_MODEL_PATH)
+    serve_parser.add_argument('--model-uri', default = None, help = 's3://bucket/key of the model, resolved through the local model cache')
+    serve_parser.add_argument('--no-ui', action = 'store_true', help = 'Do not mount the Gradio UI')
+
+    predict_parser = subparsers.add_parser('predict', help = 'Run batched inference over images and write the detections to the Parquet detection store')
+    predict_parser.add_argument('sources', nargs = '+', help = 'Image files or directories')
+    predict_parser.add_argument('--model', type = Path, default = PREDICT_MODEL_PATH)
+    predict_parser.add_argument('--output', type = Path, default = None, help = 'Detection store directory')
+    predict_parser.add_argument('--partition', nargs = '*', default = [], help = 'Partition values as key=value, e.g. vehicle=bus_12')
+
+    train_parser = subparsers.add_parser('train', help = 'Run the training pipeline, skipping up-to-date stages')
+    train_parser.add_argument('--force', action = 'store_true', help = 'Re-run every stage')
+    train_parser.add_argument('--from-stage', default = None, help = 'Re-run this stage and all stages downstream of it')
+    train_parser.add_argument('--only', nargs = '+', default = None, help = 'Run only these stages, using the recorded artifacts of their dependencies')
+    train_parser.add_argument('--incremental', action = argparse.BooleanOptionalAction, default = INCREMENTAL_TRAINING, help = 'Fine-tune the published model on the newly ingested images instead of training from scratch')
+
+    subparsers.add_parser('check-startup', help = 'Check the cold import time of every entry point against its budget')
+
+    map_parser = subparsers.add_parser('benchmark-map', help = 'Benchmark pothole map ingest rate and query latency on synthetic fleet tracks')
+    map_parser.add_argument('--reports', type = int, default = None, help = 'Number of synthetic detection reports')
+    map_parser.add_argument('--potholes', type = int, default = None, help = 'Number of synthetic potholes')
+
+    args = parser.parse_args()
+    configure_logging()
+    configure_metrics()
+
+    if args.command == 'serve':
+        from PotholeDetection.pipeline.serving import serve
+        serve(
+            ServingConfig(host = args.host, port = args.port, enable_ui = not args.no_ui),
+            PredictionConfig(model_path = args.model, model_uri = args.model_uri)
+        )
+
+    elif args.command == 'predict':
+        from PotholeDetection.pipeline.predict_pipeline import Predictor
+        from PotholeDetection.utils.detection_store import DetectionWriter
+        partition = dict(value.split('=', 1) for value in args.partition)
+        sink_config = DetectionSinkConfig(output_dir = args.output) if args.output else DetectionSinkConfig()
+        sink_config.partition_by = list(dict.fromkeys(sink_config.partition_by + list(partition)))
+        predictor = Predictor(PredictionConfig(model_path = args.model))
+        try:
+            with DetectionWriter(sink_config) as writer:
+                for detections in predictor.predict(args.sources):
+                    writer.write(detections, partition)
+        finally:
+            predictor.close()
+        print(f"Wrote {writer.rows_written} detections of {writer.images_written} images to {sink_config.output_dir}")
+
+    elif args.command == 'train':
+        from PotholeDetection.pipeline.train_pipeline import run_training_pipeline
+        run_training_pipeline(force = args.force, from_stage = args.from_stage, only = args.only, incremental = args.incremental)
+
+    elif args.command == 'check-startup':
+        from PotholeDetection.utils.startup_benchmark import check_startup
+        if not check_startup():
+            raise SystemExit(1)
+
+    elif args.command == 'benchmark-map':
+        from PotholeDetection.pipeline.pothole_map import benchmark_map
+        config = PotholeMapConfig()
+        config.benchmark_reports = args.reports or config.benchmark_reports
+        config.benchmark_potholes = args.potholes or config.benchmark_potholes
+        benchmark_map(config)
+
+
+if __name__ == "__main__":
+    main()
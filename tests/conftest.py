@@ -0,0 +1,15 @@
+import os
+import pytest
+
+
+@pytest.fixture
+def s3():
+    """
+    boto3 S3 client against moto's in-memory S3. Every client created inside the test talks to the same fake
+    """
+    moto = pytest.importorskip('moto')
+    import boto3
+
+    os.environ.update({'AWS_ACCESS_KEY_ID': 'testing', 'AWS_SECRET_ACCESS_KEY': 'testing', 'AWS_DEFAULT_REGION': 'us-east-1'})
+    with moto.mock_aws():
+        yield boto3.client('s3', region_name = 'us-east-1')
@@ -0,0 +1,64 @@
+import json
+import hashlib
+import pytest
+from PotholeDetection.config_manager.component_config import ArtifactPublisherConfig
+from PotholeDetection.utils.artifact_publisher import ArtifactPublisher
+
+
+BUCKET = 'pothole-release-test'
+PREFIX = 'releases/'
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    (tmp_path/'best.pt').write_bytes(b'weights'*100)
+    (tmp_path/'openvino').mkdir()
+    (tmp_path/'openvino'/'best.xml').write_text('<net/>')
+    (tmp_path/'openvino'/'best.bin').write_bytes(b'\x00'*64)
+    (tmp_path/'export_report.json').write_text('{}')
+    return {'best.pt': tmp_path/'best.pt', 'openvino': tmp_path/'openvino', 'export_report.json': tmp_path/'export_report.json'}
+
+
+@pytest.fixture
+def publisher(s3):
+    s3.create_bucket(Bucket = BUCKET)
+    return ArtifactPublisher(ArtifactPublisherConfig(s3_bucket = BUCKET, release_prefix = PREFIX))
+
+
+def read_json(s3, key: str) -> dict:
+    return json.loads(s3.get_object(Bucket = BUCKET, Key = key)['Body'].read())
+
+
+def test_publish_then_skip_unchanged(s3, publisher, artifacts):
+    aliases = {'best.pt': 'models/best.pt'}
+    first = publisher.publish(artifacts, aliases)
+
+    assert first['files_uploaded'] == 4
+    assert set(first['files']) == {'best.pt', 'openvino/best.xml', 'openvino/best.bin', 'export_report.json'}
+    assert first['previous_version'] is None
+
+    manifest = read_json(s3, f"{PREFIX}manifests/{first['version']}.json")
+    assert manifest['files'] == first['files']
+    assert read_json(s3, f'{PREFIX}latest.json')['version'] == first['version']
+    for entry in manifest['files'].values():
+        body = s3.get_object(Bucket = BUCKET, Key = entry['key'])['Body'].read()
+        assert hashlib.sha256(body).hexdigest() == entry['sha256'] and len(body) == entry['size']
+
+    alias = s3.get_object(Bucket = BUCKET, Key = 'models/best.pt')
+    assert alias['Body'].read() == artifacts['best.pt'].read_bytes()
+    assert alias['Metadata']['sha256'] == first['files']['best.pt']['sha256']
+
+    second = publisher.publish(artifacts, aliases)
+    assert second['files_uploaded'] == 0 and second['bytes_uploaded'] == 0
+    assert second['version'] == first['version']
+
+
+def test_changed_file_publishes_a_new_release(s3, publisher, artifacts):
+    first = publisher.publish(artifacts, {'best.pt': 'models/best.pt'})
+    artifacts['best.pt'].write_bytes(b'retrained'*100)
+
+    second = publisher.publish(artifacts, {'best.pt': 'models/best.pt'})
+    assert second['files_uploaded'] == 1
+    assert second['previous_version'] == first['version']
+    assert read_json(s3, f'{PREFIX}latest.json')['version'] == second['version']
+    assert s3.get_object(Bucket = BUCKET, Key = 'models/best.pt')['Body'].read() == b'retrained'*100
@@ -0,0 +1,70 @@
+import cv2
+import numpy as np
+import pytest
+from PotholeDetection.components.data_ingestion import DataIngestion
+from PotholeDetection.config_manager.component_config import DataIngestionConfig, DataValidationConfig
+
+
+BUCKET = 'pothole-ingestion-test'
+PREFIX = 'dataset/'
+
+
+def jpeg(value: int) -> bytes:
+    return cv2.imencode('.jpg', np.full((32, 32, 3), value, dtype = np.uint8))[1].tobytes()
+
+
+@pytest.fixture
+def bucket(s3):
+    s3.create_bucket(Bucket = BUCKET)
+    for i in range(5):
+        s3.put_object(Bucket = BUCKET, Key = f'{PREFIX}train/images/{i}.jpg', Body = jpeg(i*40))
+        s3.put_object(Bucket = BUCKET, Key = f'{PREFIX}train/labels/{i}.txt', Body = b'0 0.5 0.5 0.2 0.2\n')
+    s3.put_object(Bucket = BUCKET, Key = f'{PREFIX}data.yaml', Body = b'nc: 1\nnames: [pothole]\n')
+    return s3
+
+
+def ingestion(tmp_path, stream_validation: bool = False) -> DataIngestion:
+    config = DataIngestionConfig(s3_bucket = BUCKET, s3_prefix = PREFIX, artifacts_dir = tmp_path/'ingestion',
+                                 max_workers = 4, stream_validation = stream_validation)
+    validation_config = DataValidationConfig(dataset = tmp_path/'ingestion'/PREFIX, artifacts_dir = tmp_path/'validation', num_workers = 2)
+    return DataIngestion(config, validation_config)
+
+
+def test_full_sync_then_noop(bucket, tmp_path):
+    dataset, manifest_path, stats = ingestion(tmp_path).sync_s3_bucket()
+
+    assert stats['files_fetched'] == 11 and stats['files_skipped'] == 0
+    assert (dataset/'train'/'images'/'3.jpg').read_bytes() == jpeg(120)
+    assert manifest_path.exists()
+
+    _, _, stats = ingestion(tmp_path).sync_s3_bucket()
+    assert stats['files_fetched'] == 0 and stats['files_skipped'] == 11 and stats['bytes_fetched'] == 0
+
+
+def test_changed_etag_is_refetched(bucket, tmp_path):
+    ingestion(tmp_path).sync_s3_bucket()
+    # Same size, different content: only the ETag tells them apart
+    bucket.put_object(Bucket = BUCKET, Key = f'{PREFIX}train/labels/2.txt', Body = b'0 0.4 0.4 0.2 0.2\n')
+
+    dataset, _, stats = ingestion(tmp_path).sync_s3_bucket()
+    assert stats['files_fetched'] == 1 and stats['files_skipped'] == 10
+    assert (dataset/'train'/'labels'/'2.txt').read_text() == '0 0.4 0.4 0.2 0.2\n'
+
+
+def test_stale_files_are_deleted(bucket, tmp_path):
+    ingestion(tmp_path).sync_s3_bucket()
+    bucket.delete_object(Bucket = BUCKET, Key = f'{PREFIX}train/images/4.jpg')
+
+    dataset, manifest_path, stats = ingestion(tmp_path).sync_s3_bucket()
+    assert stats['files_deleted'] == 1 and stats['files_fetched'] == 0
+    assert not (dataset/'train'/'images'/'4.jpg').exists()
+    assert f'{PREFIX}train/images/4.jpg' not in manifest_path.read_text()
+
+
+def test_streamed_validation_is_not_reported_by_a_later_noop_sync(bucket, tmp_path):
+    data_ingestion = ingestion(tmp_path, stream_validation = True)
+    _, _, stats = data_ingestion.sync_s3_bucket()
+    assert stats['files_validated'] == 10
+
+    _, _, stats = data_ingestion.sync_s3_bucket()
+    assert stats['files_fetched'] == 0 and stats['files_validated'] == 0
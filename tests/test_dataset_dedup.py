@@ -0,0 +1,47 @@
+from pathlib import Path
+from PotholeDetection.components.dataset_dedup import DatasetDeduplicator
+from PotholeDetection.config_manager.component_config import DatasetDedupConfig
+
+
+def deduplicator(entries: list, drop_leaks: bool) -> DatasetDeduplicator:
+    """
+    Returns: DatasetDeduplicator: Deduplicator over already hashed (split, file name, hash) entries, with neighbours found
+    """
+    config = DatasetDedupConfig(dataset = Path('dataset'), data_split = ['train', 'valid'], radius = 2,
+                                thin_splits = ['train'], drop_leaks = drop_leaks)
+    dedup = DatasetDeduplicator(config)
+    dedup.entries = [(split, Path(name), value) for split, name, value in entries]
+    dedup.find_neighbours()
+    return dedup
+
+
+# A drive of near-identical frames, each one bit from the previous: the whole run is one connected cluster,
+# but frames 0 and 3 (and 3 and 6) are far enough apart to both be kept
+RUN = [('train', f'frame_{i}.jpg', (1 << i) - 1) for i in range(7)]
+
+
+def test_run_of_near_duplicates_keeps_its_first_frame():
+    kept, duplicates, leaked = deduplicator(RUN, drop_leaks = True).thin_split('train')
+
+    assert kept == [Path('frame_0.jpg'), Path('frame_3.jpg'), Path('frame_6.jpg')]
+    assert (duplicates, leaked) == (4, 0)
+
+
+def test_images_leaking_into_evaluation_splits():
+    distinct = 0xFFFF << 32
+    entries = RUN + [('train', 'other.jpg', distinct), ('valid', 'other_valid.jpg', distinct ^ 1)]
+
+    kept, duplicates, leaked = deduplicator(entries, drop_leaks = True).thin_split('train')
+    assert Path('other.jpg') not in kept and leaked == 1
+
+    kept, duplicates, leaked = deduplicator(entries, drop_leaks = False).thin_split('train')
+    assert Path('other.jpg') in kept and leaked == 0
+
+
+def test_leaked_frames_do_not_count_as_kept():
+    dedup = deduplicator(RUN + [('valid', 'frame_0_valid.jpg', 0)], drop_leaks = True)
+
+    kept, duplicates, leaked = dedup.thin_split('train')
+    # Frames 0 to 2 are within the radius of the valid image, so the run is kept from frame 3
+    assert kept == [Path('frame_3.jpg'), Path('frame_6.jpg')]
+    assert (duplicates, leaked) == (2, 3)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from PotholeDetection.components.evaluate import ModelEvaluator, average_precision, match_predictions
+from PotholeDetection.config_manager.component_config import ModelEvaluationConfig
+
+
+IOU_THRESHOLDS = np.array([0.5, 0.95])
+# Two ground truth boxes and three predictions: an exact hit on the first box (IoU 1.0), a hit on the second box
+# at IoU 0.9 and a lower scored second hit on the first box at IoU 0.8
+GT_BOXES = np.array([[0, 0, 10, 10], [20, 0, 30, 10]], dtype = np.float32)
+PRED_BOXES = np.array([[0, 0, 10, 10], [20, 0, 30, 9], [0, 0, 10, 8]], dtype = np.float32)
+PRED_SCORES = np.array([0.9, 0.8, 0.7])
+
+
+def test_match_predictions_is_one_to_one_per_threshold():
+    tp = match_predictions(PRED_BOXES, np.zeros(3), GT_BOXES, np.zeros(2), IOU_THRESHOLDS)
+
+    # The duplicate is a false positive at both thresholds, the IoU 0.9 hit only counts at 0.5
+    np.testing.assert_array_equal(tp, [[True, True], [True, False], [False, False]])
+
+
+def test_average_precision_matches_hand_computed_values():
+    tp = np.array([[True, True], [True, False], [False, False]])
+    ap, recall, precision = average_precision(tp, PRED_SCORES, num_gt = 2)
+
+    # At IoU 0.5 precision stays 1.0 up to full recall. At 0.95 recall stops at 0.5, so only the
+    # 51 recall points in [0, 0.5] out of 101 have precision 1.0
+    assert ap == pytest.approx([1.0, 51/101])
+    np.testing.assert_allclose(recall, [0.5, 1.0, 1.0])
+    np.testing.assert_allclose(precision, [1.0, 1.0, 2/3])
+
+
+def test_class_mismatch_is_never_a_true_positive():
+    tp = match_predictions(GT_BOXES, np.array([1, 0]), GT_BOXES, np.array([0, 1]), IOU_THRESHOLDS)
+
+    assert not tp.any()
+
+
+def test_no_ground_truth():
+    tp = match_predictions(PRED_BOXES, np.zeros(3), np.empty((0, 4)), np.empty(0), IOU_THRESHOLDS)
+    ap, recall, precision = average_precision(tp, PRED_SCORES, num_gt = 0)
+
+    assert tp.shape == (3, 2) and not tp.any()
+    np.testing.assert_array_equal(ap, [0.0, 0.0])
+    assert not len(recall) and not len(precision)
+
+
+def test_score_over_images(tmp_path):
+    evaluator = ModelEvaluator(ModelEvaluationConfig(model_path = tmp_path/'best.pt', dataset = tmp_path))
+    # The three predictions of image 0 above, plus a false positive on image 1, which has no ground truth
+    evaluator.predictions = {
+        'image_idx': np.array([0, 0, 0, 1]),
+        'boxes': np.concatenate([PRED_BOXES, [[0, 0, 5, 5]]]),
+        'classes': np.zeros(4, dtype = np.int32),
+        'scores': np.array([0.9, 0.8, 0.7, 0.6])
+    }
+    evaluator.ground_truth = {'image_idx': np.array([0, 0]), 'boxes': GT_BOXES, 'classes': np.zeros(2, dtype = np.int32)}
+
+    metrics = evaluator.score(np.ones(4, dtype = bool), np.ones(2, dtype = bool), 0.75, IOU_THRESHOLDS)
+
+    assert metrics['map50'] == pytest.approx(1.0)
+    assert metrics['map50_95'] == pytest.approx((1.0 + 51/101)/2)
+    assert metrics['num_predictions'] == 2
+    assert metrics['precision'] == 1.0 and metrics['recall'] == 1.0
@@ -0,0 +1,81 @@
+import random
+import pytest
+from PotholeDetection.utils.geo_index import GridIndex, haversine_m
+
+
+class Point:
+    def __init__(self, lat: float, lon: float, confidence: float):
+        self.lat, self.lon, self.confidence = lat, lon, confidence
+
+
+@pytest.fixture(params = [12.97, 64.5], ids = ['tropics', 'high_latitude'])
+def points(request):
+    """
+    A dense city-sized cluster plus a few far outliers, around a low and a high latitude (where cells narrow)
+    Returns: list: Points
+    """
+    rng = random.Random(0)
+    lat0, lon0 = request.param, 77.59
+    points = [Point(lat0 + rng.uniform(-0.05, 0.05), lon0 + rng.uniform(-0.05, 0.05), rng.random()) for _ in range(2000)]
+    points += [Point(lat0 + rng.uniform(-2, 2), lon0 + rng.uniform(-2, 2), rng.random()) for _ in range(20)]
+    return points
+
+
+def make_index(points: list) -> GridIndex:
+    index = GridIndex(cell_m = 100)
+    for point in points:
+        index.insert(point)
+    return index
+
+
+def queries(points: list) -> list:
+    rng = random.Random(1)
+    lat0, lon0 = points[0].lat, points[0].lon
+    return [(lat0 + rng.uniform(-0.2, 0.2), lon0 + rng.uniform(-0.2, 0.2)) for _ in range(50)]
+
+
+def test_within_matches_brute_force(points):
+    index = make_index(points)
+    for lat, lon in queries(points):
+        for radius_m in (30, 250, 5000):
+            expected = {id(p) for p in points if haversine_m(lat, lon, p.lat, p.lon) <= radius_m}
+            assert {id(item) for _, item in index.within(lat, lon, radius_m)} == expected
+
+
+def test_bbox_matches_brute_force(points):
+    index = make_index(points)
+    for lat, lon in queries(points):
+        # A small box visits its cells, a large one the occupied cells
+        for half_side in (0.002, 0.5):
+            box = (lat - half_side, lon - half_side, lat + half_side, lon + half_side)
+            expected = {id(p) for p in points if box[0] <= p.lat <= box[2] and box[1] <= p.lon <= box[3]}
+            assert {id(item) for item in index.bbox(*box)} == expected
+
+
+@pytest.mark.parametrize('k, max_distance_m, accept', [
+    (1, None, None),
+    (10, None, None),
+    (5, 500, None),
+    (5, None, lambda p: p.confidence > 0.9)
+], ids = ['k1', 'k10', 'max_distance', 'accept'])
+def test_nearest_matches_brute_force(points, k, max_distance_m, accept):
+    index = make_index(points)
+    for lat, lon in queries(points):
+        candidates = [p for p in points if accept is None or accept(p)]
+        distances = sorted(haversine_m(lat, lon, p.lat, p.lon) for p in candidates)
+        expected = [d for d in distances if max_distance_m is None or d <= max_distance_m][:k]
+
+        assert [distance for distance, _ in index.nearest(lat, lon, k, max_distance_m, accept)] == pytest.approx(expected)
+
+
+def test_nearest_follows_moved_and_removed_items(points):
+    index = make_index(points)
+    lat, lon = queries(points)[0]
+    nearest = index.nearest(lat, lon)[0][1]
+
+    index.remove(nearest)
+    assert index.nearest(lat, lon)[0][1] is not nearest
+
+    far = points[-1]
+    index.move(far, lat + 1e-5, lon)
+    assert index.nearest(lat, lon)[0][1] is far
@@ -0,0 +1,43 @@
+import json
+from PotholeDetection.utils.incremental_data import select_images
+
+
+def write_dataset(dataset, files: list):
+    for name in files:
+        path = dataset/name
+        path.parent.mkdir(parents = True, exist_ok = True)
+        path.write_text('')
+
+
+def write_manifest(manifest_file, synced: dict):
+    with open(manifest_file, 'w') as f:
+        json.dump({f'data/{name}': {'synced_at': synced_at} for name, synced_at in synced.items()}, f)
+
+
+def test_relabeled_nested_image_counts_as_new(tmp_path):
+    dataset = tmp_path/'dataset'
+    images = ['train/images/city_a/0001.jpg', 'train/images/city_b/0001.jpg', 'train/images/0002.jpg']
+    labels = [f.replace('images', 'labels').replace('.jpg', '.txt') for f in images]
+    write_dataset(dataset, images + labels)
+
+    # Only the label of city_a/0001 was re-synced; city_b/0001 shares its stem but is unchanged
+    write_manifest(tmp_path/'manifest.json', {**{name: 1.0 for name in images + labels}, 'train/labels/city_a/0001.txt': 5.0})
+    pool = [dataset/name for name in images]
+
+    new, replay = select_images(tmp_path/'manifest.json', dataset, 'data', pool, since = 2.0,
+                                replay_ratio = 0.0, min_replay = 0, seed = 0)
+
+    assert new == [dataset/'train/images/city_a/0001.jpg']
+    assert replay == []
+
+
+def test_no_new_images_means_no_replay(tmp_path):
+    dataset = tmp_path/'dataset'
+    images = ['train/images/0001.jpg', 'train/images/0002.jpg']
+    write_dataset(dataset, images)
+    write_manifest(tmp_path/'manifest.json', {name: 1.0 for name in images})
+
+    new, replay = select_images(tmp_path/'manifest.json', dataset, 'data', [dataset/name for name in images],
+                                since = 2.0, replay_ratio = 1.0, min_replay = 1, seed = 0)
+
+    assert new == [] and replay == []
@@ -0,0 +1,87 @@
+import os
+import hashlib
+import pytest
+from PotholeDetection.config_manager.component_config import ModelStoreConfig
+from PotholeDetection.utils.model_store import ModelStore
+
+
+BUCKET = 'pothole-model-store-test'
+MODEL_SIZE = 1000
+
+
+def model_bytes(seed: int) -> bytes:
+    return bytes([seed])*MODEL_SIZE
+
+
+@pytest.fixture
+def bucket(s3):
+    s3.create_bucket(Bucket = BUCKET)
+    return s3
+
+
+@pytest.fixture
+def store(bucket, tmp_path):
+    store = ModelStore(ModelStoreConfig(cache_dir = tmp_path/'cache', max_cache_bytes = 2*MODEL_SIZE))
+    store.downloads = 0
+    get_object = store.s3.get_object
+
+    def counting_get_object(**kwargs):
+        store.downloads += 1
+        return get_object(**kwargs)
+
+    store.s3.get_object = counting_get_object
+    return store
+
+
+def put_model(s3, key: str, body: bytes, sha256: str = None):
+    s3.put_object(Bucket = BUCKET, Key = key, Body = body, Metadata = {'sha256': sha256 or hashlib.sha256(body).hexdigest()})
+
+
+def test_cold_fetch_then_warm_hit(bucket, store):
+    put_model(bucket, 'models/best.pt', model_bytes(1))
+
+    cold = store.resolve(f's3://{BUCKET}/models/best.pt')
+    assert cold.read_bytes() == model_bytes(1)
+    assert cold.name == hashlib.sha256(model_bytes(1)).hexdigest() + '.pt'
+    assert store.downloads == 1
+
+    warm = store.resolve(f's3://{BUCKET}/models/best.pt')
+    assert warm == cold
+    assert store.downloads == 1
+
+
+def test_changed_etag_is_downloaded_again(bucket, store):
+    put_model(bucket, 'models/best.pt', model_bytes(1))
+    first = store.resolve(f's3://{BUCKET}/models/best.pt')
+
+    put_model(bucket, 'models/best.pt', model_bytes(2))
+    second = store.resolve(f's3://{BUCKET}/models/best.pt')
+
+    assert store.downloads == 2
+    assert second != first and second.read_bytes() == model_bytes(2)
+
+
+def test_checksum_mismatch_is_rejected(bucket, store):
+    put_model(bucket, 'models/best.pt', model_bytes(1), sha256 = '0'*64)
+
+    with pytest.raises(IOError, match = 'Checksum mismatch'):
+        store.resolve(f's3://{BUCKET}/models/best.pt')
+    assert not any(store.objects_dir.iterdir())
+    assert store.read_ref(BUCKET, 'models/best.pt') is None
+
+
+def test_least_recently_used_model_is_evicted(bucket, store):
+    for i, name in enumerate(('a', 'b', 'c')):
+        put_model(bucket, f'models/{name}.pt', model_bytes(i))
+
+    a = store.resolve(f's3://{BUCKET}/models/a.pt')
+    b = store.resolve(f's3://{BUCKET}/models/b.pt')
+    os.utime(a, (1, 1))
+    os.utime(b, (2, 2))
+    # Resolving a again marks it as recently used, so b is the one evicted when c arrives
+    assert store.resolve(f's3://{BUCKET}/models/a.pt') == a
+    c = store.resolve(f's3://{BUCKET}/models/c.pt')
+
+    assert a.exists() and c.exists() and not b.exists()
+    assert store.resolve(f's3://{BUCKET}/models/b.pt').read_bytes() == model_bytes(1)
+    assert store.downloads == 4
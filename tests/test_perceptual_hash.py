@@ -0,0 +1,33 @@
+import random
+import pytest
+from PotholeDetection.utils.perceptual_hash import BKTree, hamming
+
+
+@pytest.fixture
+def hashes():
+    """
+    64-bit hashes: random ones, near copies of a few of them and exact duplicates (which share a tree node)
+    Returns: list: Hashes, indexed by their position
+    """
+    rng = random.Random(0)
+    hashes = [rng.getrandbits(64) for _ in range(300)]
+    hashes += [h ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for h in hashes[:100]]
+    hashes += hashes[:50]
+    return hashes
+
+
+@pytest.mark.parametrize('radius', [0, 2, 6, 20])
+def test_query_matches_linear_scan(hashes, radius):
+    tree = BKTree()
+    for i, value in enumerate(hashes):
+        tree.add(value, i)
+    assert len(tree) == len(hashes)
+
+    rng = random.Random(1)
+    for value in hashes[::7] + [rng.getrandbits(64) for _ in range(20)]:
+        expected = sorted((i, hamming(value, h)) for i, h in enumerate(hashes) if hamming(value, h) <= radius)
+        assert sorted(tree.query(value, radius)) == expected
+
+
+def test_empty_tree():
+    assert BKTree().query(0, 64) == []
@@ -0,0 +1,9 @@
+import pytest
+from PotholeDetection.constants.constants import IMPORT_TIME_BUDGETS
+from PotholeDetection.utils.startup_benchmark import measure_import
+
+
+@pytest.mark.parametrize('module', list(IMPORT_TIME_BUDGETS))
+def test_entry_point_imports_no_heavy_dependencies(module):
+    # Only the heavy imports are asserted; the time budgets are too machine dependent for CI (see `main.py check-startup`)
+    assert measure_import(module, repeats = 1)['heavy_imports'] == []
@@ -0,0 +1,44 @@
+import os
+import pytest
+from PotholeDetection.utils.validation_cache import ValidationCache
+
+
+@pytest.fixture(params = [False, True], ids = ['stat', 'content_hash'])
+def use_content_hash(request):
+    return request.param
+
+
+def verify(db_path, path, use_content_hash: bool, rewrite = None):
+    """
+    One validation run: look the file up and, on a miss, store a verdict (rewriting the file in between if asked)
+    Returns: Cached verdict, None if the file had to be verified
+    """
+    cache = ValidationCache(db_path, use_content_hash = use_content_hash)
+    cached = cache.lookup(path, 'label')
+    if cached is None:
+        if rewrite is not None:
+            rewrite()
+        cache.store('label', {path: [True, None]})
+    cache.close()
+    return cached
+
+
+def test_verdict_is_reused_while_the_file_is_unchanged(use_content_hash, tmp_path):
+    label = tmp_path/'a.txt'
+    label.write_text('0 0.5 0.5 0.1 0.1\n')
+
+    assert verify(tmp_path/'cache.db', label, use_content_hash) is None
+    assert verify(tmp_path/'cache.db', label, use_content_hash) == [True, None]
+
+
+def test_file_rewritten_during_verification_is_verified_again(use_content_hash, tmp_path):
+    label = tmp_path/'a.txt'
+    label.write_text('0 0.5 0.5 0.1 0.1\n')
+
+    def rewrite():
+        label.write_text('corrupt\n')
+        os.utime(label, ns = (label.stat().st_atime_ns, label.stat().st_mtime_ns + 10**9))
+
+    assert verify(tmp_path/'cache.db', label, use_content_hash, rewrite) is None
+    assert verify(tmp_path/'cache.db', label, use_content_hash) is None
+    assert verify(tmp_path/'cache.db', label, use_content_hash) == [True, None]
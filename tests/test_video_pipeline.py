@@ -0,0 +1,85 @@
+import time
+from types import SimpleNamespace
+import cv2
+import numpy as np
+import pytest
+from PotholeDetection.config_manager.component_config import VideoPredictionConfig
+from PotholeDetection.pipeline.predict_pipeline import Detections
+from PotholeDetection.pipeline.video_pipeline import IoUTracker, VideoPredictor
+
+
+FRAME_SIZE = (320, 240)
+NUM_FRAMES = 150
+# (first frame, last frame, x at the first frame, y) of the dark squares standing in for potholes
+POTHOLES = [(10, 60, 40, 80), (90, 130, 200, 150)]
+
+
+class SquareDetector:
+    """
+    Predictor stand-in that detects the dark squares of the synthetic clip by thresholding
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def prepare(self, source_id: str, img: np.ndarray, submitted: float):
+        return SimpleNamespace(source = source_id, img = img, submitted = submitted)
+
+    def run_batch(self, batch: list) -> list:
+        results = []
+        for prepared in batch:
+            self.calls += 1
+            mask = (cv2.cvtColor(prepared.img, cv2.COLOR_BGR2GRAY) < 60).astype(np.uint8)
+            count, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+            boxes = np.array([[x, y, x + w, y + h] for x, y, w, h, area in stats[1:] if area > 100], dtype = np.float32).reshape(-1, 4)
+            results.append(Detections(prepared.source, boxes, np.full(len(boxes), 0.9, dtype = np.float32),
+                                      np.zeros(len(boxes), dtype = np.int32), prepared.img.shape[:2], time.perf_counter() - prepared.submitted))
+        return results
+
+
+@pytest.fixture
+def synthetic_clip(tmp_path):
+    path = tmp_path/'clip.avi'
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30, FRAME_SIZE)
+    assert writer.isOpened()
+    for i in range(NUM_FRAMES):
+        frame = np.full((FRAME_SIZE[1], FRAME_SIZE[0], 3), 180, dtype = np.uint8)
+        for first, last, x, y in POTHOLES:
+            if first <= i <= last:
+                x0 = x + (i - first)
+                cv2.rectangle(frame, (x0, y), (x0 + 30, y + 20), (20, 20, 20), -1)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def test_video_predictor_skips_frames_and_reports_events(synthetic_clip):
+    detector = SquareDetector()
+    config = VideoPredictionConfig(min_keyframe_interval = 1, max_keyframe_interval = 8, max_age = 10, min_hits = 2)
+    video_predictor = VideoPredictor(detector, config)
+
+    events = list(video_predictor.process(str(synthetic_clip)))
+    report = video_predictor.report
+
+    assert report['frames_read'] == NUM_FRAMES
+    assert report['frames_inferred'] == detector.calls
+    assert report['inferred_fraction'] < 0.5
+    assert report['events'] == len(events) == len(POTHOLES)
+    for event, (first, last, _, _) in zip(sorted(events, key = lambda e: e.first_frame), POTHOLES):
+        assert first <= event.first_frame <= first + config.max_keyframe_interval
+        assert last - config.max_keyframe_interval <= event.last_frame <= last
+
+
+def test_tracker_reports_a_lost_track_once():
+    tracker = IoUTracker(iou_threshold = 0.3, max_age = 30, min_hits = 1)
+    box = np.array([[10, 10, 50, 50]], dtype = np.float32)
+    no_boxes = np.empty((0, 4), dtype = np.float32)
+
+    _, changed = tracker.update(0, 0.0, box, np.array([0.9]))
+    assert changed
+    _, changed = tracker.update(1, 0.1, box, np.array([0.9]))
+    assert not changed
+    _, changed = tracker.update(2, 0.2, no_boxes, np.empty(0))
+    assert changed
+    for frame_index in range(3, 10):
+        _, changed = tracker.update(frame_index, frame_index/10, no_boxes, np.empty(0))
+        assert not changed